@@ -0,0 +1,48 @@
+"""Сравнение точного определителя Барейса и многомодульного метода.
+
+Запуск:
+    python benchmarks/bench_exact.py --size 200
+    python benchmarks/bench_exact.py --size 500 --workers 8 --skip-bareiss
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import modular
+from bareiss import Bareiss
+from matrix import Matrix
+from parallel import get_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-value", type=int, default=100)
+    parser.add_argument("--backend", default="auto")
+    parser.add_argument("--skip-bareiss", action="store_true")
+    args = parser.parse_args()
+
+    Matrix.set_backend(args.backend)
+    rng = random.Random(0)
+    n, v = args.size, args.max_value
+    A = Matrix([[rng.randint(-v, v) for _ in range(n)] for _ in range(n)])
+
+    print(f"n={n}, |a_ij| <= {v}, процессов: {args.workers}, бэкенд: {Matrix.get_backend()}")
+    if args.workers > 1:
+        get_pool(args.workers)
+    start = time.perf_counter()
+    det = modular.determinant(A, workers=args.workers)
+    print(f"многомодульный: {time.perf_counter() - start:.3f} с, {len(str(abs(det)))} цифр")
+    if not args.skip_bareiss:
+        start = time.perf_counter()
+        assert Bareiss(A).determinant() == det
+        print(f"Барейс:         {time.perf_counter() - start:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
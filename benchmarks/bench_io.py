@@ -0,0 +1,61 @@
+"""Скорость чтения текстовых и двоичных файлов матриц.
+
+Запуск:
+    python benchmarks/bench_io.py --size 2000
+    python benchmarks/bench_io.py --size 4000 --workers 8 --ints
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import io_handler
+from parallel import get_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--ints", action="store_true", help="целые элементы вместо float")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    n = args.size
+    with tempfile.TemporaryDirectory() as tmp:
+        text = os.path.join(tmp, "m.txt")
+        binary = os.path.join(tmp, "m.npy")
+        with open(text, "w", encoding="utf-8") as file:
+            for _ in range(n):
+                if args.ints:
+                    row = (str(rng.randint(-10**6, 10**6)) for _ in range(n))
+                else:
+                    row = (repr(rng.uniform(-1e3, 1e3)) for _ in range(n))
+                file.write(" ".join(row) + "\n")
+        size = os.path.getsize(text) / 2**20
+        print(f"{n}x{n}, {size:.1f} МБ текста, процессов: {args.workers}")
+
+        for workers in sorted({1, args.workers}):
+            if workers > 1:
+                get_pool(workers)
+            start = time.perf_counter()
+            matrix = io_handler.load_text_matrix(text, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"текст, {workers} проц.: {elapsed:.3f} с ({size / elapsed:.1f} МБ/с)")
+
+        io_handler.save_binary(matrix, binary)
+        start = time.perf_counter()
+        mapped = io_handler.load_binary(binary)
+        print(f"двоичный (mmap):   {time.perf_counter() - start:.6f} с")
+        start = time.perf_counter()
+        io_handler.load_binary(binary, mapped=False)
+        print(f"двоичный (чтение): {time.perf_counter() - start:.3f} с")
+        del mapped
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Микробенчмарк ядер умножения матриц на чистом Python.
+
+Сравнивает простое умножение i-j-k, блочное i-k-j и рекурсию
+Штрассена-Винограда на случайных квадратных матрицах.
+
+Запуск:
+    python benchmarks/bench_matmul.py
+    python benchmarks/bench_matmul.py --sizes 16 64 256 --tile 32
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend import PythonBackend
+from strassen import strassen_matmul
+
+
+def measure(func, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[16, 32, 64, 128, 256, 512, 1024])
+    parser.add_argument("--tile", type=int, default=PythonBackend.tile_size)
+    parser.add_argument("--crossover", type=int, default=PythonBackend.strassen_crossover)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-naive-above", type=int, default=512,
+                        help="не запускать простое ядро для больших размеров")
+    args = parser.parse_args()
+
+    kernels = PythonBackend()
+    kernels.tile_size = args.tile
+    rng = random.Random(0)
+
+    print(f"{'n':>6} {'i-j-k, с':>12} {'блочное, с':>12} {'ускорение':>10} {'Штрассен, с':>12}")
+    for n in args.sizes:
+        a = array('d', (rng.random() for _ in range(n * n)))
+        b = array('d', (rng.random() for _ in range(n * n)))
+        repeat = args.repeat if n <= 256 else 1
+        blocked = measure(kernels._matmul_blocked, a, b, n, n, n, repeat=repeat)
+        strassen = measure(strassen_matmul, kernels, a, b, n, n, n, args.crossover,
+                           repeat=repeat)
+        if n > args.skip_naive_above:
+            print(f"{n:>6} {'-':>12} {blocked:>12.4f} {'-':>10} {strassen:>12.4f}")
+            continue
+        naive = measure(kernels._matmul_naive, a, b, n, n, n, repeat=repeat)
+        print(f"{n:>6} {naive:>12.4f} {blocked:>12.4f} {naive / blocked:>9.2f}x {strassen:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Сравнение последовательного и параллельного умножения матриц.
+
+Запуск:
+    python benchmarks/bench_parallel.py --size 512 --workers 8
+    python benchmarks/bench_parallel.py --size 1024 --workers 32 --block-rows 16
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from matrix import Matrix
+from parallel import get_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--block-rows", type=int, default=None)
+    parser.add_argument("--backend", default="python")
+    args = parser.parse_args()
+
+    Matrix.set_backend(args.backend)
+    rng = random.Random(0)
+    n = args.size
+    A = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+    B = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+
+    start = time.perf_counter()
+    A.matmul(B, algorithm="standard")
+    serial = time.perf_counter() - start
+
+    # Пул создаётся заранее: в рабочем режиме он постоянный.
+    get_pool(args.workers)
+    start = time.perf_counter()
+    A.matmul(B, algorithm="parallel", workers=args.workers, block_rows=args.block_rows)
+    parallel = time.perf_counter() - start
+
+    print(f"n={n}, процессов: {args.workers}, бэкенд: {Matrix.get_backend()}")
+    print(f"последовательно: {serial:.3f} с")
+    print(f"параллельно:     {parallel:.3f} с")
+    print(f"ускорение:       {serial / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Нагрузочный тест сервера матриц.
+
+Запускает сервер (или подключается к уже запущенному через --port),
+сохраняет на нём случайные матрицы и из нескольких соединений отправляет
+операции над ними, держа в каждом соединении до --depth запросов без
+ответа. Печатает пропускную способность и задержки.
+
+Запуск:
+    python benchmarks/bench_server.py --size 200 --op determinant --requests 2000
+    python benchmarks/bench_server.py --port 8765 --connections 16 --depth 8
+"""
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from client import Client
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port, workers):
+    args = [sys.executable, os.path.join(SRC, "server.py"), "--port", str(port)]
+    if workers:
+        args += ["--workers", str(workers)]
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            Client(port=port).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Сервер не запустился")
+
+
+def _worker(port, op, inputs, count, depth, latencies):
+    with Client(port=port) as client:
+        window = deque()
+        for _ in range(count):
+            if len(window) >= depth:
+                request_id, sent = window.popleft()
+                client.receive(request_id)
+                latencies.append(time.perf_counter() - sent)
+            window.append((client.send(op, inputs=inputs), time.perf_counter()))
+        for request_id, sent in window:
+            client.receive(request_id)
+            latencies.append(time.perf_counter() - sent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=None,
+                        help="порт запущенного сервера (по умолчанию сервер запускается)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--op", default="determinant")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=4, help="запросов без ответа в соединении")
+    args = parser.parse_args()
+
+    process = None
+    port = args.port
+    if port is None:
+        port = _free_port()
+        process = _start_server(port, args.workers)
+    try:
+        rng = random.Random(0)
+        n = args.size
+        with Client(port=port) as client:
+            for name in ("A", "B"):
+                client.put(name, [[rng.random() for _ in range(n)] for _ in range(n)])
+        from batch import OPERATIONS
+        inputs = ["A", "B"][:OPERATIONS[args.op][0]]
+
+        latencies = []
+        per_connection = args.requests // args.connections
+        threads = [threading.Thread(target=_worker,
+                                    args=(port, args.op, inputs, per_connection, args.depth, latencies))
+                   for _ in range(args.connections)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        total = len(latencies)
+        print(f"{args.op} {n}x{n}: {total} запросов, соединений: {args.connections}, глубина: {args.depth}")
+        print(f"пропускная способность: {total / elapsed:.0f} запросов/с")
+        for q in (0.5, 0.9, 0.99):
+            print(f"задержка p{int(q * 100)}: {latencies[min(total - 1, int(q * total))] * 1000:.2f} мс")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
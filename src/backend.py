@@ -0,0 +1,730 @@
+import math
+import os
+from array import array
+from itertools import repeat
+from operator import mul, neg, sub
+
+from strided import StridedBuffer
+
+
+class PythonBackend:
+    """Вычислительные ядра на чистом Python.
+
+    Все методы работают с плоскими буферами элементов в построчном порядке
+    (в том числе со страйдовыми представлениями ``StridedBuffer``)
+    и возвращают новый плоский буфер. Параметр out (где он есть) - буфер,
+    в который ядро может записать результат без выделения памяти; ядра на
+    чистом Python его не используют. Используется по умолчанию, если NumPy
+    недоступен, а также для матриц с целыми или рациональными элементами.
+    """
+    name = "python"
+    # Размер блока (по строкам A и строкам B) в блочном умножении.
+    tile_size = 64
+    # Если все размеры не больше порога, используется простое умножение.
+    naive_threshold = 8
+    # Штрассен-Виноград: размер блока, на котором рекурсия переходит к
+    # стандартному ядру, и наименьший размер, с которого метод выбирается
+    # автоматически (None - не выбирать). Значения получены замером,
+    # выигрыш начинается примерно с n = 256.
+    strassen_crossover = 64
+    strassen_threshold = 256
+    # Наименьший размер целой матрицы, с которого определитель и ранг
+    # считаются многомодульным методом вместо исключения Барейса (None -
+    # не выбирать: на чистом Python Барейс быстрее при любых размерах).
+    modular_threshold = None
+
+    def add(self, a, b, out=None):
+        """Поэлементная сумма двух буферов."""
+        return [x + y for x, y in zip(a, b)]
+
+    def sub(self, a, b, out=None):
+        """Поэлементная разность двух буферов."""
+        return [x - y for x, y in zip(a, b)]
+
+    def scale(self, a, k, out=None):
+        """Умножение всех элементов буфера на число k."""
+        return [x * k for x in a]
+
+    def combine(self, buffers, coefs):
+        """Линейная комбинация sum(coefs[i] * buffers[i]) за один проход.
+
+        Элементы всех буферов обходятся одновременно, поэтому промежуточные
+        буферы не создаются: слагаемые с коэффициентом 1 берутся как есть,
+        с -1 - вычитаются, остальные умножаются на лету. Вещественные
+        операнды собираются сразу в ``array('d')``.
+        """
+        plus = []
+        minus = []
+        for buf, c in zip(buffers, coefs):
+            if c == 1:
+                plus.append(buf)
+            elif c == -1:
+                minus.append(buf)
+            else:
+                plus.append(map(mul, repeat(c), buf))
+        if not minus:
+            values = map(sum, zip(*plus))
+        elif not plus:
+            values = map(neg, map(sum, zip(*minus)))
+        else:
+            values = map(sub, map(sum, zip(*plus)), map(sum, zip(*minus)))
+        if all(isinstance(b, array) for b in buffers) and all(
+                type(c) in (int, float) for c in coefs):
+            return array('d', values)
+        return list(values)
+
+    def matmul(self, a, b, n, m, p, out=None):
+        """Произведение матриц n x m и m x p."""
+        if max(n, m, p) <= self.naive_threshold:
+            return self._matmul_naive(a, b, n, m, p)
+        return self._matmul_blocked(a, b, n, m, p)
+
+    def _matmul_blocked(self, a, b, n, m, p):
+        """Блочное умножение в порядке i-k-j.
+
+        Строки B нарезаются один раз и переиспользуются для каждого блока
+        строк A; строка результата накапливается целиком как
+        ``acc += a[i][k] * B[k]``, без обращения к B по столбцам.
+        """
+        t = self.tile_size
+        b_rows = [b[k * p:(k + 1) * p] for k in range(m)]
+        result = []
+        for i0 in range(0, n, t):
+            i1 = min(i0 + t, n)
+            acc = [[0] * p for _ in range(i0, i1)]
+            for k0 in range(0, m, t):
+                k1 = min(k0 + t, m)
+                tile = b_rows[k0:k1]
+                for ii in range(i1 - i0):
+                    base = (i0 + ii) * m
+                    row_acc = acc[ii]
+                    for aik, b_row in zip(a[base + k0:base + k1], tile):
+                        row_acc = [x + aik * y for x, y in zip(row_acc, b_row)]
+                    acc[ii] = row_acc
+            for row_acc in acc:
+                result.extend(row_acc)
+        return result
+
+    def _matmul_naive(self, a, b, n, m, p):
+        """Простое умножение в порядке i-j-k для маленьких матриц."""
+        result = []
+        for i in range(n):
+            base = i * m
+            for j in range(p):
+                summa = 0
+                for k in range(m):
+                    summa += a[base + k] * b[k * p + j]
+                result.append(summa)
+        return result
+
+    def matvec(self, a, x, rows, cols):
+        """Произведение матрицы rows x cols на вектор x."""
+        return [sum(map(mul, a[i * cols:(i + 1) * cols], x)) for i in range(rows)]
+
+    def transpose(self, a, rows, cols, out=None):
+        """Транспонирование матрицы rows x cols."""
+        result = []
+        for j in range(cols):
+            result.extend(a[j::cols])
+        return result
+
+    def eliminate(self, a, rows, cols, normalize, eps):
+        """Прямой ход метода Гаусса.
+
+        Returns:
+            tuple: Буфер ступенчатой матрицы и количество перестановок строк.
+        """
+        c = cols
+        matrix = list(a)
+        swaps = 0
+        row = col = 0
+
+        while row < rows and col < c:
+            pivot_row = None
+            for k in range(row, rows):
+                if abs(matrix[k * c + col]) > eps:
+                    pivot_row = k
+                    break
+
+            if pivot_row is None:
+                col += 1
+                continue
+
+            r0 = row * c
+            if pivot_row != row:
+                p0 = pivot_row * c
+                matrix[r0:r0 + c], matrix[p0:p0 + c] = matrix[p0:p0 + c], matrix[r0:r0 + c]
+                swaps += 1
+
+            if normalize:
+                pivot = matrix[r0 + col]
+                if abs(pivot) > eps:
+                    matrix[r0:r0 + c] = [x / pivot for x in matrix[r0:r0 + c]]
+                else:
+                    col += 1
+                    continue
+
+            pivot_tail = matrix[r0 + col:r0 + c]
+            for k in range(row + 1, rows):
+                k0 = k * c
+                if abs(matrix[k0 + col]) <= eps:
+                    continue
+
+                if normalize:
+                    factor = matrix[k0 + col]
+                else:
+                    factor = matrix[k0 + col] / matrix[r0 + col]
+
+                matrix[k0 + col:k0 + c] = [
+                    x - factor * y for x, y in zip(matrix[k0 + col:k0 + c], pivot_tail)
+                ]
+
+            row += 1
+            col += 1
+
+        return matrix, swaps
+
+    def lu_factor(self, a, rows, cols, eps):
+        """LU-разложение PA = LU с частичным выбором ведущего элемента.
+
+        Столбцы, в которых все кандидаты в ведущие элементы не больше eps,
+        пропускаются, поэтому U получается ступенчатой и для вырожденных
+        и прямоугольных матриц.
+
+        Returns:
+            tuple: (lu, perm, pivots, swaps), где lu - буфер rows x cols с U
+            в ступенчатой части и множителями L под ней, perm - исходные
+            номера строк PA, pivots - столбцы ведущих элементов, swaps -
+            количество перестановок строк.
+        """
+        c = cols
+        lu = list(a)
+        perm = list(range(rows))
+        pivots = []
+        swaps = 0
+        row = 0
+        for col in range(cols):
+            if row == rows:
+                break
+            pivot_row = max(range(row, rows), key=lambda k: abs(lu[k * c + col]))
+            if abs(lu[pivot_row * c + col]) <= eps:
+                continue
+
+            r0 = row * c
+            if pivot_row != row:
+                p0 = pivot_row * c
+                lu[r0:r0 + c], lu[p0:p0 + c] = lu[p0:p0 + c], lu[r0:r0 + c]
+                perm[row], perm[pivot_row] = perm[pivot_row], perm[row]
+                swaps += 1
+
+            pivot = lu[r0 + col]
+            pivot_tail = lu[r0 + col + 1:r0 + c]
+            for k in range(row + 1, rows):
+                k0 = k * c
+                factor = lu[k0 + col] / pivot
+                lu[k0 + col] = factor
+                if factor:
+                    lu[k0 + col + 1:k0 + c] = [
+                        x - factor * y for x, y in zip(lu[k0 + col + 1:k0 + c], pivot_tail)
+                    ]
+
+            pivots.append(col)
+            row += 1
+        return lu, perm, pivots, swaps
+
+    def lu_forward(self, lu, perm, pivots, rows, cols, rhs, k):
+        """Прямой ход Ly = Pb для k правых частей (буфер rhs rows x k)."""
+        y = [rhs[p * k:(p + 1) * k] for p in perm]
+        rank = len(pivots)
+        for i in range(1, rows):
+            base = i * cols
+            yi = y[i]
+            for j in range(min(i, rank)):
+                factor = lu[base + pivots[j]]
+                if factor:
+                    yi = [a - factor * b for a, b in zip(yi, y[j])]
+            y[i] = yi
+        return [v for row in y for v in row]
+
+    def lu_backward(self, lu, pivots, cols, y, k):
+        """Обратный ход Ux = y для k правых частей.
+
+        Читает только первые len(pivots) строк y; переменные вне pivots
+        (свободные) полагаются равными нулю.
+
+        Returns:
+            Буфер решения cols x k.
+        """
+        zero = [0] * k
+        x = [zero] * cols
+        for i in range(len(pivots) - 1, -1, -1):
+            j = pivots[i]
+            base = i * cols
+            acc = y[i * k:(i + 1) * k]
+            for t in range(j + 1, cols):
+                u = lu[base + t]
+                if u and x[t] is not zero:
+                    acc = [a - u * b for a, b in zip(acc, x[t])]
+            pivot = lu[base + j]
+            x[j] = [a / pivot for a in acc]
+        return [v for row in x for v in row]
+
+    def cholesky_factor(self, a, n):
+        """Разложение Холецкого A = L L^T симметричной матрицы n x n.
+
+        Returns:
+            Нижний треугольник L, упакованный по строкам (строка i занимает
+            i + 1 элементов), или None, если матрица не положительно
+            определена.
+        """
+        packed = []
+        for i in range(n):
+            row = a[i * n:i * n + i + 1]
+            li = []
+            for j in range(i):
+                start = j * (j + 1) // 2
+                s = row[j] - sum(x * y for x, y in zip(li, packed[start:start + j]))
+                li.append(s / packed[start + j])
+            s = row[i] - sum(x * x for x in li)
+            if s <= 0:
+                return None
+            li.append(math.sqrt(s))
+            packed.extend(li)
+        return packed
+
+    def cholesky_solve(self, packed, n, rhs, k):
+        """Решает L L^T X = B для k правых частей (буфер rhs n x k)."""
+        y = []
+        for i in range(n):
+            start = i * (i + 1) // 2
+            acc = rhs[i * k:(i + 1) * k]
+            for l, yj in zip(packed[start:start + i], y):
+                if l:
+                    acc = [a - l * b for a, b in zip(acc, yj)]
+            d = packed[start + i]
+            y.append([a / d for a in acc])
+        for i in range(n - 1, -1, -1):
+            start = i * (i + 1) // 2
+            d = packed[start + i]
+            xi = y[i] = [a / d for a in y[i]]
+            for j, l in enumerate(packed[start:start + i]):
+                if l:
+                    y[j] = [a - l * b for a, b in zip(y[j], xi)]
+        return [v for row in y for v in row]
+
+    def eliminate_mod(self, a, rows, cols, p):
+        """Исключение Гаусса над полем вычетов по простому модулю p.
+
+        Returns:
+            tuple[int, int]: Ранг матрицы по модулю p и её определитель
+            по модулю p (0 для неквадратных и вырожденных матриц).
+        """
+        c = cols
+        m = [x % p for x in a]
+        det = 1
+        rank = 0
+        for col in range(cols):
+            if rank == rows:
+                break
+            pivot_row = next((k for k in range(rank, rows) if m[k * c + col]), None)
+            if pivot_row is None:
+                continue
+            r0 = rank * c
+            if pivot_row != rank:
+                p0 = pivot_row * c
+                m[r0:r0 + c], m[p0:p0 + c] = m[p0:p0 + c], m[r0:r0 + c]
+                det = -det
+            pivot = m[r0 + col]
+            det = det * pivot % p
+            inv = pow(pivot, -1, p)
+            tail = [x * inv % p for x in m[r0 + col + 1:r0 + c]]
+            for k in range(rank + 1, rows):
+                k0 = k * c
+                factor = m[k0 + col]
+                if factor:
+                    m[k0 + col + 1:k0 + c] = [
+                        (x - factor * y) % p for x, y in zip(m[k0 + col + 1:k0 + c], tail)
+                    ]
+            rank += 1
+        return rank, det % p if rank == rows == cols else 0
+
+
+class NumpyBackend(PythonBackend):
+    """Векторизованные ядра на NumPy.
+
+    Работают только с вещественными буферами ``array('d')`` (или
+    memoryview формата 'd') и представлениями над ними, которые передаются
+    в NumPy без копирования.
+    Целочисленные и рациональные матрицы обрабатываются ядрами
+    PythonBackend, чтобы не терять точность.
+    """
+    name = "numpy"
+    # BLAS быстрее рекурсии на Python при любых практических размерах.
+    strassen_crossover = 1024
+    strassen_threshold = None
+    modular_threshold = 40
+    # Ширина блока столбцов в модульном исключении (см. eliminate_mod).
+    modular_block = 16
+
+    def __init__(self):
+        import numpy
+        self.np = numpy
+
+    @staticmethod
+    def _is_float(a):
+        """Буфер из float64, который NumPy читает без копирования."""
+        if isinstance(a, array):
+            return a.typecode == 'd'
+        return isinstance(a, memoryview) and a.format == 'd'
+
+    def _view(self, a, rows, cols):
+        """Возвращает ndarray rows x cols поверх буфера или None."""
+        if self._is_float(a):
+            return self.np.frombuffer(a, dtype=self.np.float64).reshape(rows, cols)
+        if isinstance(a, StridedBuffer) and self._is_float(a.base):
+            # Страйдовый ndarray поверх исходного буфера; reshape копирует,
+            # только если запрошена другая форма.
+            np = self.np
+            full = np.frombuffer(a.base, dtype=np.float64)
+            view = np.lib.stride_tricks.as_strided(
+                full[a.offset:], shape=(a.rows, a.cols),
+                strides=(a.row_stride * full.itemsize, a.col_stride * full.itemsize),
+                writeable=False)
+            return view.reshape(rows, cols)
+        return None
+
+    def _coerce(self, a, rows, cols):
+        """Как _view, но также приводит буфер из int к float64."""
+        view = self._view(a, rows, cols)
+        if view is not None:
+            return view
+        if isinstance(a, memoryview) and a.format == 'q':
+            return self.np.frombuffer(a, dtype=self.np.int64).astype(self.np.float64).reshape(rows, cols)
+        if all(type(x) is int for x in a):
+            try:
+                values = a if isinstance(a, list) else list(a)
+                return self.np.array(values, dtype=self.np.float64).reshape(rows, cols)
+            except OverflowError:
+                return None
+        return None
+
+    @staticmethod
+    def _pack(arr):
+        out = array('d')
+        out.frombytes(arr.tobytes())
+        return out
+
+    def _binary(self, a, b):
+        x = self._view(a, 1, len(a))
+        y = self._view(b, 1, len(b))
+        if x is None and y is None:
+            return None
+        if x is None:
+            x = self._coerce(a, 1, len(a))
+        if y is None:
+            y = self._coerce(b, 1, len(b))
+        if x is None or y is None:
+            return None
+        return x, y
+
+    def _target(self, out, rows, cols):
+        """ndarray поверх буфера out подходящего размера или None."""
+        if self._is_float(out) and len(out) == rows * cols:
+            return self._view(out, rows, cols)
+        return None
+
+    def add(self, a, b, out=None):
+        operands = self._binary(a, b)
+        if operands is None:
+            return super().add(a, b)
+        target = self._target(out, 1, len(a))
+        if target is None:
+            return self._pack(operands[0] + operands[1])
+        self.np.add(*operands, out=target)
+        return out
+
+    def sub(self, a, b, out=None):
+        operands = self._binary(a, b)
+        if operands is None:
+            return super().sub(a, b)
+        target = self._target(out, 1, len(a))
+        if target is None:
+            return self._pack(operands[0] - operands[1])
+        self.np.subtract(*operands, out=target)
+        return out
+
+    def scale(self, a, k, out=None):
+        x = self._view(a, 1, len(a))
+        if x is None or not isinstance(k, (int, float)):
+            return super().scale(a, k)
+        target = self._target(out, 1, len(a))
+        if target is None:
+            return self._pack(x * k)
+        self.np.multiply(x, k, out=target)
+        return out
+
+    def combine(self, buffers, coefs):
+        views = [self._view(b, 1, len(b)) for b in buffers]
+        if all(v is None for v in views) or not all(isinstance(c, (int, float)) for c in coefs):
+            return super().combine(buffers, coefs)
+        views = [v if v is not None else self._coerce(b, 1, len(b)) for v, b in zip(views, buffers)]
+        if any(v is None for v in views):
+            return super().combine(buffers, coefs)
+        np = self.np
+        out = views[0] * coefs[0]
+        scratch = None
+        for v, c in zip(views[1:], coefs[1:]):
+            if c == 1:
+                out += v
+            elif c == -1:
+                out -= v
+            else:
+                if scratch is None:
+                    scratch = np.empty_like(out)
+                out += np.multiply(v, c, out=scratch)
+        return self._pack(out)
+
+    def matmul(self, a, b, n, m, p, out=None):
+        operands = self._binary(a, b)
+        if operands is None:
+            return super().matmul(a, b, n, m, p)
+        x, y = operands
+        target = self._target(out, n, p)
+        if target is None:
+            return self._pack(x.reshape(n, m) @ y.reshape(m, p))
+        self.np.matmul(x.reshape(n, m), y.reshape(m, p), out=target)
+        return out
+
+    def matvec(self, a, x, rows, cols):
+        view = self._view(a, rows, cols)
+        if view is None:
+            return super().matvec(a, x, rows, cols)
+        return (view @ self.np.asarray(x, dtype=self.np.float64)).tolist()
+
+    def transpose(self, a, rows, cols, out=None):
+        x = self._view(a, rows, cols)
+        if x is None:
+            return super().transpose(a, rows, cols)
+        target = self._target(out, cols, rows)
+        if target is None:
+            return self._pack(self.np.ascontiguousarray(x.T))
+        target[...] = x.T
+        return out
+
+    def eliminate(self, a, rows, cols, normalize, eps):
+        x = self._coerce(a, rows, cols)
+        if x is None:
+            return super().eliminate(a, rows, cols, normalize, eps)
+        np = self.np
+        matrix = x.copy()
+        swaps = 0
+        row = col = 0
+
+        while row < rows and col < cols:
+            nonzero = np.flatnonzero(np.abs(matrix[row:, col]) > eps)
+            if nonzero.size == 0:
+                col += 1
+                continue
+
+            pivot_row = row + int(nonzero[0])
+            if pivot_row != row:
+                matrix[[row, pivot_row]] = matrix[[pivot_row, row]]
+                swaps += 1
+
+            if normalize:
+                matrix[row] /= matrix[row, col]
+
+            below = matrix[row + 1:, col]
+            targets = np.flatnonzero(np.abs(below) > eps)
+            if targets.size:
+                factors = below[targets]
+                if not normalize:
+                    factors = factors / matrix[row, col]
+                targets += row + 1
+                matrix[targets, col:] -= np.outer(factors, matrix[row, col:])
+
+            row += 1
+            col += 1
+
+        return self._pack(matrix), swaps
+
+    def lu_factor(self, a, rows, cols, eps):
+        x = self._coerce(a, rows, cols)
+        if x is None:
+            return super().lu_factor(a, rows, cols, eps)
+        np = self.np
+        lu = x.copy()
+        perm = list(range(rows))
+        pivots = []
+        swaps = 0
+        row = 0
+        for col in range(cols):
+            if row == rows:
+                break
+            column = np.abs(lu[row:, col])
+            offset = int(np.argmax(column))
+            if column[offset] <= eps:
+                continue
+            pivot_row = row + offset
+            if pivot_row != row:
+                lu[[row, pivot_row]] = lu[[pivot_row, row]]
+                perm[row], perm[pivot_row] = perm[pivot_row], perm[row]
+                swaps += 1
+            lu[row + 1:, col] /= lu[row, col]
+            lu[row + 1:, col + 1:] -= np.outer(lu[row + 1:, col], lu[row, col + 1:])
+            pivots.append(col)
+            row += 1
+        return self._pack(lu), perm, pivots, swaps
+
+    def lu_forward(self, lu, perm, pivots, rows, cols, rhs, k):
+        factors = self._view(lu, rows, cols)
+        b = self._coerce(rhs, rows, k)
+        if factors is None or b is None:
+            return super().lu_forward(lu, perm, pivots, rows, cols, rhs, k)
+        y = b[perm]
+        for j, col in enumerate(pivots):
+            y[j + 1:] -= self.np.outer(factors[j + 1:, col], y[j])
+        return self._pack(y)
+
+    def lu_backward(self, lu, pivots, cols, y, k):
+        rank = len(pivots)
+        factors = self._view(lu, len(lu) // cols, cols)
+        rhs = self._coerce(y, len(y) // k, k)
+        if factors is None or rhs is None:
+            return super().lu_backward(lu, pivots, cols, y, k)
+        x = self.np.zeros((cols, k))
+        for i in range(rank - 1, -1, -1):
+            j = pivots[i]
+            x[j] = (rhs[i] - factors[i, j + 1:] @ x[j + 1:]) / factors[i, j]
+        return self._pack(x)
+
+    def cholesky_factor(self, a, n):
+        x = self._coerce(a, n, n)
+        if x is None:
+            return super().cholesky_factor(a, n)
+        np = self.np
+        try:
+            lower = np.linalg.cholesky(x)
+        except np.linalg.LinAlgError:
+            return None
+        return self._pack(np.ascontiguousarray(lower[np.tril_indices(n)]))
+
+    def cholesky_solve(self, packed, n, rhs, k):
+        b = self._coerce(rhs, n, k)
+        if not isinstance(packed, array) or b is None:
+            return super().cholesky_solve(packed, n, rhs, k)
+        np = self.np
+        lower = np.zeros((n, n))
+        lower[np.tril_indices(n)] = np.frombuffer(packed, dtype=np.float64)
+        y = b.copy()
+        for i in range(n):
+            y[i] = (y[i] - lower[i, :i] @ y[:i]) / lower[i, i]
+        for i in range(n - 1, -1, -1):
+            y[i] /= lower[i, i]
+            y[:i] -= np.outer(lower[i, :i], y[i])
+        return self._pack(y)
+
+    def eliminate_mod(self, a, rows, cols, p):
+        # Блочное исключение в float64. Вычеты приводятся лениво, в диапазон
+        # (-p, 2p), умножением на 1/p (остаток np.remainder в разы медленнее),
+        # и точно только в столбце поиска ведущего элемента. Обновление хвоста
+        # одним умножением через BLAS точно, пока modular_block * (2p)^2 < 2^53.
+        if p >= 1 << 23:
+            return super().eliminate_mod(a, rows, cols, p)
+        np = self.np
+        inv_p = 1.0 / p
+
+        def reduce(x):
+            return x - p * np.floor(x * inv_p)
+
+        try:
+            m = np.array(a, dtype=np.int64)
+        except OverflowError:
+            m = np.array([x % p for x in a], dtype=np.int64)
+        m = (m % p).astype(np.float64).reshape(rows, cols)
+        det = 1
+        rank = 0
+        block = self.modular_block
+        for j0 in range(0, cols, block):
+            if rank == rows:
+                break
+            j1 = min(j0 + block, cols)
+            r0 = rank
+            pivot_cols = []
+            for col in range(j0, j1):
+                if rank == rows:
+                    break
+                column = m[rank:, col] % p
+                nonzero = np.flatnonzero(column)
+                if not nonzero.size:
+                    continue
+                pivot_row = rank + int(nonzero[0])
+                if pivot_row != rank:
+                    m[[rank, pivot_row]] = m[[pivot_row, rank]]
+                    column[[0, nonzero[0]]] = column[[nonzero[0], 0]]
+                    det = -det
+                pivot = int(column[0])
+                det = det * pivot % p
+                factors = reduce(column[1:] * pow(pivot, -1, p))
+                m[rank + 1:, col + 1:j1] = reduce(m[rank + 1:, col + 1:j1]
+                                                  - np.outer(factors, m[rank, col + 1:j1]))
+                m[rank + 1:, col] = factors
+                pivot_cols.append(col)
+                rank += 1
+            if j1 == cols or not pivot_cols:
+                continue
+            for t, col in enumerate(pivot_cols[:-1]):
+                r = r0 + t
+                m[r + 1:rank, j1:] = reduce(m[r + 1:rank, j1:]
+                                            - np.outer(m[r + 1:rank, col], m[r, j1:]))
+            if rank < rows:
+                m[rank:, j1:] = reduce(m[rank:, j1:] - m[rank:, pivot_cols] @ m[r0:rank, j1:])
+        return rank, det % p if rank == rows == cols else 0
+
+
+BACKENDS = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+}
+
+_current = None
+
+
+def set_backend(name):
+    """Выбирает вычислительный бэкенд для всех операций Matrix.
+
+    Args:
+        name (str): "python", "numpy" или "auto" (NumPy, если установлен).
+
+    Returns:
+        str: Имя выбранного бэкенда.
+
+    Raises:
+        ValueError: Если имя бэкенда неизвестно или NumPy не установлен.
+    """
+    global _current
+    name = name.lower()
+    if name == "auto":
+        try:
+            _current = NumpyBackend()
+        except ImportError:
+            _current = PythonBackend()
+        return _current.name
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд '{name}', доступны: auto, {', '.join(BACKENDS)}")
+    try:
+        _current = BACKENDS[name]()
+    except ImportError:
+        raise ValueError(f"Бэкенд '{name}' недоступен: NumPy не установлен")
+    return _current.name
+
+
+def get_backend():
+    """Возвращает активный бэкенд, при первом вызове выбирая его по
+    переменной окружения MATRIX_BACKEND (по умолчанию "auto")."""
+    if _current is None:
+        try:
+            set_backend(os.environ.get("MATRIX_BACKEND", "auto"))
+        except ValueError:
+            set_backend("auto")
+    return _current
@@ -0,0 +1,306 @@
+from matrix import Matrix, _pack
+
+
+class BandMatrix:
+    """Квадратная ленточная матрица в компактном формате.
+
+    Хранятся только kl поддиагоналей, главная диагональ и ku
+    наддиагоналей: строка i занимает kl + ku + 1 ячеек, элемент (i, j)
+    лежит в ячейке i * (kl + ku + 1) + (j - i + kl). Трёхдиагональная
+    система из 100 000 уравнений занимает 300 000 чисел вместо 10^10.
+
+    Attributes:
+        n (int): Размер матрицы.
+        kl (int): Количество поддиагоналей.
+        ku (int): Количество наддиагоналей.
+        bands: Плоский буфер ленты (array('d') или list).
+    """
+    __slots__ = ('n', 'kl', 'ku', 'bands', '_factor')
+
+    def __init__(self, n, kl, ku, bands):
+        """Создаёт матрицу из готового буфера ленты.
+
+        Args:
+            n (int): Размер матрицы.
+            kl (int): Количество поддиагоналей.
+            ku (int): Количество наддиагоналей.
+            bands (iterable): n * (kl + ku + 1) элементов по строкам;
+                ячейки вне матрицы должны быть нулевыми.
+
+        Raises:
+            ValueError: Если размеры некорректны.
+        """
+        if n <= 0 or kl < 0 or ku < 0:
+            raise ValueError("Некорректные размеры ленточной матрицы")
+        self.n = n
+        self.kl = kl
+        self.ku = ku
+        self.bands = _pack(list(bands))
+        if len(self.bands) != n * (kl + ku + 1):
+            raise ValueError("Размер буфера ленты не соответствует n, kl и ku")
+        self._factor = None
+
+    @classmethod
+    def tridiagonal(cls, lower, diag, upper):
+        """Создаёт трёхдиагональную матрицу по трём диагоналям.
+
+        Args:
+            lower (list[float]): Поддиагональ длины n - 1.
+            diag (list[float]): Главная диагональ длины n.
+            upper (list[float]): Наддиагональ длины n - 1.
+
+        Returns:
+            BandMatrix: Матрица с kl = ku = 1.
+
+        Raises:
+            ValueError: Если длины диагоналей не согласованы.
+        """
+        n = len(diag)
+        if len(lower) != n - 1 or len(upper) != n - 1:
+            raise ValueError("Длины диагоналей должны быть n - 1, n, n - 1")
+        bands = []
+        for i in range(n):
+            bands.append(lower[i - 1] if i > 0 else 0)
+            bands.append(diag[i])
+            bands.append(upper[i] if i < n - 1 else 0)
+        return cls(n, 1, 1, bands)
+
+    @classmethod
+    def from_dense(cls, matrix, kl=None, ku=None):
+        """Извлекает ленту из плотной квадратной матрицы.
+
+        Args:
+            matrix (Matrix): Квадратная матрица.
+            kl (int, optional): Количество поддиагоналей. По умолчанию
+                определяется по matrix.bandwidth().
+            ku (int, optional): Количество наддиагоналей. По умолчанию
+                определяется по matrix.bandwidth().
+
+        Returns:
+            BandMatrix: Ленточная матрица (элементы вне ленты отбрасываются).
+
+        Raises:
+            ValueError: Если матрица не квадратная.
+        """
+        if not matrix.is_square():
+            raise ValueError("Ленточный формат определён только для квадратных матриц")
+        if kl is None or ku is None:
+            lower, upper = matrix.bandwidth()
+            kl = lower if kl is None else kl
+            ku = upper if ku is None else ku
+        n, buf = matrix.rows, matrix._buf
+        bands = []
+        for i in range(n):
+            lo, hi = i - kl, i + ku + 1
+            bands.extend([0] * max(0, -lo))
+            bands.extend(buf[i * n + max(lo, 0):i * n + min(hi, n)])
+            bands.extend([0] * max(0, hi - n))
+        return cls(n, kl, ku, bands)
+
+    def to_dense(self):
+        """Преобразует в плотную матрицу.
+
+        Returns:
+            Matrix: Плотная матрица n x n.
+        """
+        n, w = self.n, self.kl + self.ku + 1
+        result = [0] * (n * n)
+        for i in range(n):
+            for t in range(max(0, self.kl - i), min(w, n - i + self.kl)):
+                result[i * n + i - self.kl + t] = self.bands[i * w + t]
+        return Matrix._from_flat(n, n, result)
+
+    def factor(self):
+        """Возвращает кэшированное ленточное LU-разложение.
+
+        Returns:
+            BandLU: Разложение матрицы.
+        """
+        if self._factor is None:
+            self._factor = BandLU(self)
+        return self._factor
+
+    def determinant(self):
+        """Вычисляет определитель за O(n * kl * (kl + ku)).
+
+        Returns:
+            float: Значение определителя.
+        """
+        return self.factor().determinant()
+
+    def solve_system(self, b):
+        """Решает систему Ax = b за O(n * kl * (kl + ku)).
+
+        Args:
+            b (list[float]): Вектор свободных членов.
+
+        Returns:
+            list[float]: Вектор решения.
+
+        Raises:
+            ValueError: Если размерность b не соответствует матрице
+                или матрица вырожденная.
+        """
+        if len(b) != self.n:
+            raise ValueError("Размерность вектора b не соответствует матрице A")
+        return self.factor().solve(b)
+
+
+class BandLU:
+    """LU-разложение ленточной матрицы.
+
+    Трёхдиагональные матрицы с диагональным преобладанием раскладываются
+    методом прогонки (алгоритм Томаса) без перестановок. Остальные -
+    ленточным исключением с частичным выбором ведущего элемента, при
+    котором верхняя ширина ленты U растёт до kl + ku.
+
+    Attributes:
+        singular (bool): True, если найден нулевой ведущий элемент.
+    """
+    def __init__(self, band, eps=1e-12):
+        """Выполняет разложение.
+
+        Args:
+            band (BandMatrix): Раскладываемая матрица.
+            eps (float, optional): Ведущие элементы с модулем не больше eps
+                считаются нулевыми. По умолчанию 1e-12.
+        """
+        self.n = band.n
+        self.kl = band.kl
+        self.ku = band.ku
+        self.eps = eps
+        self.singular = False
+        if band.kl == 1 and band.ku == 1 and self._diagonally_dominant(band):
+            self._thomas_factor(band)
+        else:
+            self._band_factor(band)
+
+    @staticmethod
+    def _diagonally_dominant(band):
+        bands = band.bands
+        return all(abs(bands[3 * i + 1]) >= abs(bands[3 * i]) + abs(bands[3 * i + 2])
+                   for i in range(band.n))
+
+    def _thomas_factor(self, band):
+        n, bands, eps = self.n, band.bands, self.eps
+        self.method = "thomas"
+        lower = [bands[3 * i] for i in range(n)]
+        upper = [bands[3 * i + 2] for i in range(n)]
+        diag = [0.0] * n
+        factors = [0.0] * n
+        d = bands[1]
+        for i in range(n):
+            if i:
+                factors[i] = lower[i] / diag[i - 1]
+                d = bands[3 * i + 1] - factors[i] * upper[i - 1]
+            if abs(d) <= eps:
+                self.singular = True
+                return
+            diag[i] = d
+        self.diag = diag
+        self.upper = upper
+        self.factors = factors
+        self.swaps = 0
+
+    def _band_factor(self, band):
+        n, kl, ku, eps = self.n, self.kl, self.ku, self.eps
+        self.method = "band"
+        w_in = kl + ku + 1
+        # Строка на позиции r хранит столбцы [r - kl, r + kl + ku].
+        width = 2 * kl + ku + 1
+        rows = []
+        for i in range(n):
+            rows.append(list(band.bands[i * w_in:(i + 1) * w_in]) + [0] * kl)
+        swaps = 0
+        pivots = []
+        steps = []
+        for k in range(n):
+            last = min(n - 1, k + kl)
+            p = max(range(k, last + 1), key=lambda r: abs(rows[r][k - r + kl]))
+            if abs(rows[p][k - p + kl]) <= eps:
+                self.singular = True
+                return
+            if p != k:
+                shift = p - k
+                rows[k], rows[p] = ([0] * shift + rows[p][:width - shift],
+                                    rows[k][shift:] + [0] * shift)
+                swaps += 1
+            pivots.append(p)
+            pivot_row = rows[k]
+            pivot = pivot_row[kl]
+            span = min(n, k + kl + ku + 1) - k
+            tail = pivot_row[kl + 1:kl + span]
+            multipliers = []
+            for r in range(k + 1, last + 1):
+                row = rows[r]
+                idx = k - r + kl
+                factor = row[idx] / pivot
+                if factor:
+                    row[idx] = 0
+                    row[idx + 1:idx + span] = [x - factor * y for x, y in zip(row[idx + 1:idx + span], tail)]
+                    multipliers.append((r, factor))
+            steps.append(multipliers)
+        self.rows = rows
+        self.pivots = pivots
+        self.steps = steps
+        self.swaps = swaps
+
+    def determinant(self):
+        """Определитель как произведение ведущих элементов.
+
+        Returns:
+            float: Значение определителя; 0.0 для вырожденной матрицы.
+        """
+        if self.singular:
+            return 0.0
+        det = 1.0
+        if self.method == "thomas":
+            for d in self.diag:
+                det *= d
+        else:
+            for row in self.rows:
+                det *= row[self.kl]
+        return -det if self.swaps % 2 == 1 else det
+
+    def solve(self, b):
+        """Решает систему Ax = b.
+
+        Args:
+            b (list[float]): Вектор свободных членов.
+
+        Returns:
+            list[float]: Вектор решения.
+
+        Raises:
+            ValueError: Если матрица вырожденная.
+        """
+        if self.singular:
+            raise ValueError("Матрица вырожденная, ленточное решение невозможно")
+        n = self.n
+        y = [float(v) for v in b]
+        if self.method == "thomas":
+            factors, diag, upper = self.factors, self.diag, self.upper
+            for i in range(1, n):
+                y[i] -= factors[i] * y[i - 1]
+            y[n - 1] /= diag[n - 1]
+            for i in range(n - 2, -1, -1):
+                y[i] = (y[i] - upper[i] * y[i + 1]) / diag[i]
+            return y
+
+        for k in range(n):
+            p = self.pivots[k]
+            if p != k:
+                y[k], y[p] = y[p], y[k]
+            yk = y[k]
+            if yk:
+                for r, factor in self.steps[k]:
+                    y[r] -= factor * yk
+        kl = self.kl
+        reach = self.kl + self.ku
+        for k in range(n - 1, -1, -1):
+            row = self.rows[k]
+            s = y[k]
+            for t in range(1, min(reach, n - 1 - k) + 1):
+                s -= row[kl + t] * y[k + t]
+            y[k] = s / row[kl]
+        return y
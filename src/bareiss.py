@@ -0,0 +1,227 @@
+"""Точное исключение Барейса для целых и рациональных матриц.
+
+Алгоритм Барейса выполняет исключение без дробей: после k-го шага каждый
+элемент равен минору порядка k + 1 исходной матрицы и делится на
+предыдущий ведущий элемент нацело. Поэтому длина промежуточных целых
+растёт линейно, а не экспоненциально, как при наивном исключении
+над ``Fraction``.
+"""
+from fractions import Fraction
+from math import lcm
+
+
+def is_exact(values):
+    """Проверяет, что все элементы - целые числа или Fraction."""
+    return all(type(x) is int or type(x) is Fraction for x in values)
+
+
+def exact_value(x):
+    """Возвращает int для целочисленной Fraction, иначе саму Fraction."""
+    if type(x) is Fraction and x.denominator == 1:
+        return x.numerator
+    return x
+
+
+def integer_rows(buf, rows, cols, multipliers=None):
+    """Приводит строки матрицы к целым, домножая каждую на НОК знаменателей.
+
+    Args:
+        buf: Плоский буфер из int и Fraction.
+        rows, cols (int): Размеры матрицы.
+        multipliers (list, optional): Если задан, в него добавляются
+            множители строк по порядку.
+
+    Returns:
+        tuple[list[list[int]], int]: Целые строки и произведение множителей.
+    """
+    result = []
+    scale = 1
+    for i in range(rows):
+        row = list(buf[i * cols:(i + 1) * cols])
+        d = lcm(*(x.denominator for x in row if type(x) is Fraction)) if any(
+            type(x) is Fraction for x in row) else 1
+        if d != 1:
+            row = [int(x * d) for x in row]
+            scale *= d
+        if multipliers is not None:
+            multipliers.append(d)
+        result.append(row)
+    return result, scale
+
+
+def _eliminate(rows, cols, steps=None):
+    """Прямой ход Барейса над списком целых строк (на месте).
+
+    Ведущие элементы выбираются только в первых cols столбцах; остальные
+    столбцы (правые части) преобразуются вместе со строками.
+
+    Args:
+        rows (list[list[int]]): Строки.
+        cols (int): Количество столбцов, в которых ищутся ведущие элементы.
+        steps (list, optional): Если задан, в него записываются шаги
+            (строка, переставленная строка, ведущий элемент, предыдущий
+            ведущий элемент, множители строк ниже) для ``_replay``.
+
+    Returns:
+        tuple[list[int], int]: Столбцы ведущих элементов и количество
+            перестановок строк.
+    """
+    n = len(rows)
+    width = len(rows[0]) if rows else 0
+    pivots = []
+    swaps = 0
+    prev = 1
+    r = 0
+    for c in range(cols):
+        if r == n:
+            break
+        candidates = [i for i in range(r, n) if rows[i][c]]
+        if not candidates:
+            continue
+        p = min(candidates, key=lambda i: abs(rows[i][c]))
+        if p != r:
+            rows[r], rows[p] = rows[p], rows[r]
+            swaps += 1
+        pivot_row = rows[r]
+        pivot = pivot_row[c]
+        tail = pivot_row[c + 1:width]
+        if steps is not None:
+            steps.append((r, p, pivot, prev, [rows[i][c] for i in range(r + 1, n)]))
+        for i in range(r + 1, n):
+            row = rows[i]
+            factor = row[c]
+            row[c] = 0
+            if factor:
+                row[c + 1:] = [(pivot * x - factor * y) // prev
+                               for x, y in zip(row[c + 1:], tail)]
+            elif prev != pivot:
+                row[c + 1:] = [pivot * x // prev for x in row[c + 1:]]
+        prev = pivot
+        pivots.append(c)
+        r += 1
+    return pivots, swaps
+
+
+def _replay(rows, steps):
+    """Повторяет записанные шаги ``_eliminate`` над другими столбцами
+    (на месте). Деления остаются точными: результат тот же, что при
+    исключении расширенной матрицы."""
+    for r, p, pivot, prev, factors in steps:
+        if p != r:
+            rows[r], rows[p] = rows[p], rows[r]
+        pivot_row = rows[r]
+        for i, factor in enumerate(factors, r + 1):
+            if factor:
+                rows[i] = [(pivot * x - factor * y) // prev for x, y in zip(rows[i], pivot_row)]
+            elif prev != pivot:
+                rows[i] = [pivot * x // prev for x in rows[i]]
+
+
+def _back_substitute(rows, pivots, cols, j):
+    """Решает ступенчатую систему для столбца j (свободные переменные = 0)."""
+    x = [0] * cols
+    for i in range(len(pivots) - 1, -1, -1):
+        row = rows[i]
+        c = pivots[i]
+        s = row[j] - sum(row[t] * x[t] for t in range(c + 1, cols) if x[t])
+        x[c] = exact_value(Fraction(s, row[c]) if type(s) is int else s / row[c])
+    return x
+
+
+class Bareiss:
+    """Точное ступенчатое разложение целой или рациональной матрицы.
+
+    Attributes:
+        rows (int): Количество строк.
+        cols (int): Количество столбцов.
+        pivots (list[int]): Столбцы ведущих элементов.
+        free_vars (list[int]): Столбцы без ведущих элементов.
+        swaps (int): Количество перестановок строк.
+    """
+    def __init__(self, matrix):
+        """Выполняет исключение.
+
+        Args:
+            matrix (Matrix): Матрица из int и Fraction.
+        """
+        self.rows = matrix.rows
+        self.cols = matrix.cols
+        self._multipliers = []
+        self.echelon, self.scale = integer_rows(matrix._buf, self.rows, self.cols,
+                                                self._multipliers)
+        self._steps = []
+        self.pivots, self.swaps = _eliminate(self.echelon, self.cols, self._steps)
+        pivot_set = set(self.pivots)
+        self.free_vars = [j for j in range(self.cols) if j not in pivot_set]
+
+    @property
+    def rank(self):
+        """int: Точный ранг матрицы."""
+        return len(self.pivots)
+
+    def determinant(self):
+        """Точный определитель квадратной матрицы.
+
+        Последний ведущий элемент Барейса равен определителю матрицы
+        с целыми строками; он делится на произведение множителей строк.
+
+        Returns:
+            int или Fraction: Значение определителя.
+        """
+        n = self.rows
+        if self.rank < n:
+            return 0
+        det = self.echelon[n - 1][n - 1]
+        if self.swaps % 2 == 1:
+            det = -det
+        return exact_value(Fraction(det, self.scale)) if self.scale != 1 else det
+
+    def solve(self, rhs, k=1):
+        """Находит точное частное решение AX = B для k правых частей.
+
+        Исключение не повторяется: записанные при разложении шаги
+        применяются к правым частям (все k столбцов за один проход), после
+        чего выполняется обратный ход по готовой ступенчатой форме.
+
+        Args:
+            rhs: Плоский буфер B размера rows x k из int и Fraction.
+            k (int, optional): Количество правых частей. По умолчанию 1.
+
+        Returns:
+            list: Плоский буфер X размера cols x k.
+
+        Raises:
+            ValueError: Если система несовместна хотя бы для одной
+                правой части.
+        """
+        # B домножается на общий знаменатель и на множители строк A.
+        denominator = lcm(*(x.denominator for x in rhs if type(x) is Fraction)) if any(
+            type(x) is Fraction for x in rhs) else 1
+        columns = [[int(x * d * denominator) for x in rhs[i * k:(i + 1) * k]]
+                   for i, d in enumerate(self._multipliers)]
+        _replay(columns, self._steps)
+        rank = self.rank
+        if any(x for row in columns[rank:] for x in row):
+            raise ValueError("Система несовместна")
+        rows = [self.echelon[i][:self.cols] + columns[i] for i in range(rank)]
+        solutions = [_back_substitute(rows, self.pivots, self.cols, self.cols + j)
+                     for j in range(k)]
+        if denominator != 1:
+            solutions = [[exact_value(Fraction(x) / denominator) for x in column]
+                         for column in solutions]
+        return [solutions[j][i] for i in range(self.cols) for j in range(k)]
+
+    def null_space(self):
+        """Точная фундаментальная система решений однородной системы.
+
+        Returns:
+            list[list]: По одному вектору на каждую свободную переменную.
+        """
+        fsr = []
+        rank = self.rank
+        for f in self.free_vars:
+            rows = [row[:self.cols] + [-row[f]] for row in self.echelon[:rank]]
+            vector = _back_substitute(rows, self.pivots, self.cols, self.cols)
+            vector[f] = 1
+            fsr.append(vector)
+        return fsr
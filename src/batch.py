@@ -0,0 +1,163 @@
+"""Пакетное выполнение операций из файла заданий без диалога.
+
+Файл заданий - JSON Lines, одно задание на строку::
+
+    {"id": "c1", "op": "multiply", "inputs": ["A.npy", "B.txt"], "output": "C.npy"}
+    {"op": "scalar_multiply", "inputs": ["A.txt"], "scalar": 2.5, "output": "A2.txt.gz"}
+    {"op": "determinant", "inputs": ["A.txt"]}
+
+Операнды читаются ``io_handler.load_matrix`` (формат определяется по
+содержимому), матричный результат записывается ``io_handler.write_matrix``
+(формат - по расширению output), числовой результат попадает в журнал и,
+если задан output, в файл из одной строки. Пути считаются от текущего
+каталога.
+
+Задания выполняются в пуле процессов пачками (одна пачка - одна передача
+между процессами), а журнал - JSON Lines с результатом и временем чтения,
+вычисления и записи каждого задания - пишется в порядке заданий по мере
+их выполнения. Ошибка в задании записывается в журнал и не останавливает
+остальные.
+"""
+import json
+import os
+import time
+
+import io_handler
+from cache import default_cache
+from matrix import Matrix
+from parallel import get_pool
+
+# Операции: количество операндов и функция от операндов и задания.
+# Дорогие операции идут через кэш результатов процесса (см. cache.py).
+OPERATIONS = {
+    'add': (2, lambda a, b, job: a + b),
+    'subtract': (2, lambda a, b, job: a - b),
+    'multiply': (2, lambda a, b, job: a * b),
+    'scalar_multiply': (1, lambda a, job: a * _scalar(job)),
+    'transpose': (1, lambda a, job: a.transpose()),
+    'determinant': (1, lambda a, job: default_cache.determinant(a)),
+    'inverse': (1, lambda a, job: default_cache.inverse(a)),
+    'trace': (1, lambda a, job: a.trace()),
+    'rank': (1, lambda a, job: default_cache.rank(a)),
+    'solve': (2, lambda a, b, job: default_cache.solve_system(a, b)),
+}
+
+
+def _scalar(job):
+    scalar = job.get('scalar')
+    if type(scalar) not in (int, float):
+        raise ValueError("Для scalar_multiply нужно число 'scalar'")
+    return scalar
+
+
+def _json_value(value):
+    """Число для журнала: Fraction и другие точные типы - строкой."""
+    return value if type(value) in (int, float) else str(value)
+
+
+def run_job(job):
+    """Выполняет одно задание.
+
+    Args:
+        job (dict): Задание: op, inputs, необязательные output и scalar.
+
+    Returns:
+        dict: Запись журнала: id, op, status ("ok" или "error"), время
+            этапов в секундах и result (для числовых результатов) или
+            error (текст ошибки).
+    """
+    record = {'id': job.get('id'), 'op': job.get('op')}
+    try:
+        if job.get('op') not in OPERATIONS:
+            raise ValueError(f"Неизвестная операция '{job.get('op')}'")
+        arity, func = OPERATIONS[job['op']]
+        inputs = job.get('inputs')
+        if not isinstance(inputs, list) or len(inputs) != arity:
+            raise ValueError(f"Операции '{job['op']}' нужно файлов операндов: {arity}")
+        start = time.perf_counter()
+        # Задание уже выполняется в пуле, поэтому операнды читаются в одном процессе.
+        operands = [io_handler.load_matrix(path, workers=1) for path in inputs]
+        loaded = time.perf_counter()
+        result = func(*operands, job)
+        computed = time.perf_counter()
+        output = job.get('output')
+        if not isinstance(result, Matrix):
+            record['result'] = _json_value(result)
+            result = [[result]]
+        if output is not None:
+            io_handler.write_matrix(result, output)
+        saved = time.perf_counter()
+        record.update(status='ok', load=round(loaded - start, 6),
+                      compute=round(computed - loaded, 6), save=round(saved - computed, 6))
+    except Exception as e:
+        record.update(status='error', error=str(e) or type(e).__name__)
+    return record
+
+
+def read_jobs(filename):
+    """Читает файл заданий.
+
+    Пустые строки пропускаются; задания без id получают номер строки.
+
+    Args:
+        filename (str): Файл заданий JSON Lines.
+
+    Returns:
+        list: Задания (dict) и, для строк с ошибкой, готовые записи
+            журнала об ошибке.
+    """
+    jobs = []
+    with open(filename, encoding='utf-8') as file:
+        for line_num, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("задание должно быть объектом JSON")
+            except ValueError as e:
+                jobs.append({'id': line_num, 'status': 'error',
+                             'error': f"Ошибка в строке {line_num}: {e}"})
+                continue
+            job.setdefault('id', line_num)
+            jobs.append(job)
+    return jobs
+
+
+def _run_chunk(jobs):
+    """Выполняет пачку заданий в процессе пула."""
+    return [job if 'status' in job else run_job(job) for job in jobs]
+
+
+def run_batch(jobs_file, log_file, workers=None, chunk_size=None):
+    """Выполняет все задания файла и пишет журнал.
+
+    Args:
+        jobs_file (str): Файл заданий JSON Lines.
+        log_file (str): Файл журнала JSON Lines (перезаписывается).
+        workers (int, optional): Количество процессов. По умолчанию
+            os.cpu_count(); при 1 задания выполняются в текущем процессе.
+        chunk_size (int, optional): Заданий в одной пачке. По умолчанию
+            столько, чтобы на процесс пришлось около четырёх пачек.
+
+    Returns:
+        dict: Итог: jobs (всего), failed (с ошибкой), seconds (общее время).
+    """
+    start = time.perf_counter()
+    jobs = read_jobs(jobs_file)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(jobs) // (workers * 4)))
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    if workers == 1:
+        results = map(_run_chunk, chunks)
+    else:
+        results = get_pool(workers).map(_run_chunk, chunks)
+    failed = 0
+    with open(log_file, 'w', encoding='utf-8') as log:
+        for records in results:
+            for record in records:
+                failed += record['status'] != 'ok'
+                log.write(json.dumps(record, ensure_ascii=False) + "\n")
+            log.flush()
+    return {'jobs': len(jobs), 'failed': failed, 'seconds': time.perf_counter() - start}
@@ -0,0 +1,175 @@
+"""Кэш результатов дорогих операций по содержимому матриц.
+
+Матрица сама кэширует свои разложения, но только на своём объекте:
+матрица, заново прочитанная из файла или собранная из тех же чисел,
+считается с нуля. ``ResultCache`` хранит результаты determinant, inverse,
+rank, solve_system (и любых других методов через ``call``) по ключу из
+хэша содержимого матрицы (``Matrix.content_hash``), имени операции и
+параметров, поэтому повторная операция над равной матрицей не вычисляется.
+
+Кэш ограничен количеством записей и оценкой занятой памяти и вытесняет
+давно не использованные записи (LRU). Изменённая матрица получает новый
+хэш, так что устаревший результат не вернётся. Результаты-матрицы и
+списки отдаются копиями, их можно изменять.
+
+Калькулятор и пакетный режим используют общий ``default_cache``; его
+можно отключить переменной окружения ``MATRIX_CACHE=0`` или вызовом
+``default_cache.configure(enabled=False)``.
+
+Пример:
+    >>> from cache import default_cache
+    >>> default_cache.determinant(Matrix([[1, 2], [3, 4]]))
+    -2
+    >>> default_cache.stats()['misses']
+    1
+"""
+import copy
+import hashlib
+import os
+import sys
+from array import array
+from collections import OrderedDict
+
+from matrix import Matrix
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 << 20
+
+
+def _key(value):
+    """Часть ключа для аргумента операции."""
+    if isinstance(value, Matrix):
+        return ('matrix', value.content_hash())
+    if isinstance(value, (list, tuple)):
+        # Вектор правой части и т.п.: хэш repr различает 1 и 1.0.
+        return ('seq', hashlib.blake2b(repr(value).encode(), digest_size=16).digest())
+    # 1 == 1.0 и у них один hash, поэтому тип - часть ключа.
+    return (type(value).__name__, value)
+
+
+def _size(value):
+    """Оценка памяти, занятой результатом, в байтах."""
+    if isinstance(value, Matrix):
+        buf = value._buf
+        if isinstance(buf, (array, memoryview)):
+            return len(buf) * 8
+        return sum(map(sys.getsizeof, buf)) + 8 * len(buf)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(map(_size, value))
+    return sys.getsizeof(value)
+
+
+def _clone(value):
+    if isinstance(value, Matrix):
+        return value.copy()
+    if isinstance(value, (list, tuple)):
+        return copy.deepcopy(value)
+    return value
+
+
+class ResultCache:
+    """LRU-кэш результатов операций над матрицами по их содержимому.
+
+    Attributes:
+        max_entries (int): Наибольшее количество записей.
+        max_bytes (int): Наибольший суммарный размер результатов (оценка).
+        enabled (bool): Включён ли кэш; выключенный только вычисляет.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, enabled=True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def call(self, method, matrix, *args, **params):
+        """Возвращает matrix.method(*args, **params) из кэша или вычисляет
+        и запоминает.
+
+        Ключ - имя метода, содержимое матрицы и всех аргументов (матрицы
+        сравниваются по содержимому, числа - по значению и типу, поэтому
+        eps=1e-12 и eps=1e-9 - разные записи). Исключения не кэшируются.
+
+        Args:
+            method (str): Имя метода Matrix.
+            matrix (Matrix): Матрица.
+            *args, **params: Аргументы метода.
+
+        Returns:
+            Результат метода.
+        """
+        if not self.enabled:
+            return getattr(matrix, method)(*args, **params)
+        key = (method, _key(matrix), tuple(map(_key, args)),
+               tuple(sorted((name, _key(value)) for name, value in params.items())))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _clone(entry[0])
+        self.misses += 1
+        result = getattr(matrix, method)(*args, **params)
+        size = _size(result)
+        if size <= self.max_bytes and self.max_entries > 0:
+            self._entries[key] = (_clone(result), size)
+            self._bytes += size
+            self._evict()
+        return result
+
+    def determinant(self, matrix):
+        """Matrix.determinant через кэш."""
+        return self.call('determinant', matrix)
+
+    def inverse(self, matrix):
+        """Matrix.inverse через кэш."""
+        return self.call('inverse', matrix)
+
+    def rank(self, matrix):
+        """Matrix.rank через кэш."""
+        return self.call('rank', matrix)
+
+    def solve_system(self, matrix, b, return_fsr=False):
+        """Matrix.solve_system через кэш."""
+        return self.call('solve_system', matrix, b, return_fsr=return_fsr)
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def configure(self, max_entries=None, max_bytes=None, enabled=None):
+        """Меняет ограничения кэша (лишние записи сразу вытесняются) или
+        включает и выключает его (выключение очищает кэш)."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if enabled is not None:
+            self.enabled = enabled
+            if not enabled:
+                self.clear()
+        self._evict()
+
+    def clear(self):
+        """Удаляет все записи (статистика сохраняется)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        """Статистика кэша.
+
+        Returns:
+            dict: hits, misses, evictions, entries, bytes, hit_rate.
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._entries), 'bytes': self._bytes,
+                'hit_rate': self.hits / total if total else 0.0}
+
+
+default_cache = ResultCache(enabled=os.environ.get("MATRIX_CACHE", "1") != "0")
@@ -1,5 +1,7 @@
+from cache import default_cache
 from io_handler import *
 from matrix import Matrix
+from outofcore import MEMORY_LIMIT, tiled_matmul
 
 class Calculator:
     """Организатор всех матричных операций"""
@@ -16,6 +18,8 @@ class Calculator:
         
         if data is None:
             return None
+        if isinstance(data, Matrix):  # двоичный файл уже загружен как Matrix
+            return data
         
         return Matrix(data)
     
@@ -39,7 +43,7 @@ class Calculator:
         try:
             result = A + B
             print_matrix(result, "Результат сложения")
-            ask_save_result(result.data)
+            ask_save_result(result)
             
         except ValueError as e:
             print(f"Ошибка: {e}")
@@ -66,7 +70,7 @@ class Calculator:
         try:
             result = A - B
             print_matrix(result, "Результат вычитания")
-            ask_save_result(result.data)
+            ask_save_result(result)
             
         except ValueError as e:
             print(f"Ошибка: {e}")
@@ -93,7 +97,7 @@ class Calculator:
         try:
             result = A * B
             print_matrix(result, "Результат умножения")
-            ask_save_result(result.data)
+            ask_save_result(result)
             
         except ValueError as e:
             print(f"Ошибка: {e}")
@@ -116,7 +120,7 @@ class Calculator:
         try:
             result = A * scalar
             print_matrix(result, f"Результат умножения на {scalar}")
-            ask_save_result(result.data)
+            ask_save_result(result)
             
         except Exception as e:
             print(f"Ошибка: {e}")
@@ -135,7 +139,7 @@ class Calculator:
         try:
             result = A.transpose()
             print_matrix(result, "Транспонированная матрица")
-            ask_save_result(result.data)
+            ask_save_result(result)
             
         except Exception as e:
             print(f"Ошибка: {e}")
@@ -152,18 +156,10 @@ class Calculator:
             return
         
         try:
-            det = A.determinant()
+            det = default_cache.determinant(A)
             print(f"\nОпределитель матрицы: {det}")
             print_matrix(A, "Исходная матрица")
-            save = input("\nСохранить результат в файл? (y/n): ").lower()
-            if save == 'y':
-                filename = input("Имя файла: ")
-                with open(filename, 'w') as f:
-                    f.write("Определитель матрицы:\n")
-                    for row in A.data:
-                        f.write(" ".join(str(x) for x in row) + "\n")
-                    f.write(f"\nОпределитель: {det}\n")
-                print(f"Результат сохранен в '{filename}'")
+            ask_save_result(A, "Определитель матрицы:", f"\nОпределитель: {det}")
                 
         except ValueError as e:
             print(f"Ошибка: {e}")
@@ -182,9 +178,9 @@ class Calculator:
             return
         
         try:
-            result = A.inverse()
+            result = default_cache.inverse(A)
             print_matrix(result, "Обратная матрица")
-            ask_save_result(result.data)
+            ask_save_result(result)
             
         except ValueError as e:
             print(f"Ошибка: {e}")
@@ -206,15 +202,7 @@ class Calculator:
             trace_val = A.trace()  # Используем trace из matrix.py
             print(f"\nСлед матрицы: {trace_val}")
             print_matrix(A, "Исходная матрица")
-            save = input("\nСохранить результат в файл? (y/n): ").lower()
-            if save == 'y':
-                filename = input("Имя файла: ")
-                with open(filename, 'w') as f:
-                    f.write("След матрицы:\n")
-                    for row in A.data:
-                        f.write(" ".join(str(x) for x in row) + "\n")
-                    f.write(f"\nСлед (trace): {trace_val}\n")
-                print(f"Результат сохранен в '{filename}'")
+            ask_save_result(A, "След матрицы:", f"\nСлед (trace): {trace_val}")
                 
         except ValueError as e:
             print(f"Ошибка: {e}")
@@ -233,20 +221,11 @@ class Calculator:
             return
         
         try:
-            rank_val = A.rank()
+            rank_val = default_cache.rank(A)
             print(f"\nРанг матрицы: {rank_val}")
             
             print_matrix(A, "Исходная матрица")
-            
-            save = input("\nСохранить результат в файл? (y/n): ").lower()
-            if save == 'y':
-                filename = input("Имя файла: ")
-                with open(filename, 'w') as f:
-                    f.write("Ранг матрицы:\n")
-                    for row in A.data:
-                        f.write(" ".join(str(x) for x in row) + "\n")
-                    f.write(f"\nРанг (rank): {rank_val}\n")
-                print(f"Результат сохранен в '{filename}'")
+            ask_save_result(A, "Ранг матрицы:", f"\nРанг (rank): {rank_val}")
                 
         except Exception as e:
             print(f"Ошибка: {e}")
@@ -284,31 +263,107 @@ class Calculator:
             need_fsr = input("\nНайти ФСР для соотвествующей ОСЛАУ? (y/n): ").lower() == 'y'
             
             if need_fsr:
-                solution = A.solve_system(b, return_fsr=True)
+                solution = default_cache.solve_system(A, b, return_fsr=True)
                 if isinstance(solution, tuple):
                     x_part, fsr, free_vars = solution
                     
                     print("\n=== ЧАСТНОЕ РЕШЕНИЕ ===")
                     for i, val in enumerate(x_part):
-                        print(f"x{i+1} = {val:.6f}")
+                        print(f"x{i+1} = {float(val):.6f}")
                     
                     print(f"\nСвободные переменные: x{', x'.join(str(v+1) for v in free_vars)}")
                     
                     if fsr:
                         print("\n=== ФУНДАМЕНТАЛЬНАЯ СИСТЕМА РЕШЕНИЙ ===")
                         for i, vec in enumerate(fsr):
-                            print(f"v{i+1} = [{', '.join(f'{v:.6f}' for v in vec)}]")
+                            print(f"v{i+1} = [{', '.join(f'{float(v):.6f}' for v in vec)}]")
                 else:
                     print("\n=== ЕДИНСТВЕННОЕ РЕШЕНИЕ ===")
                     for i, val in enumerate(solution):
-                        print(f"x{i+1} = {val:.6f}")
+                        print(f"x{i+1} = {float(val):.6f}")
             else:
-                solution = A.solve_system(b, return_fsr=False)
+                solution = default_cache.solve_system(A, b, return_fsr=False)
                 print("\n=== РЕШЕНИЕ ===")
                 for i, val in enumerate(solution):
-                    print(f"x{i+1} = {val:.6f}")
+                    print(f"x{i+1} = {float(val):.6f}")
                     
         except ValueError as e:
             print(f"Ошибка: {e}")
         except Exception as e:
             print(f"Непредвиденная ошибка: {e}")
+    
+    @staticmethod
+    def solve_system_batch():
+        """Решение СЛАУ с несколькими правыми частями"""
+        print("\n" + "="*40)
+        print(" СЛАУ С НЕСКОЛЬКИМИ ПРАВЫМИ ЧАСТЯМИ ")
+        print("="*40)
+        
+        print("\nМатрица коэффициентов A:")
+        A = Calculator.get_matrix("матрицу коэффициентов")
+        if A is None:
+            return
+        
+        print(f"\nМатрица правых частей B ({A.rows} строк, по столбцу на систему):")
+        B = Calculator.get_matrix("матрицу правых частей")
+        if B is None:
+            return
+        
+        try:
+            need_fsr = input("\nНайти ФСР для соотвествующей ОСЛАУ? (y/n): ").lower() == 'y'
+            solution = default_cache.solve_system(A, B, return_fsr=need_fsr)
+            if isinstance(solution, tuple):
+                X, fsr, free_vars = solution
+                print_matrix(X, "Частные решения (столбец j - решение для столбца j матрицы B)")
+                print(f"\nСвободные переменные: x{', x'.join(str(v+1) for v in free_vars)}")
+                print("\n=== ФУНДАМЕНТАЛЬНАЯ СИСТЕМА РЕШЕНИЙ ===")
+                for i, vec in enumerate(fsr):
+                    print(f"v{i+1} = [{', '.join(f'{float(v):.6f}' for v in vec)}]")
+            else:
+                X = solution
+                print_matrix(X, "Решения (столбец j - решение для столбца j матрицы B)")
+            ask_save_result(X)
+            
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+        except Exception as e:
+            print(f"Непредвиденная ошибка: {e}")
+    
+    @staticmethod
+    def multiply_files():
+        """Умножение больших матриц из файлов по блокам"""
+        print("\n" + "="*40)
+        print(" УМНОЖЕНИЕ БОЛЬШИХ МАТРИЦ ИЗ ФАЙЛОВ ")
+        print("="*40)
+        print("Матрицы читаются по блокам, а результат сразу пишется в файл,")
+        print("поэтому ни операнды, ни результат не обязаны помещаться в память.")
+        
+        path_a = input("\nФайл первой матрицы: ").strip()
+        path_b = input("Файл второй матрицы: ").strip()
+        out_path = input("Файл результата (.npy): ").strip()
+        limit = input(f"Бюджет памяти в МБ (Enter - {MEMORY_LIMIT >> 20}): ").strip()
+        
+        try:
+            memory_limit = int(limit) << 20 if limit else MEMORY_LIMIT
+            converted = {}
+            for path in (path_a, path_b):
+                if path not in converted and not is_binary_file(path):
+                    # Текстовый файл один раз преобразуется в двоичный рядом с исходным
+                    binary = path + ".npy"
+                    print(f"Преобразование '{path}' в '{binary}'...")
+                    text_to_binary(path, binary)
+                    converted[path] = binary
+            operands = [converted.get(path, path) for path in (path_a, path_b)]
+            
+            def progress(done, total):
+                print(f"\rГотово блоков: {done}/{total}", end="", flush=True)
+            
+            result = tiled_matmul(*operands, out_path, memory_limit=memory_limit, progress=progress)
+            print(f"\nРезультат {result.rows}x{result.cols} записан в '{out_path}'")
+            
+        except FileNotFoundError as e:
+            print(f"Файл '{e.filename}' не найден!")
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+        except Exception as e:
+            print(f"Непредвиденная ошибка: {e}")
@@ -0,0 +1,65 @@
+import math
+
+import backend
+
+
+class Cholesky:
+    """Разложение Холецкого A = L L^T симметричной положительно
+    определённой матрицы.
+
+    Требует вдвое меньше операций, чем LU-разложение, и хранит только
+    нижний треугольник L (n(n+1)/2 чисел, упакованных по строкам).
+
+    Attributes:
+        n (int): Размер матрицы.
+        packed: Нижний треугольник L по строкам.
+    """
+    def __init__(self, matrix):
+        """Вычисляет разложение.
+
+        Args:
+            matrix (Matrix): Симметричная квадратная матрица.
+
+        Raises:
+            ValueError: Если матрица не положительно определена.
+        """
+        self.n = matrix.rows
+        self.packed = backend.get_backend().cholesky_factor(matrix._buf, self.n)
+        if self.packed is None:
+            raise ValueError("Матрица не является положительно определённой")
+
+    def diagonal(self):
+        """Возвращает диагональ L."""
+        return [self.packed[i * (i + 3) // 2] for i in range(self.n)]
+
+    def lower(self):
+        """Возвращает L как плоский буфер n x n."""
+        n = self.n
+        result = [0.0] * (n * n)
+        for i in range(n):
+            start = i * (i + 1) // 2
+            result[i * n:i * n + i + 1] = self.packed[start:start + i + 1]
+        return result
+
+    def determinant(self):
+        """Определитель как квадрат произведения диагонали L."""
+        det = 1.0
+        for d in self.diagonal():
+            det *= d
+        return det * det
+
+    def log_determinant(self):
+        """Натуральный логарифм определителя (определитель всегда > 0)."""
+        return 2.0 * sum(math.log(d) for d in self.diagonal())
+
+    def solve(self, rhs, k=1):
+        """Решает AX = B для k правых частей.
+
+        Args:
+            rhs: Плоский буфер B размера n x k.
+            k (int, optional): Количество правых частей. По умолчанию 1.
+
+        Returns:
+            Плоский буфер X размера n x k.
+        """
+        return backend.get_backend().cholesky_solve(self.packed, self.n, rhs, k)
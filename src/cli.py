@@ -0,0 +1,149 @@
+"""Командная строка: однократные операции для конвейеров и пакетный режим.
+
+Примеры:
+    python main.py det < A.txt
+    cat A.txt | python main.py inverse | python main.py mul - B.txt > C.txt
+    python main.py scale 2.5 A.npy -o A2.txt.gz
+    python main.py --jobs jobs.jsonl --workers 8
+
+Операнд "-" (по умолчанию для операций с одним операндом) читается из
+стандартного ввода, остальные - из файлов; формат (текст, в том числе с
+дробями 3/2, или двоичный .npy) определяется по содержимому. Результат
+пишется в стандартный вывод текстом (с --binary - в двоичном формате) или
+в файл -o (формат по расширению), поэтому вывод одной команды можно
+подать на вход следующей. Операции те же, что в пакетном режиме
+(``batch.OPERATIONS``).
+
+Модуль не загружает меню и диалоговые функции, а пул процессов и NumPy
+импортируются только при необходимости, поэтому запуск одной операции
+занимает десятки миллисекунд.
+"""
+import argparse
+import os
+import sys
+
+import backend
+import io_handler
+from batch import OPERATIONS, run_batch
+from matrix import Matrix
+
+# Команда: (операция в batch.OPERATIONS, описание).
+COMMANDS = {
+    'add': ('add', "сумма A + B"),
+    'sub': ('subtract', "разность A - B"),
+    'mul': ('multiply', "произведение A * B"),
+    'scale': ('scalar_multiply', "произведение A на число"),
+    'transpose': ('transpose', "транспонированная матрица"),
+    'det': ('determinant', "определитель"),
+    'inverse': ('inverse', "обратная матрица"),
+    'trace': ('trace', "след"),
+    'rank': ('rank', "ранг"),
+    'solve': ('solve', "решение AX = B"),
+}
+
+# Если бэкенд не выбран явно, для матриц меньше этого размера используется
+# чистый Python: импорт NumPy (около 0.1 с) дольше самой операции.
+NUMPY_MIN_ELEMENTS = 64 * 64
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def build_parser():
+    """Парсер аргументов: команды операций и параметры пакетного режима."""
+    parser = argparse.ArgumentParser(
+        prog="main.py", description="Калькулятор матриц. Без аргументов запускается меню.")
+    parser.add_argument("--jobs", metavar="FILE",
+                        help="выполнить задания из файла JSON Lines без диалога (см. batch.py)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="количество процессов для заданий (по умолчанию - число ядер)")
+    parser.add_argument("--log", metavar="FILE",
+                        help="журнал результатов JSON Lines (по умолчанию <jobs>.results.jsonl)")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-o", "--output", metavar="FILE",
+                        help="файл результата (.npy - двоичный, .gz/.xz - сжатый текст)")
+    common.add_argument("--binary", action="store_true",
+                        help="писать результат в двоичном формате .npy")
+    common.add_argument("--backend", choices=["auto", "python", "numpy"],
+                        help="вычислительный бэкенд (по умолчанию MATRIX_BACKEND или выбор по размеру)")
+
+    commands = parser.add_subparsers(dest="command", metavar="КОМАНДА")
+    for name, (op, title) in COMMANDS.items():
+        sub = commands.add_parser(name, parents=[common], help=title, description=title)
+        if op == 'scalar_multiply':
+            sub.add_argument("scalar", type=_number, help="число")
+        if OPERATIONS[op][0] == 1:
+            sub.add_argument("inputs", nargs="?", default="-", metavar="A",
+                             help="файл матрицы или - для стандартного ввода (по умолчанию)")
+        else:
+            sub.add_argument("inputs", nargs=2, metavar="A/B",
+                             help="файлы матриц, один из них может быть - (стандартный ввод)")
+    return parser
+
+
+def _choose_backend(name, operands):
+    if name is None:
+        if "MATRIX_BACKEND" in os.environ:
+            return
+        name = "python" if max(m.rows * m.cols for m in operands) < NUMPY_MIN_ELEMENTS else "auto"
+    backend.set_backend(name)
+
+
+def run_jobs(args):
+    """Пакетный режим: выполняет файл заданий и печатает итог.
+
+    Returns:
+        int: Код возврата: 1, если какое-то задание завершилось ошибкой.
+    """
+    log = args.log or os.path.splitext(args.jobs)[0] + ".results.jsonl"
+    summary = run_batch(args.jobs, log, args.workers)
+    print(f"Заданий: {summary['jobs']}, с ошибками: {summary['failed']}, "
+          f"время: {summary['seconds']:.2f} с. Журнал: '{log}'")
+    return 1 if summary['failed'] else 0
+
+
+def run_command(args):
+    """Выполняет одну операцию над матрицами из файлов или стандартного ввода.
+
+    Returns:
+        int: Код возврата: 0 или 1 при ошибке (текст ошибки - в stderr).
+    """
+    paths = [args.inputs] if isinstance(args.inputs, str) else args.inputs
+    try:
+        if paths.count("-") > 1:
+            raise ValueError("Стандартный ввод можно использовать только для одного операнда")
+        operands = [io_handler.read_matrix(sys.stdin.buffer) if path == "-"
+                    else io_handler.load_matrix(path) for path in paths]
+        _choose_backend(args.backend, operands)
+        op = COMMANDS[args.command][0]
+        result = OPERATIONS[op][1](*operands, {'scalar': getattr(args, 'scalar', None)})
+        if not isinstance(result, Matrix):
+            result = [[result]]
+        io_handler.write_matrix(result, args.output or sys.stdout, binary=args.binary or None)
+    except (ValueError, OSError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run(argv=None):
+    """Разбирает аргументы и выполняет команду или пакет заданий.
+
+    Args:
+        argv (list[str], optional): Аргументы; по умолчанию sys.argv[1:].
+
+    Returns:
+        int: Код возврата.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs:
+        return run_jobs(args)
+    if args.command is None:
+        parser.error("нужна команда или --jobs")
+    return run_command(args)
@@ -0,0 +1,158 @@
+"""Клиент сервера матриц (см. server.py).
+
+Пример:
+    >>> with Client(port=8765) as client:
+    ...     client.put("A", Matrix([[2, 1], [1, 1]]))
+    ...     client.call("inverse", "A", store="A_inv")
+    ...     client.call("determinant", "A")
+    1
+
+Соединение держится открытым, а запросы можно отправлять пачкой без
+ожидания ответов: ``send`` возвращает id запроса, ``receive`` - ответ на
+него (ответы, пришедшие раньше, запоминаются).
+"""
+import io
+import itertools
+import json
+import socket
+from fractions import Fraction
+
+import io_handler
+from server import HEADER, PORT, encode_frame
+
+
+def encode_matrix(matrix):
+    """Данные матрицы для запроса: формат .npy, а для матриц, которые в
+    него не помещаются (Fraction, длинные целые), - текст."""
+    buf = io.BytesIO()
+    try:
+        io_handler.write_matrix(matrix, buf, binary=True)
+        return buf.getvalue()
+    except ValueError:
+        text = io.StringIO()
+        io_handler.write_matrix(matrix, text)
+        return text.getvalue().encode('utf-8')
+
+
+def _number(value):
+    # Точные результаты (Fraction) приходят строкой.
+    return Fraction(value) if isinstance(value, str) else value
+
+
+class Client:
+    """Соединение с сервером матриц.
+
+    Raises:
+        ValueError: Из методов запросов, если сервер вернул ошибку.
+        ConnectionError: Если сервер закрыл соединение.
+    """
+
+    def __init__(self, host="127.0.0.1", port=PORT, timeout=None):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile('rb')
+        self._ids = itertools.count(1)
+        self._responses = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Закрывает соединение."""
+        self._file.close()
+        self._sock.close()
+
+    def send(self, op, payload=b"", **fields):
+        """Отправляет запрос, не дожидаясь ответа.
+
+        Args:
+            op (str): Операция.
+            payload (bytes, optional): Данные запроса.
+            **fields: Остальные поля запроса (name, inputs, store, scalar).
+
+        Returns:
+            int: id запроса для receive.
+        """
+        request_id = next(self._ids)
+        self._sock.sendall(encode_frame(dict(fields, id=request_id, op=op), payload))
+        return request_id
+
+    def receive(self, request_id):
+        """Ждёт ответ на запрос.
+
+        Returns:
+            tuple[dict, bytes]: Сообщение ответа и его данные.
+        """
+        while request_id not in self._responses:
+            head = self._read(HEADER.size)
+            size, data_size = HEADER.unpack(head)
+            message = json.loads(self._read(size))
+            self._responses[message.get('id')] = (message, self._read(data_size))
+        message, payload = self._responses.pop(request_id)
+        if message['status'] != 'ok':
+            raise ValueError(message['error'])
+        return message, payload
+
+    def _read(self, size):
+        data = self._file.read(size)
+        if len(data) != size:
+            raise ConnectionError("Сервер закрыл соединение")
+        return data
+
+    def request(self, op, payload=b"", **fields):
+        """Отправляет запрос и ждёт ответ (см. send и receive)."""
+        return self.receive(self.send(op, payload, **fields))
+
+    def put(self, name, matrix):
+        """Сохраняет матрицу на сервере под именем name.
+
+        Args:
+            name (str): Имя.
+            matrix (Matrix или list[list]): Матрица.
+        """
+        self.request('put', encode_matrix(matrix), name=name)
+
+    def get(self, name):
+        """Matrix: Матрица с сервера."""
+        return io_handler.read_matrix(io.BytesIO(self.request('get', name=name)[1]))
+
+    def delete(self, name):
+        """Удаляет матрицу на сервере."""
+        self.request('delete', name=name)
+
+    def names(self):
+        """list[str]: Имена матриц на сервере."""
+        return self.request('list')[0]['names']
+
+    def ping(self):
+        """Проверяет соединение."""
+        self.request('ping')
+
+    def call(self, op, *inputs, store=None, scalar=None):
+        """Выполняет операцию над матрицами сервера.
+
+        Args:
+            op (str): Операция (см. batch.OPERATIONS).
+            *inputs (str): Имена операндов.
+            store (str, optional): Сохранить результат на сервере под этим
+                именем вместо передачи клиенту.
+            scalar (int или float, optional): Число для scalar_multiply.
+
+        Returns:
+            Matrix, число или None: Результат; None, если задан store и
+                результат - матрица.
+        """
+        fields = {'inputs': list(inputs)}
+        if store is not None:
+            fields['store'] = store
+        if scalar is not None:
+            fields['scalar'] = scalar
+        message, payload = self.request(op, **fields)
+        if 'result' in message:
+            return _number(message['result'])
+        if store is not None:
+            return None
+        return io_handler.read_matrix(io.BytesIO(payload))
@@ -0,0 +1,371 @@
+"""Ленивые матричные выражения с оптимизацией порядка умножения.
+
+Операторы над ``Expr`` не вычисляют результат, а строят дерево выражения.
+При построении дерево упрощается: вложенные произведения сливаются в одну
+цепочку, числовые множители собираются в один коэффициент, а
+транспонирование проталкивается к листьям ((AB)^T = B^T A^T), так что
+двойное транспонирование исчезает. Вычисление откладывается до вызова
+``evaluate``: порядок умножения цепочки выбирается динамическим
+программированием, а коэффициент применяется к самой маленькой из
+матриц плана. Поэлементные части выражения (суммы, разности, умножение на
+число и смена знака) сливаются в одну линейную комбинацию и вычисляются
+за один проход ядром бэкенда ``combine`` без промежуточных матриц.
+Подвыражение, использованное в дереве несколько раз, вычисляется один раз.
+
+Пример:
+    >>> expr = A.lazy() * B * C * 2
+    >>> result = expr.evaluate()
+"""
+import backend
+from matrix import Matrix
+
+
+def lazy(matrix):
+    """Оборачивает матрицу в ленивое выражение.
+
+    Args:
+        matrix (Matrix или Expr): Матрица.
+
+    Returns:
+        Expr: Лист выражения.
+    """
+    return matrix if isinstance(matrix, Expr) else Leaf(matrix)
+
+
+def _wrap(value):
+    if isinstance(value, Expr):
+        return value
+    if isinstance(value, Matrix):
+        return Leaf(value)
+    return None
+
+
+def chain_order(dims):
+    """Оптимальная расстановка скобок в цепочке умножений.
+
+    Args:
+        dims (list[int]): Размеры цепочки: i-я матрица имеет размер
+            dims[i] x dims[i + 1].
+
+    Returns:
+        tuple[int, list[list[int]]]: Наименьшее количество скалярных
+            умножений и таблица разбиений split[i][j].
+    """
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            best = None
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if best is None or c < best:
+                    best = c
+                    split[i][j] = k
+            cost[i][j] = best
+    return cost[0][n - 1], split
+
+
+def _linear_terms(expr, coef, terms):
+    """Раскладывает поэлементную часть выражения в линейную комбинацию.
+
+    Суммы и произведения из одного множителя раскрываются, одинаковые
+    листья объединяются. Остальные узлы (цепочки умножений) становятся
+    слагаемыми целиком.
+    """
+    if isinstance(expr, Sum):
+        for sign, term in expr.terms:
+            _linear_terms(term, coef * sign, terms)
+    elif isinstance(expr, Product) and len(expr.factors) == 1:
+        _linear_terms(expr.factors[0], coef * expr.scalar, terms)
+    else:
+        key = (id(expr.matrix), expr.transposed) if isinstance(expr, Leaf) else id(expr)
+        if key in terms:
+            terms[key][0] += coef
+        else:
+            terms[key] = [coef, expr]
+
+
+def _value(expr, memo):
+    """Значение узла выражения.
+
+    Узел, входящий в дерево несколько раз (общее подвыражение), вычисляется
+    один раз: результат запоминается в memo по id узла.
+    """
+    key = id(expr)
+    if key not in memo:
+        memo[key] = expr._eval(memo)
+    return memo[key]
+
+
+def _eval_fused(expr, memo):
+    """Вычисляет поэлементную часть выражения за один проход."""
+    terms = {}
+    _linear_terms(expr, 1, terms)
+    terms = [(c, t) for c, t in terms.values() if c != 0] or list(terms.values())[:1]
+    values = [_value(t, memo) for _, t in terms]
+    if len(terms) == 1 and terms[0][0] == 1:
+        return values[0]
+    result = backend.get_backend().combine([v._buf for v in values], [c for c, _ in terms])
+    return Matrix._from_flat(expr.rows, expr.cols, result)
+
+
+class Expr:
+    """Базовый узел ленивого выражения.
+
+    Attributes:
+        rows (int): Количество строк результата.
+        cols (int): Количество столбцов результата.
+    """
+    __slots__ = ('rows', 'cols')
+
+    def __add__(self, other):
+        other = _wrap(other)
+        if other is None:
+            return NotImplemented
+        return Sum.of([(1, self), (1, other)])
+
+    def __radd__(self, other):
+        other = _wrap(other)
+        if other is None:
+            return NotImplemented
+        return Sum.of([(1, other), (1, self)])
+
+    def __sub__(self, other):
+        other = _wrap(other)
+        if other is None:
+            return NotImplemented
+        return Sum.of([(1, self), (-1, other)])
+
+    def __rsub__(self, other):
+        other = _wrap(other)
+        if other is None:
+            return NotImplemented
+        return Sum.of([(1, other), (-1, self)])
+
+    def __neg__(self):
+        return Product.of([self], -1)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Product.of([self], other)
+        other = _wrap(other)
+        if other is None:
+            return NotImplemented
+        return Product.of([self, other])
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return Product.of([self], other)
+        other = _wrap(other)
+        if other is None:
+            return NotImplemented
+        return Product.of([other, self])
+
+    @property
+    def T(self):
+        """Expr: Транспонированное выражение."""
+        return self.transpose()
+
+    def transpose(self):
+        """Транспонирует выражение, проталкивая транспонирование к листьям.
+
+        Returns:
+            Expr: Транспонированное выражение.
+        """
+        raise NotImplementedError
+
+    def cost(self):
+        """Количество скалярных умножений при вычислении по плану.
+
+        Returns:
+            int: Оценка стоимости выражения.
+        """
+        raise NotImplementedError
+
+    def evaluate(self):
+        """Вычисляет выражение по оптимальному плану.
+
+        Returns:
+            Matrix: Результат. Это всегда новая матрица со своим буфером,
+                даже если выражение сводится к одному из операндов или
+                представлению над ним, поэтому её можно изменять на месте
+                (+=, -=, *=).
+        """
+        result = _value(self, {})
+        storage = result._layout()[0]
+        if any(storage is m._layout()[0] for m in self._inputs()):
+            result = result.copy()
+        return result
+
+    def _inputs(self):
+        """Матрицы-операнды выражения."""
+        raise NotImplementedError
+
+    def _eval(self, memo):
+        """Вычисляет узел; значения дочерних узлов берутся через memo."""
+        raise NotImplementedError
+
+
+class Leaf(Expr):
+    """Матрица, возможно транспонированная."""
+    __slots__ = ('matrix', 'transposed')
+
+    def __init__(self, matrix, transposed=False):
+        self.matrix = matrix
+        self.transposed = transposed
+        self.rows, self.cols = (matrix.cols, matrix.rows) if transposed else (matrix.rows, matrix.cols)
+
+    def transpose(self):
+        return Leaf(self.matrix, not self.transposed)
+
+    def cost(self):
+        return 0
+
+    def _inputs(self):
+        yield self.matrix
+
+    def _eval(self, memo):
+        # Транспонированный лист - представление без копирования.
+        return self.matrix.T if self.transposed else self.matrix
+
+    def __repr__(self):
+        return f"Leaf({self.matrix.rows}x{self.matrix.cols}{', T' if self.transposed else ''})"
+
+
+class Sum(Expr):
+    """Сумма слагаемых со знаками +1 и -1."""
+    __slots__ = ('terms',)
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.rows, self.cols = terms[0][1].rows, terms[0][1].cols
+
+    @classmethod
+    def of(cls, terms):
+        """Создаёт сумму, раскрывая вложенные суммы.
+
+        Raises:
+            ValueError: Если размеры слагаемых не совпадают.
+        """
+        flat = []
+        for sign, term in terms:
+            if isinstance(term, Sum):
+                flat.extend((sign * s, t) for s, t in term.terms)
+            else:
+                flat.append((sign, term))
+        rows, cols = flat[0][1].rows, flat[0][1].cols
+        if any(t.rows != rows or t.cols != cols for _, t in flat):
+            raise ValueError("Сложение определено только для матриц одинаковых размеров")
+        return cls(flat)
+
+    def transpose(self):
+        return Sum([(sign, term.transpose()) for sign, term in self.terms])
+
+    def cost(self):
+        return sum(term.cost() for _, term in self.terms)
+
+    def _inputs(self):
+        for _, term in self.terms:
+            yield from term._inputs()
+
+    def _eval(self, memo):
+        return _eval_fused(self, memo)
+
+    def __repr__(self):
+        return "Sum(" + ", ".join(f"{'+' if s > 0 else '-'}{t!r}" for s, t in self.terms) + ")"
+
+
+class Product(Expr):
+    """Цепочка умножений с числовым коэффициентом."""
+    __slots__ = ('factors', 'scalar')
+
+    def __init__(self, factors, scalar=1):
+        self.factors = factors
+        self.scalar = scalar
+        self.rows, self.cols = factors[0].rows, factors[-1].cols
+
+    @classmethod
+    def of(cls, factors, scalar=1):
+        """Создаёт произведение, сливая вложенные цепочки и коэффициенты.
+
+        Raises:
+            ValueError: Если размеры соседних множителей не согласованы.
+        """
+        flat = []
+        for factor in factors:
+            if isinstance(factor, Product):
+                flat.extend(factor.factors)
+                scalar *= factor.scalar
+            else:
+                flat.append(factor)
+        for left, right in zip(flat, flat[1:]):
+            if left.cols != right.rows:
+                raise ValueError(f"Нельзя умножить матрицы таких размеров: {left.cols} столбцов != {right.rows} строк")
+        return cls(flat, scalar)
+
+    def transpose(self):
+        return Product([f.transpose() for f in reversed(self.factors)], self.scalar)
+
+    def _dims(self):
+        return [f.rows for f in self.factors] + [self.cols]
+
+    def _plan(self):
+        """Дерево вычисления: лист - индекс множителя, узел - пара поддеревьев.
+
+        Returns:
+            tuple: (дерево, стоимость умножений, узел для коэффициента).
+        """
+        dims = self._dims()
+        chain_cost, split = chain_order(dims)
+
+        def build(i, j):
+            if i == j:
+                return i
+            k = split[i][j]
+            return (build(i, k), build(k + 1, j))
+
+        tree = build(0, len(self.factors) - 1)
+        target = None
+        if self.scalar != 1:
+            # Коэффициент применяется к самой маленькой матрице плана.
+            best = None
+            stack = [(tree, 0, len(self.factors) - 1)]
+            while stack:
+                node, i, j = stack.pop()
+                size = dims[i] * dims[j + 1]
+                if best is None or size < best:
+                    best, target = size, node
+                if isinstance(node, tuple):
+                    k = split[i][j]
+                    stack.append((node[0], i, k))
+                    stack.append((node[1], k + 1, j))
+            chain_cost += best
+        return tree, chain_cost, target
+
+    def cost(self):
+        return self._plan()[1] + sum(f.cost() for f in self.factors)
+
+    def _inputs(self):
+        for factor in self.factors:
+            yield from factor._inputs()
+
+    def _eval(self, memo):
+        if len(self.factors) == 1:
+            return _eval_fused(self, memo)
+        tree, _, target = self._plan()
+        values = [_value(f, memo) for f in self.factors]
+
+        def run(node):
+            if isinstance(node, tuple):
+                result = run(node[0]) * run(node[1])
+            else:
+                result = values[node]
+            return result * self.scalar if node == target else result
+
+        return run(tree)
+
+    def __repr__(self):
+        prefix = f"{self.scalar} * " if self.scalar != 1 else ""
+        return prefix + "Product(" + ", ".join(repr(f) for f in self.factors) + ")"
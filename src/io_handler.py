@@ -1,3 +1,39 @@
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from fractions import Fraction
+from itertools import chain
+
+from matrix import Matrix
+from parallel import get_pool
+
+# Двоичный формат совместим с .npy версии 1.0: магическая строка, версия,
+# длина заголовка и заголовок - словарь Python с типом элементов, порядком
+# хранения и размером, дополненный пробелами до границы 64 байт. Данные
+# float64 или int64 идут сразу после заголовка, поэтому файл можно
+# отобразить в память и использовать как буфер матрицы без чтения.
+NPY_MAGIC = b"\x93NUMPY"
+_BYTE_ORDER = '<' if sys.byteorder == 'little' else '>'
+_TYPECODES = {'f8': 'd', 'i8': 'q'}
+
+# Текстовые файлы не меньше этого размера разбираются в нескольких
+# процессах; строки разбираются блоками по _BLOCK_LINES.
+PARALLEL_TEXT_BYTES = 32 << 20
+_BLOCK_LINES = 4096
+
+# Размер буфера записи и количество строк матрицы, форматируемых за один
+# вызов write. Файлы .gz и .xz сжимаются прозрачно.
+WRITE_BUFFER = 1 << 20
+_WRITE_ROWS = 256
+GZIP_LEVEL = 6
+
+# ast, gzip и lzma нужны только для двоичных и сжатых файлов и
+# импортируются при первом обращении, чтобы не замедлять запуск.
+
+
 def input_matrix_interactive(): # ip kb ret lofl
     print("\n" + "="*40)
     print(" ВВОД МАТРИЦЫ С КЛАВИАТУРЫ ")
@@ -43,49 +79,238 @@ def input_matrix_interactive(): # ip kb ret lofl
     print(f"Матрица {rows}x{cols} успешно введена")
     return matrix
 
-def input_matrix_from_file():
+def open_text(filename, mode='r'):
+    """Открывает текстовый файл матрицы для чтения ('r') или записи ('w').
+
+    Файлы с расширением .gz и .xz прозрачно распаковываются и сжимаются.
+    """
+    if filename.endswith('.gz'):
+        import gzip
+        if mode == 'w':
+            return gzip.open(filename, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL)
+        return gzip.open(filename, 'rt', encoding='utf-8')
+    if filename.endswith('.xz'):
+        import lzma
+        return lzma.open(filename, mode + 't', encoding='utf-8')
+    return open(filename, mode, encoding='utf-8', buffering=WRITE_BUFFER)
+
+
+def _parse_text(text):
+    """Разбирает текст матрицы: одна токенизация на блок строк и
+    преобразование всех чисел блока одним вызовом map.
+
+    Тип определяется для всего текста: пока встречаются только целые,
+    элементы - int (в списке), после первого вещественного - float
+    в array('d'). Исключения не используются для выбора типа каждого
+    числа, только для смены типа всего текста. Текст с обыкновенными
+    дробями (3/2) разбирается точно, см. _parse_exact.
+
+    Returns:
+        tuple: (элементы, длины непустых строк, количество строк,
+            ошибка), где ошибка - None или (номер строки, строка).
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    values = []
+    widths = []
+    floats = False
+    for first in range(0, len(lines), _BLOCK_LINES):
+        rows = [line.split() for line in lines[first:first + _BLOCK_LINES]]
+        try:
+            if not floats:
+                done = len(values)
+                try:
+                    values.extend(map(int, chain.from_iterable(rows)))
+                except ValueError:
+                    del values[done:]
+                    values = _to_float(values)
+                    floats = True
+            if floats:
+                values.extend(map(float, chain.from_iterable(rows)))
+        except ValueError:
+            # Медленный путь только для отчёта: ищем первую строку с ошибкой.
+            for n, row in enumerate(rows, first + 1):
+                try:
+                    [float(t) for t in row]
+                except ValueError:
+                    if '/' in lines[n - 1]:
+                        return _parse_exact(lines)
+                    return values, widths, len(lines), (n, lines[n - 1].strip())
+        widths.extend(len(row) for row in rows if row)
+    return values, widths, len(lines), None
+
+
+def _parse_exact(lines):
+    """Разбирает текст с обыкновенными дробями, например записанный
+    результат точного вычисления: элементы - int и Fraction, десятичные
+    записи тоже переводятся в Fraction без округления."""
+    values = []
+    widths = []
+    for n, line in enumerate(lines, 1):
+        row = line.split()
+        try:
+            values.extend(_exact(token) for token in row)
+        except (ValueError, ZeroDivisionError):
+            return values, widths, len(lines), (n, line.strip())
+        if row:
+            widths.append(len(row))
+    return values, widths, len(lines), None
+
+
+def _exact(token):
+    x = Fraction(token)
+    return x.numerator if x.denominator == 1 else x
+
+
+def _to_float(values):
+    """Переводит элементы в array('d'); если целые слишком длинные для
+    float, остаются списком (как в Matrix)."""
+    try:
+        return array('d', values)
+    except OverflowError:
+        return list(values)
+
+
+def _parse_range(filename, start, end):
+    """Разбирает байты [start, end) файла в отдельном процессе."""
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        return _parse_text(file.read(end - start).decode('utf-8'))
+
+
+def _byte_ranges(filename, size, parts):
+    """Делит файл на parts диапазонов байт по границам строк."""
+    bounds = [0]
+    with open(filename, 'rb') as file:
+        for k in range(1, parts):
+            file.seek(max(k * size // parts, bounds[-1]))
+            file.readline()
+            bounds.append(min(file.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def load_text_matrix(filename, workers=None):
+    """Читает матрицу из текстового файла (строка файла - строка матрицы).
+
+    Файл (в том числе сжатый .gz или .xz) читается целиком и разбирается
+    блоками строк без обработки исключений на каждое число
+    (см. _parse_text). Большие файлы (не меньше
+    PARALLEL_TEXT_BYTES) разбиваются на диапазоны байт по границам строк
+    и разбираются в пуле процессов.
+
+    Args:
+        filename (str): Имя файла.
+        workers (int, optional): Количество процессов. По умолчанию
+            os.cpu_count() для больших файлов и 1 для остальных.
+
+    Returns:
+        Matrix: Матрица из int (если все числа целые) или float.
+
+    Raises:
+        ValueError: Если в строке есть не число, файл пуст или строки
+            разной длины. Номера строк в сообщениях - как в файле.
+    """
+    size = os.path.getsize(filename)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if size >= PARALLEL_TEXT_BYTES else 1
+    if filename.endswith(('.gz', '.xz')):
+        workers = 1  # сжатый поток нельзя разбить на диапазоны байт
+    if workers > 1:
+        pool = get_pool(workers)
+        futures = [pool.submit(_parse_range, filename, a, b)
+                   for a, b in _byte_ranges(filename, size, workers)]
+        parts = [future.result() for future in futures]
+    else:
+        with open_text(filename) as file:
+            parts = [_parse_text(file.read())]
+    return _text_matrix(parts)
+
+
+def _text_matrix(parts):
+    """Собирает матрицу из результатов _parse_text для частей текста."""
+    line_offset = 0
+    widths = []
+    for _, part_widths, line_count, error in parts:
+        if error is not None:
+            line_num, line = error
+            raise ValueError(f"Ошибка в строке {line_offset + line_num}: '{line}'")
+        # Каждый диапазон, кроме последнего, заканчивается переводом строки.
+        line_offset += line_count - 1
+        widths.extend(part_widths)
+    chunks = [part[0] for part in parts]
+    if len(chunks) == 1:
+        values = chunks[0]
+    elif all(isinstance(c, list) for c in chunks) or not all(
+            isinstance(c, array) or all(type(x) in (int, float) for x in c) for c in chunks):
+        # Только целые или есть точные дроби (Fraction): список без округления.
+        values = list(chain.from_iterable(chunks))
+    else:
+        # Как в _parse_text: после первого вещественного целые становятся float.
+        values = _to_float(chain.from_iterable(chunks))
+
+    if not widths:
+        raise ValueError("Файл пуст!")
+
+    # Проверяем, что все строки одинаковой длины
+    first_len = widths[0]
+    for i, width in enumerate(widths):
+        if width != first_len:
+            raise ValueError(f"Строка {i+1} имеет {width} элементов, а должно быть {first_len}")
+    return Matrix._from_flat(len(widths), first_len, values)
+
+
+def load_text(filename, workers=None):
+    """Читает матрицу из текстового файла как список строк.
+
+    Args:
+        filename (str): Имя файла.
+        workers (int, optional): См. load_text_matrix.
+
+    Returns:
+        list[list]: Строки матрицы из int или float.
+
+    Raises:
+        ValueError: См. load_text_matrix.
+    """
+    return load_text_matrix(filename, workers).data
+
+
+def load_matrix(filename, workers=None):
+    """Читает матрицу из файла, определяя формат по содержимому.
+
+    Двоичный файл отображается в память и читается по требованию,
+    текстовый (в том числе .gz и .xz) разбирается load_text_matrix.
+
+    Args:
+        filename (str): Имя файла.
+        workers (int, optional): См. load_text_matrix.
+
+    Returns:
+        Matrix: Матрица.
+
+    Raises:
+        ValueError: Если файл повреждён или содержит не числа.
+    """
+    if is_binary_file(filename):
+        return load_binary(filename)
+    return load_text_matrix(filename, workers)
+
+
+def input_matrix_from_file(): # ret Matrix
     print("\n" + "="*40)
     print(" ЧТЕНИЕ МАТРИЦЫ ИЗ ФАЙЛА ")
     print("="*40)
     filename = input("Имя файла: ")
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            matrix = []
-            
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:  # Пропускаем пустые строки
-                    continue
-                
-                try:
-                    # Преобразуем строку в числа
-                    row = []
-                    for num in line.split():
-                        try:
-                            row.append(int(num))
-                        except ValueError:
-                            row.append(float(num))
-                    
-                    matrix.append(row)
-                    
-                except ValueError:
-                    print(f"Ошибка в строке {line_num}: '{line}'")
-                    return None
-            
-            if not matrix:
-                print("Файл пуст!")
-                return None
-            
-            # Проверяем, что все строки одинаковой длины
-            first_len = len(matrix[0])
-            for i, row in enumerate(matrix):
-                if len(row) != first_len:
-                    print(f"Строка {i+1} имеет {len(row)} элементов, а должно быть {first_len}")
-                    return None
-            
-            print(f"✓ Матрица {len(matrix)}x{first_len} успешно загружена")
-            return matrix
-            
+        matrix = load_matrix(filename)
+        print(f"✓ Матрица {matrix.rows}x{matrix.cols} успешно загружена")
+        return matrix
+
+    except ValueError as e:
+        print(e)
+        return None
     except FileNotFoundError:
         print(f"Файл '{filename}' не найден!")
         return None
@@ -95,7 +320,7 @@ def input_matrix_from_file():
 
 
 def print_matrix(matrix, title=""): #Принимает: список списков или объект с атрибутом .data
-        if title:
+    if title:
         print(f"\n{title}")
         print("=" * 40)
     
@@ -111,7 +336,8 @@ def print_matrix(matrix, title=""): #Принимает: список списк
     max_len = 0
     for row in matrix:
         for val in row:
-            length = len(f"{val:.3f}")  # Форматируем с 3 знаками после запятой
+            # Форматируем с 3 знаками после запятой, дроби Fraction - как есть
+            length = len(str(val)) if isinstance(val, Fraction) else len(f"{val:.3f}")
             if length > max_len:
                 max_len = length
     
@@ -126,23 +352,81 @@ def print_matrix(matrix, title=""): #Принимает: список списк
                 else:
                     formatted_val = f"{val:{max_len}.3f}"
             else:
-                formatted_val = f"{val:{max_len}}"
+                formatted_val = f"{str(val):>{max_len}}"
             formatted_row.append(formatted_val)
         
         print("  ".join(formatted_row))
 
 
-def save_matrix_to_file(matrix, filename=None):
+def _rows(matrix):
+    """Строки матрицы по одной, без построения списка строк целиком."""
+    if isinstance(matrix, Matrix):
+        return (matrix._row(i) for i in range(matrix.rows))
+    return iter(matrix)
+
+
+def write_matrix(matrix, filename, header=None, footer=None, binary=None):
+    """Записывает матрицу в файл потоково.
+
+    Текст пишется через буфер WRITE_BUFFER пачками по _WRITE_ROWS строк;
+    числа форматируются str - кратчайшее представление float, которое
+    читается обратно без потерь. Строки берутся из источника по одной,
+    поэтому генератор строк не материализуется. Файлы .gz и .xz
+    сжимаются, файлы .npy (или binary=True) пишутся в двоичном формате.
+
+    Args:
+        matrix (Matrix или iterable): Матрица, список строк или генератор
+            строк.
+        filename (str или поток): Имя файла или открытый текстовый поток
+            (например, sys.stdout; для двоичного формата берётся его
+            buffer).
+        header (str, optional): Строка перед матрицей (только текст).
+        footer (str, optional): Строка после матрицы (только текст).
+        binary (bool, optional): Двоичный формат; по умолчанию - если имя
+            файла оканчивается на .npy.
+
+    Raises:
+        ValueError: Если для двоичного формата заданы header или footer
+            или элементы не помещаются в двоичный формат.
+    """
+    stream = not isinstance(filename, str)
+    if binary is None:
+        binary = not stream and filename.endswith('.npy')
+    if binary:
+        if header is not None or footer is not None:
+            raise ValueError("Заголовок и подпись поддерживаются только в текстовом формате")
+        if not isinstance(matrix, (Matrix, list)):
+            matrix = [list(row) for row in matrix]
+        if stream:
+            _write_npy(matrix, getattr(filename, 'buffer', filename))
+        else:
+            save_binary(matrix, filename)
+    elif stream:
+        _write_text(matrix, filename, header, footer)
+    else:
+        with open_text(filename, 'w') as file:
+            _write_text(matrix, file, header, footer)
+
+
+def _write_text(matrix, file, header, footer):
+    rows = _rows(matrix)
+    if header is not None:
+        file.write(header + "\n")
+    while True:
+        batch = [" ".join(map(str, row)) for _, row in zip(range(_WRITE_ROWS), rows)]
+        if not batch:
+            break
+        file.write("\n".join(batch) + "\n")
+    if footer is not None:
+        file.write(footer + "\n")
+
+
+def save_matrix_to_file(matrix, filename=None, header=None, footer=None):
     if filename is None:
         filename = input("Имя файла для сохранения: ")
     
     try:
-        with open(filename, 'w', encoding='utf-8') as file:
-            for row in matrix:
-                # Преобразуем все в строки
-                line = " ".join(str(x) for x in row)
-                file.write(line + "\n")
-        
+        write_matrix(matrix, filename, header, footer)
         print(f"Матрица сохранена в '{filename}'")
         return True
         
@@ -151,12 +435,227 @@ def save_matrix_to_file(matrix, filename=None):
         return False
 
 
-def ask_save_result(matrix):
+def is_binary_file(filename):
+    """Проверяет, что файл начинается с магической строки формата .npy."""
+    with open(filename, 'rb') as file:
+        return file.read(len(NPY_MAGIC)) == NPY_MAGIC
+
+
+def _binary_buffer(matrix):
+    """Буфер элементов для записи: array или memoryview форматов 'd'/'q'."""
+    buf = matrix._buf
+    if isinstance(buf, memoryview) and buf.format in ('d', 'q'):
+        return buf
+    if isinstance(buf, array):
+        return buf
+    values = buf[:]
+    if isinstance(values, array):
+        return values
+    try:
+        return array('q', values)
+    except (OverflowError, TypeError):
+        pass
+    # Длинные целые в float64 округлились бы, поэтому он допустим, только
+    # если в матрице уже есть вещественные элементы.
+    types = set(map(type, values))
+    if float in types and types <= {int, float}:
+        try:
+            return array('d', values)
+        except OverflowError:
+            pass
+    raise ValueError("Двоичный формат хранит только float64 и int64: "
+                     "матрицы из Fraction и длинных целых сохраняйте в текстовом виде")
+
+
+def save_binary(matrix, filename):
+    """Сохраняет матрицу в двоичном формате, совместимом с .npy.
+
+    Вещественные матрицы записываются как float64, целые - как int64.
+
+    Args:
+        matrix (Matrix или list[list]): Матрица.
+        filename (str): Имя файла.
+
+    Raises:
+        ValueError: Если элементы не помещаются в float64 или int64
+            (Fraction, целые матрицы с элементами длиннее int64). Файл при
+            этом не создаётся и не изменяется.
+    """
+    # Буфер проверяется до открытия файла, чтобы не обнулить его при ошибке.
+    header, buf = _npy_parts(matrix)
+    with open(filename, 'wb') as file:
+        file.write(header)
+        file.write(buf)
+
+
+def _npy_parts(matrix):
+    """Заголовок .npy и буфер элементов матрицы для записи."""
+    if not isinstance(matrix, Matrix):
+        matrix = Matrix(matrix)
+    buf = _binary_buffer(matrix)
+    typecode = buf.typecode if isinstance(buf, array) else buf.format
+    return _npy_header(typecode, matrix.rows, matrix.cols), buf
+
+
+def _write_npy(matrix, file):
+    """Пишет матрицу в формате .npy в двоичный файл или поток."""
+    header, buf = _npy_parts(matrix)
+    file.write(header)
+    file.write(buf)
+
+
+def _npy_header(typecode, rows, cols):
+    """Заголовок .npy версии 1.0 для матрицы rows x cols в порядке C."""
+    descr = _BYTE_ORDER + ('f8' if typecode == 'd' else 'i8')
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({rows}, {cols}), }}"
+    header += " " * (-(len(NPY_MAGIC) + 4 + len(header) + 1) % 64) + "\n"
+    return NPY_MAGIC + b"\x01\x00" + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+def create_binary(filename, rows, cols, integer=False):
+    """Создаёт двоичный файл нулевой матрицы и отображает его в память
+    для записи.
+
+    Место на диске выделяется без записи нулей. Изменения матрицы
+    (на месте, через представления или out=) сразу попадают в файл,
+    поэтому так можно собирать результат, который не помещается в память.
+
+    Args:
+        filename (str): Имя файла.
+        rows (int): Количество строк.
+        cols (int): Количество столбцов.
+        integer (bool, optional): Элементы int64 вместо float64.
+            По умолчанию False.
+
+    Returns:
+        Matrix: Матрица над отображённым файлом.
+    """
+    typecode = 'q' if integer else 'd'
+    header = _npy_header(typecode, rows, cols)
+    size = len(header) + rows * cols * 8
+    with open(filename, 'w+b') as file:
+        file.write(header)
+        file.truncate(size)
+        data = mmap.mmap(file.fileno(), size)
+    buf = memoryview(data)[len(header):].cast(typecode)
+    return Matrix._from_flat(rows, cols, buf)
+
+
+def _read_header(file):
+    """Читает заголовок .npy: (строки, столбцы, typecode, нужна ли смена
+    порядка байт, транспонированное хранение, смещение данных)."""
+    import ast
+
+    if file.read(len(NPY_MAGIC)) != NPY_MAGIC:
+        raise ValueError("Файл не в двоичном формате матриц (.npy)")
+    major = file.read(2)[0]
+    if major == 1:
+        (length,) = struct.unpack('<H', file.read(2))
+    else:
+        (length,) = struct.unpack('<I', file.read(4))
+    try:
+        header = ast.literal_eval(file.read(length).decode('latin1'))
+        descr, fortran, shape = header['descr'], header['fortran_order'], header['shape']
+    except (SyntaxError, ValueError, KeyError, TypeError):
+        raise ValueError("Повреждённый заголовок двоичного файла")
+    if descr[1:] not in _TYPECODES or descr[0] not in '<>|=':
+        raise ValueError(f"Неподдерживаемый тип элементов '{descr}': ожидается float64 или int64")
+    if len(shape) != 2 or 0 in shape:
+        raise ValueError("В файле должна быть непустая двумерная матрица")
+    swap = descr[0] in '<>' and descr[0] != _BYTE_ORDER
+    return shape[0], shape[1], _TYPECODES[descr[1:]], swap, fortran, file.tell()
+
+
+def load_binary(filename, mapped=True):
+    """Загружает матрицу из двоичного файла формата .npy.
+
+    По умолчанию файл отображается в память (копирование при записи):
+    загрузка занимает O(1), страницы читаются при первом обращении, а
+    изменения матрицы не попадают в файл. Матрица в порядке Фортрана
+    возвращается транспонированным представлением без перестановки.
+
+    Args:
+        filename (str): Имя файла.
+        mapped (bool, optional): Отобразить файл в память. Если False или
+            порядок байт файла не совпадает с порядком машины, данные
+            читаются в память целиком. По умолчанию True.
+
+    Returns:
+        Matrix: Матрица из float или int.
+
+    Raises:
+        ValueError: Если файл не в формате .npy, тип элементов не float64
+            и не int64 или файл обрезан.
+    """
+    with open(filename, 'rb') as file:
+        return _read_npy(file, mapped)
+
+
+def _read_npy(file, mapped=False):
+    """Читает матрицу .npy из открытого двоичного файла или потока
+    (см. load_binary); отобразить в память можно только файл."""
+    rows, cols, typecode, swap, fortran, offset = _read_header(file)
+    count = rows * cols
+    if fortran:
+        rows, cols = cols, rows
+    if mapped and not swap:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        buf = memoryview(data)[offset:offset + count * 8]
+        if len(buf) != count * 8:
+            raise ValueError("Двоичный файл обрезан")
+        buf = buf.cast(typecode)
+    else:
+        buf = array(typecode)
+        data = file.read(count * 8)
+        if len(data) != count * 8:
+            raise ValueError("Двоичный файл обрезан")
+        buf.frombytes(data)
+        if swap:
+            buf.byteswap()
+    matrix = Matrix._from_flat(rows, cols, buf)
+    return matrix.T if fortran else matrix
+
+
+def read_matrix(stream):
+    """Читает матрицу из двоичного потока (например, sys.stdin.buffer)
+    в текстовом или двоичном формате.
+
+    Args:
+        stream: Поток с методом read, возвращающим bytes.
+
+    Returns:
+        Matrix: Матрица.
+
+    Raises:
+        ValueError: Если данные повреждены или содержат не числа.
+    """
+    data = stream.read()
+    if data.startswith(NPY_MAGIC):
+        return _read_npy(io.BytesIO(data))
+    return _text_matrix([_parse_text(data.decode('utf-8'))])
+
+
+def text_to_binary(source, target):
+    """Преобразует текстовый файл матрицы в двоичный формат.
+
+    Raises:
+        ValueError: Если текстовый файл содержит ошибки.
+    """
+    save_binary(load_text_matrix(source), target)
+
+
+def binary_to_text(source, target):
+    """Преобразует двоичный файл матрицы в текстовый формат (при
+    необходимости сжатый) построчно, не загружая матрицу в память целиком."""
+    write_matrix(load_binary(source), target, binary=False)
+
+
+def ask_save_result(matrix, header=None, footer=None): # Matrix или lofl; .npy - двоичный, .gz/.xz - сжатый
     save = input("\nСохранить результат в файл? (y/n): ").lower()
     
     if save == 'y':
         filename = input("Имя файла: ")
-        save_matrix_to_file(matrix, filename)
+        save_matrix_to_file(matrix, filename, header, footer)
 
 
 def input_scalar():
@@ -0,0 +1,385 @@
+"""Итерационные методы Крылова для больших систем линейных уравнений.
+
+Методы обращаются к матрице только через произведение на вектор, поэтому
+работают с плотными Matrix, разреженными SparseMatrix и с операторами,
+заданными одной функцией matvec, без хранения матрицы целиком.
+
+Каждый метод возвращает пару (x, info): info == 0 означает сходимость
+с заданной точностью, положительное значение - количество выполненных
+итераций без достижения точности, -1 - вырождение метода.
+"""
+import math
+from operator import mul
+
+import backend
+from matrix import Matrix
+from sparse import SparseMatrix
+
+
+class LinearOperator:
+    """Линейный оператор, заданный функцией умножения на вектор.
+
+    Attributes:
+        rows (int): Размерность результата.
+        cols (int): Размерность аргумента.
+        diagonal (list[float] или None): Диагональ оператора, если известна
+            (нужна для предобуславливателя Якоби).
+    """
+    def __init__(self, rows, cols, matvec, diagonal=None):
+        """Создаёт оператор.
+
+        Args:
+            rows (int): Размерность результата.
+            cols (int): Размерность аргумента.
+            matvec (callable): Функция list[float] -> list[float].
+            diagonal (list[float], optional): Диагональ оператора.
+
+        Raises:
+            ValueError: Если размеры не положительны.
+        """
+        if rows <= 0 or cols <= 0:
+            raise ValueError("Размеры оператора должны быть положительными")
+        self.rows = rows
+        self.cols = cols
+        self._matvec = matvec
+        self.diagonal = diagonal
+
+    def matvec(self, x):
+        """Применяет оператор к вектору x."""
+        return self._matvec(x)
+
+
+def aslinearoperator(a):
+    """Приводит матрицу к линейному оператору.
+
+    Args:
+        a (Matrix, SparseMatrix, LinearOperator или list[list[float]]):
+            Матрица системы.
+
+    Returns:
+        LinearOperator: Оператор умножения на a.
+    """
+    if isinstance(a, LinearOperator):
+        return a
+    if isinstance(a, SparseMatrix):
+        diagonal = None
+        if a.rows == a.cols:
+            diagonal = [a._row_dict(i).get(i, 0) for i in range(a.rows)]
+        return LinearOperator(a.rows, a.cols, a.matvec, diagonal)
+    if not isinstance(a, Matrix):
+        a = Matrix(a)
+    rows, cols, buf = a.rows, a.cols, a._buf
+
+    def matvec(x):
+        return backend.get_backend().matvec(buf, x, rows, cols)
+
+    diagonal = list(buf[::cols + 1]) if rows == cols else None
+    return LinearOperator(rows, cols, matvec, diagonal)
+
+
+def _dot(x, y):
+    return sum(map(mul, x, y))
+
+
+def _norm(x):
+    return math.sqrt(_dot(x, x))
+
+
+def _axpy(alpha, x, y):
+    """alpha * x + y."""
+    return [alpha * a + b for a, b in zip(x, y)]
+
+
+def jacobi(a):
+    """Предобуславливатель Якоби: деление на диагональ матрицы.
+
+    Args:
+        a: Матрица или оператор с известной диагональю.
+
+    Returns:
+        callable: Функция r -> D^-1 r.
+
+    Raises:
+        ValueError: Если диагональ неизвестна или содержит нули.
+    """
+    diagonal = aslinearoperator(a).diagonal
+    if diagonal is None:
+        raise ValueError("Для предобуславливателя Якоби нужна диагональ оператора")
+    if any(d == 0 for d in diagonal):
+        raise ValueError("Диагональ содержит нули, предобуславливатель Якоби неприменим")
+    inv = [1.0 / d for d in diagonal]
+    return lambda r: [d * v for d, v in zip(inv, r)]
+
+
+def ilu0(a):
+    """Неполное LU-разложение без заполнения (ILU(0)).
+
+    Множители L и U сохраняют шаблон ненулевых элементов исходной
+    матрицы, поэтому разложение занимает O(nnz) памяти.
+
+    Args:
+        a (SparseMatrix или Matrix): Квадратная матрица.
+
+    Returns:
+        callable: Функция r -> (LU)^-1 r.
+
+    Raises:
+        ValueError: Если матрица не квадратная, является оператором без
+            элементов или на диагонали U появляется нуль.
+    """
+    if isinstance(a, LinearOperator):
+        raise ValueError("Для ILU(0) нужны элементы матрицы, а не только оператор")
+    if not isinstance(a, SparseMatrix):
+        a = SparseMatrix.from_dense(a if isinstance(a, Matrix) else Matrix(a))
+    if a.rows != a.cols:
+        raise ValueError("ILU(0) определено только для квадратных матриц")
+    n = a.rows
+    rows = [a._row_dict(i) for i in range(n)]
+    for i in range(n):
+        row = rows[i]
+        for k in sorted(j for j in row if j < i):
+            pivot = rows[k].get(k, 0)
+            if pivot == 0:
+                raise ValueError("Нулевой ведущий элемент в ILU(0)")
+            factor = row[k] / pivot
+            row[k] = factor
+            for j, v in rows[k].items():
+                if j > k and j in row:
+                    row[j] -= factor * v
+        if row.get(i, 0) == 0:
+            raise ValueError("Нулевой ведущий элемент в ILU(0)")
+    lower = [sorted((j, v) for j, v in row.items() if j < i) for i, row in enumerate(rows)]
+    upper = [sorted((j, v) for j, v in row.items() if j > i) for i, row in enumerate(rows)]
+    diag = [row[i] for i, row in enumerate(rows)]
+
+    def solve(r):
+        y = list(r)
+        for i in range(n):
+            y[i] -= sum(v * y[j] for j, v in lower[i])
+        for i in range(n - 1, -1, -1):
+            y[i] = (y[i] - sum(v * y[j] for j, v in upper[i])) / diag[i]
+        return y
+
+    return solve
+
+
+_PRECONDITIONERS = {"jacobi": jacobi, "ilu0": ilu0}
+
+
+def _setup(a, b, x0, maxiter, M):
+    op = aslinearoperator(a)
+    if op.rows != op.cols:
+        raise ValueError("Итерационные методы определены только для квадратных матриц")
+    n = op.rows
+    if len(b) != n:
+        raise ValueError("Размерность вектора b не соответствует матрице A")
+    if x0 is not None and len(x0) != n:
+        raise ValueError("Размерность начального приближения не соответствует матрице A")
+    if M is None:
+        precond = list
+    elif callable(M):
+        precond = M
+    elif M in _PRECONDITIONERS:
+        precond = _PRECONDITIONERS[M](a)
+    else:
+        raise ValueError(f"Неизвестный предобуславливатель: {M}")
+    x = [0.0] * n if x0 is None else [float(v) for v in x0]
+    b = [float(v) for v in b]
+    if maxiter is None:
+        maxiter = 10 * n
+    return op, b, x, maxiter, precond
+
+
+def cg(a, b, x0=None, tol=1e-8, maxiter=None, M=None, callback=None):
+    """Метод сопряжённых градиентов для симметричных положительно
+    определённых систем.
+
+    Args:
+        a (Matrix, SparseMatrix или LinearOperator): Матрица системы.
+        b (list[float]): Вектор свободных членов.
+        x0 (list[float], optional): Начальное приближение. По умолчанию нули.
+        tol (float, optional): Относительная точность: итерации
+            прекращаются, когда ||b - Ax|| <= tol * ||b||. По умолчанию 1e-8.
+        maxiter (int, optional): Наибольшее количество итераций.
+            По умолчанию 10 * n.
+        M (str или callable, optional): Предобуславливатель: "jacobi",
+            "ilu0" или функция r -> M^-1 r.
+        callback (callable, optional): Вызывается после каждой итерации
+            как callback(номер итерации, норма невязки).
+
+    Returns:
+        tuple[list[float], int]: Приближённое решение и код info.
+
+    Raises:
+        ValueError: Если размеры не согласованы или предобуславливатель
+            неизвестен.
+    """
+    op, b, x, maxiter, precond = _setup(a, b, x0, maxiter, M)
+    target = tol * (_norm(b) or 1.0)
+    r = [u - v for u, v in zip(b, op.matvec(x))]
+    if _norm(r) <= target:
+        return x, 0
+    z = precond(r)
+    p = z
+    rz = _dot(r, z)
+    for it in range(1, maxiter + 1):
+        q = op.matvec(p)
+        pq = _dot(p, q)
+        if pq == 0:
+            return x, -1
+        alpha = rz / pq
+        x = _axpy(alpha, p, x)
+        r = _axpy(-alpha, q, r)
+        res = _norm(r)
+        if callback is not None:
+            callback(it, res)
+        if res <= target:
+            return x, 0
+        z = precond(r)
+        rz, rz_old = _dot(r, z), rz
+        p = _axpy(rz / rz_old, p, z)
+    return x, maxiter
+
+
+def gmres(a, b, x0=None, tol=1e-8, maxiter=None, M=None, callback=None, restart=30):
+    """Обобщённый метод минимальных невязок с перезапуском GMRES(restart).
+
+    Подходит для произвольных невырожденных систем. Используется правое
+    предобуславливание, поэтому контролируется невязка исходной системы.
+
+    Args:
+        a (Matrix, SparseMatrix или LinearOperator): Матрица системы.
+        b (list[float]): Вектор свободных членов.
+        x0 (list[float], optional): Начальное приближение. По умолчанию нули.
+        tol (float, optional): Относительная точность. По умолчанию 1e-8.
+        maxiter (int, optional): Наибольшее общее количество итераций.
+            По умолчанию 10 * n.
+        M (str или callable, optional): Предобуславливатель.
+        callback (callable, optional): callback(номер итерации, норма невязки).
+        restart (int, optional): Размерность подпространства Крылова
+            между перезапусками. По умолчанию 30.
+
+    Returns:
+        tuple[list[float], int]: Приближённое решение и код info.
+
+    Raises:
+        ValueError: Если размеры не согласованы или предобуславливатель
+            неизвестен.
+    """
+    op, b, x, maxiter, precond = _setup(a, b, x0, maxiter, M)
+    target = tol * (_norm(b) or 1.0)
+    it = 0
+    while True:
+        r = [u - v for u, v in zip(b, op.matvec(x))]
+        beta = _norm(r)
+        if beta <= target:
+            return x, 0
+        if it >= maxiter:
+            return x, it
+        basis = [[v / beta for v in r]]
+        hessenberg = []
+        cs, sn = [], []
+        g = [beta]
+        for j in range(restart):
+            w = op.matvec(precond(basis[j]))
+            h = []
+            for v in basis:
+                hij = _dot(w, v)
+                w = _axpy(-hij, v, w)
+                h.append(hij)
+            h_next = _norm(w)
+            h.append(h_next)
+            for i in range(j):
+                h[i], h[i + 1] = cs[i] * h[i] + sn[i] * h[i + 1], cs[i] * h[i + 1] - sn[i] * h[i]
+            d = math.hypot(h[j], h[j + 1])
+            if d == 0:
+                break
+            cs.append(h[j] / d)
+            sn.append(h[j + 1] / d)
+            h[j], h[j + 1] = d, 0.0
+            g.append(-sn[j] * g[j])
+            g[j] *= cs[j]
+            hessenberg.append(h)
+            it += 1
+            res = abs(g[j + 1])
+            if callback is not None:
+                callback(it, res)
+            if res <= target or h_next == 0 or it >= maxiter:
+                break
+            basis.append([v / h_next for v in w])
+        k = len(hessenberg)
+        if k == 0:
+            return x, -1
+        y = [0.0] * k
+        for i in range(k - 1, -1, -1):
+            s = g[i] - sum(hessenberg[l][i] * y[l] for l in range(i + 1, k))
+            y[i] = s / hessenberg[i][i]
+        u = [0.0] * len(x)
+        for coef, v in zip(y, basis):
+            u = _axpy(coef, v, u)
+        x = [s + t for s, t in zip(x, precond(u))]
+
+
+def bicgstab(a, b, x0=None, tol=1e-8, maxiter=None, M=None, callback=None):
+    """Стабилизированный метод бисопряжённых градиентов BiCGSTAB.
+
+    Подходит для несимметричных систем и требует памяти O(n) независимо
+    от количества итераций.
+
+    Args:
+        a (Matrix, SparseMatrix или LinearOperator): Матрица системы.
+        b (list[float]): Вектор свободных членов.
+        x0 (list[float], optional): Начальное приближение. По умолчанию нули.
+        tol (float, optional): Относительная точность. По умолчанию 1e-8.
+        maxiter (int, optional): Наибольшее количество итераций.
+            По умолчанию 10 * n.
+        M (str или callable, optional): Предобуславливатель.
+        callback (callable, optional): callback(номер итерации, норма невязки).
+
+    Returns:
+        tuple[list[float], int]: Приближённое решение и код info.
+
+    Raises:
+        ValueError: Если размеры не согласованы или предобуславливатель
+            неизвестен.
+    """
+    op, b, x, maxiter, precond = _setup(a, b, x0, maxiter, M)
+    target = tol * (_norm(b) or 1.0)
+    r = [u - v for u, v in zip(b, op.matvec(x))]
+    if _norm(r) <= target:
+        return x, 0
+    r_hat = r
+    rho = alpha = omega = 1.0
+    p = v = [0.0] * len(x)
+    for it in range(1, maxiter + 1):
+        rho, rho_old = _dot(r_hat, r), rho
+        if rho == 0:
+            return x, -1
+        beta = (rho / rho_old) * (alpha / omega)
+        p = _axpy(beta, _axpy(-omega, v, p), r)
+        p_hat = precond(p)
+        v = op.matvec(p_hat)
+        rv = _dot(r_hat, v)
+        if rv == 0:
+            return x, -1
+        alpha = rho / rv
+        s = _axpy(-alpha, v, r)
+        if _norm(s) <= target:
+            x = _axpy(alpha, p_hat, x)
+            if callback is not None:
+                callback(it, _norm(s))
+            return x, 0
+        s_hat = precond(s)
+        t = op.matvec(s_hat)
+        tt = _dot(t, t)
+        omega = _dot(t, s) / tt if tt else 0.0
+        x = _axpy(omega, s_hat, _axpy(alpha, p_hat, x))
+        r = _axpy(-omega, t, s)
+        res = _norm(r)
+        if callback is not None:
+            callback(it, res)
+        if res <= target:
+            return x, 0
+        if omega == 0:
+            return x, -1
+    return x, maxiter
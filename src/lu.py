@@ -0,0 +1,105 @@
+import backend
+
+
+class LU:
+    """LU-разложение матрицы с частичным выбором ведущего элемента.
+
+    Разложение PA = LU выполняется один раз за O(n^3), после чего
+    определитель, обратная матрица и решения систем получаются треугольными
+    подстановками за O(n^2) на каждую правую часть. Для вырожденных и
+    прямоугольных матриц U имеет ступенчатый вид.
+
+    Attributes:
+        rows (int): Количество строк исходной матрицы.
+        cols (int): Количество столбцов исходной матрицы.
+        pivots (list[int]): Столбцы ведущих элементов U.
+        free_vars (list[int]): Столбцы без ведущих элементов.
+        swaps (int): Количество перестановок строк.
+    """
+    def __init__(self, matrix, eps=1e-12):
+        """Вычисляет разложение.
+
+        Args:
+            matrix (Matrix): Раскладываемая матрица.
+            eps (float, optional): Элементы с модулем не больше eps не
+                выбираются ведущими. По умолчанию 1e-12.
+        """
+        self.rows = matrix.rows
+        self.cols = matrix.cols
+        self.eps = eps
+        self.lu, self.perm, self.pivots, self.swaps = backend.get_backend().lu_factor(
+            matrix._buf, self.rows, self.cols, eps)
+        pivot_set = set(self.pivots)
+        self.free_vars = [j for j in range(self.cols) if j not in pivot_set]
+
+    @property
+    def rank(self):
+        """int: Количество ведущих элементов."""
+        return len(self.pivots)
+
+    def u_row(self, i):
+        """Возвращает ненулевую часть i-й строки U, начиная с ведущего столбца."""
+        base = i * self.cols
+        return self.lu[base + self.pivots[i]:base + self.cols]
+
+    def determinant(self):
+        """Определитель квадратной матрицы как произведение диагонали U.
+
+        Returns:
+            float: Значение определителя; 0.0, если ведущих элементов
+                меньше размера матрицы.
+        """
+        n = self.rows
+        if self.rank < n:
+            return 0.0
+        det = 1.0
+        for x in self.lu[::n + 1]:
+            det *= x
+        return -det if self.swaps % 2 == 1 else det
+
+    def solve(self, rhs, k=1):
+        """Находит частное решение AX = B для k правых частей.
+
+        Свободные переменные полагаются равными нулю.
+
+        Args:
+            rhs: Плоский буфер B размера rows x k.
+            k (int, optional): Количество правых частей. По умолчанию 1.
+
+        Returns:
+            list или array: Плоский буфер X размера cols x k.
+
+        Raises:
+            ValueError: Если система несовместна хотя бы для одной
+                правой части.
+        """
+        kernels = backend.get_backend()
+        y = kernels.lu_forward(self.lu, self.perm, self.pivots, self.rows, self.cols, rhs, k)
+        tol = self.eps * max(1.0, max(abs(v) for v in rhs))
+        if any(abs(v) > tol for v in y[self.rank * k:]):
+            raise ValueError("Система несовместна")
+        return kernels.lu_backward(self.lu, self.pivots, self.cols, y, k)
+
+    def null_space(self):
+        """Фундаментальная система решений однородной системы AX = 0.
+
+        Returns:
+            list[list[float]]: По одному вектору на каждую свободную
+                переменную из free_vars.
+        """
+        free = self.free_vars
+        if not free:
+            return []
+        k = len(free)
+        c = self.cols
+        y = []
+        for i, pivot in enumerate(self.pivots):
+            base = i * c
+            y.extend(-self.lu[base + f] if f > pivot else 0.0 for f in free)
+        x = backend.get_backend().lu_backward(self.lu, self.pivots, c, y, k)
+        fsr = []
+        for idx, f in enumerate(free):
+            vector = [float(v) for v in x[idx::k]]
+            vector[f] = 1.0
+            fsr.append(vector)
+        return fsr
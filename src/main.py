@@ -1,3 +1,6 @@
+import sys
+
+
 def show_menu():
     print("\n" + "="*50)
     print(" КАЛЬКУЛЯТОР МАТРИЦ ")
@@ -12,7 +15,9 @@ def show_menu():
     print("8.  След матрицы")
     print("9.  Ранг матрицы")
     print("10. Решение СЛАУ")
-    print("11. Выйти")
+    print("11. СЛАУ с несколькими правыми частями")
+    print("12. Умножение больших матриц из файлов")
+    print("13. Выйти")
     print("="*50)
 
 def main():
@@ -24,7 +29,7 @@ def main():
         show_menu()
         
         try:
-            choice = input("\nВыберите операцию (1-11): ").strip()
+            choice = input("\nВыберите операцию (1-13): ").strip()
             
             if choice == '1':
                 Calculator.add_matrices()
@@ -47,10 +52,14 @@ def main():
             elif choice == '10':
                 Calculator.solve_system()
             elif choice == '11':
+                Calculator.solve_system_batch()
+            elif choice == '12':
+                Calculator.multiply_files()
+            elif choice == '13':
                 print("\nДо свидания!")
                 break
             else:
-                print("Неверный выбор. Введите число от 1 до 11.")
+                print("Неверный выбор. Введите число от 1 до 13.")
                 
         except KeyboardInterrupt:
             print("\n\nВыход из программы.")
@@ -59,4 +68,8 @@ def main():
             print(f"\nОшибка: {e}")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Командная строка: меню и калькулятор не загружаются (см. cli.py)
+        from cli import run
+        sys.exit(run())
     main()
@@ -1,22 +1,109 @@
+import math
+from array import array
+from fractions import Fraction
+
+import backend
+import modular
+from bareiss import Bareiss, is_exact
+from cholesky import Cholesky
+from lu import LU
+from parallel import parallel_matmul
+from strassen import strassen_matmul
+from strided import StridedBuffer, typed_like
+
+# Ленточный решатель используется для квадратных матриц не меньше этого
+# размера, если 4 * (kl + ku) < n.
+BAND_MIN_SIZE = 32
+# Симметричные матрицы не меньше этого размера проверяются на
+# положительную определённость и решаются разложением Холецкого.
+CHOLESKY_MIN_SIZE = 8
+
+
+def _pack(values):
+    """Упаковывает плоскую последовательность элементов в буфер хранения.
+
+    Если все элементы - вещественные числа (допускается примесь int),
+    используется компактный массив ``array('d')``. Матрицы только из целых
+    чисел и матрицы с элементами других типов (например, ``Fraction``)
+    хранятся в обычном списке, чтобы не терять точность. Буфер memoryview
+    (например, над отображённым в память файлом, см.
+    ``io_handler.load_binary``) используется как есть, без копирования.
+
+    Args:
+        values (iterable): Элементы матрицы в построчном порядке.
+
+    Returns:
+        array, memoryview или list: Плоский буфер элементов.
+    """
+    if isinstance(values, (array, memoryview)):
+        return values
+    values = values if isinstance(values, list) else list(values)
+    has_float = False
+    for x in values:
+        t = type(x)
+        if t is float:
+            has_float = True
+        elif t is not int:
+            return values
+    if has_float:
+        try:
+            return array('d', values)
+        except OverflowError:
+            pass
+    return values
+
+
+def _axis(index, size):
+    """Разбирает индекс по одной оси: (начало, шаг, длина)."""
+    if isinstance(index, slice):
+        selected = range(size)[index]
+        if selected.step < 0:
+            raise ValueError("Шаг среза матрицы должен быть положительным")
+        if not selected:
+            raise ValueError("Срез матрицы не может быть пустым")
+        return selected.start, selected.step, len(selected)
+    if not isinstance(index, int):
+        raise TypeError("Индексы матрицы должны быть целыми числами или срезами")
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise IndexError("Индекс вне матрицы")
+    return index, 1, 1
+
 
 class Matrix:
     """Класс для работы с матрицами.
-    
+
     Предоставляет базовые операции линейной алгебры: сложение, вычитание,
     умножение, транспонирование, вычисление определителя, следа, ранга,
     обратной матрицы и решение систем линейных уравнений.
-    
+
+    Элементы хранятся построчно в одном плоском буфере (``array('d')`` для
+    вещественных матриц), все операции работают непосредственно с ним.
+    Вычисления выполняет активный бэкенд (см. ``Matrix.set_backend``).
+    Матрицы из int и Fraction обрабатываются точно (см. ``bareiss``).
+
+    Транспонирование ``A.T`` и срезы ``A[r0:r1, c0:c1]`` возвращают
+    представления: матрицы без собственного буфера, которые читают и
+    записывают элементы исходной (см. ``strided``). Ядра бэкендов
+    работают с ними напрямую, без копирования. Изменения исходной матрицы
+    видны в представлениях и наоборот; независимую копию даёт ``copy()``.
+
     Attributes:
         data (list[list[float]]): Двумерный список элементов матрицы.
+            Строится по требованию из плоского буфера и кэшируется.
         rows (int): Количество строк в матрице.
         cols (int): Количество столбцов в матрице.
     """
+    __slots__ = ('_buf', '_data', '_lu', '_band', '_chol', '_exact', '_hash', 'rows', 'cols',
+                 '_base', '_version', '_shared')
+
     def __init__(self, data):
         """Инициализирует матрицу из двумерного списка.
-        
+
         Args:
             data (list[list[float]]): Двумерный список чисел.
-        
+
         Raises:
             ValueError: Если data пустой, не является списком списков
                 или строки имеют разную длину.
@@ -25,70 +112,358 @@ class Matrix:
             raise ValueError("Матрица должна быть непустым списком списков")
         if len(set(len(row) for row in data)) != 1:
             raise ValueError("Строки матрицы должны быть одинаковх размеров")
-        self.data = data
         self.rows = len(data)
         self.cols = len(data[0])
-    
+        self._buf = _pack([x for row in data for x in row])
+        self._init_state()
+
+    @classmethod
+    def _from_flat(cls, rows, cols, values):
+        """Создаёт матрицу из плоского буфера без повторной проверки.
+
+        Args:
+            rows (int): Количество строк.
+            cols (int): Количество столбцов.
+            values (iterable): rows * cols элементов в построчном порядке.
+
+        Returns:
+            Matrix: Новая матрица.
+        """
+        obj = cls.__new__(cls)
+        obj.rows = rows
+        obj.cols = cols
+        obj._buf = _pack(values)
+        obj._init_state()
+        return obj
+
+    def _init_state(self):
+        """Сбрасывает кэши и связь с исходной матрицей.
+
+        _base - исходная матрица представления (None для матриц со своим
+        буфером), _version - счётчик изменений буфера; у представления это
+        значение счётчика исходной матрицы, для которого верны его кэши.
+        _shared - созданы ли представления над буфером матрицы.
+        """
+        self._reset()
+        self._base = None
+        self._version = 0
+        self._shared = False
+
+    def _reset(self):
+        """Сбрасывает кэшированные представления, разложения и хэш."""
+        self._data = None
+        self._lu = None
+        self._band = None
+        self._chol = None
+        self._exact = None
+        self._hash = None
+
+    def _sync(self):
+        """Сбрасывает кэши представления, если исходная матрица изменилась."""
+        base = self._base
+        if base is not None and self._version != base._version:
+            self._reset()
+            self._version = base._version
+
+    def _layout(self):
+        """Возвращает (буфер хранения, смещение, шаг строк, шаг столбцов)."""
+        buf = self._buf
+        if isinstance(buf, StridedBuffer):
+            return buf.base, buf.offset, buf.row_stride, buf.col_stride
+        return buf, 0, self.cols, 1
+
+    def _make_view(self, offset, rows, cols, row_stride, col_stride):
+        storage = self._layout()[0]
+        root = self._base or self
+        root._shared = True
+        view = Matrix.__new__(Matrix)
+        view.rows = rows
+        view.cols = cols
+        view._buf = StridedBuffer(storage, offset, rows, cols, row_stride, col_stride)
+        view._reset()
+        view._base = root
+        view._version = root._version
+        view._shared = False
+        return view
+
+    @property
+    def T(self):
+        """Matrix: Транспонированное представление без копирования.
+
+        Умножение (A.T * A) и исключение читают элементы прямо из буфера
+        A; для независимой транспонированной матрицы используйте
+        transpose().
+        """
+        _, offset, row_stride, col_stride = self._layout()
+        return self._make_view(offset, self.cols, self.rows, col_stride, row_stride)
+
+    def __getitem__(self, key):
+        """Элемент A[i, j] или подматрица-представление A[r0:r1, c0:c1].
+
+        Подматрица разделяет буфер с исходной матрицей; целый индекс в
+        паре со срезом выбирает одну строку или один столбец (матрица
+        1 x n или n x 1).
+
+        Args:
+            key (tuple): Пара индексов строк и столбцов (int или slice
+                с положительным шагом).
+
+        Returns:
+            Элемент матрицы или Matrix-представление.
+
+        Raises:
+            TypeError: Если key - не пара целых чисел или срезов.
+            IndexError: Если индекс вне матрицы.
+            ValueError: Если срез пустой или его шаг отрицательный.
+
+        Example:
+            >>> m = Matrix([[1, 2, 3], [4, 5, 6]])
+            >>> m[:, 1:].data
+            [[2, 3], [5, 6]]
+        """
+        if not isinstance(key, tuple) or len(key) != 2:
+            raise TypeError("Индекс матрицы должен иметь вид A[строки, столбцы]")
+        r0, row_step, rows = _axis(key[0], self.rows)
+        c0, col_step, cols = _axis(key[1], self.cols)
+        if isinstance(key[0], int) and isinstance(key[1], int):
+            return self._buf[r0 * self.cols + c0]
+        _, offset, row_stride, col_stride = self._layout()
+        return self._make_view(offset + r0 * row_stride + c0 * col_stride, rows, cols,
+                               row_stride * row_step, col_stride * col_step)
+
+    def copy(self):
+        """Возвращает независимую копию матрицы с собственным буфером.
+
+        Returns:
+            Matrix: Новая матрица (для представления - его элементы).
+        """
+        values = self._buf[:]
+        if isinstance(values, memoryview):
+            values = array(values.format, values)
+        return Matrix._from_flat(self.rows, self.cols, values)
+
+    def content_hash(self):
+        """Хэш размеров и элементов матрицы для кэширования результатов по
+        содержимому (см. ``cache``).
+
+        Одинаковые матрицы получают одинаковый хэш независимо от хранения
+        (список, array, отображённый файл, представление), а целые и
+        вещественные элементы различаются. Хэш вычисляется один раз и
+        сбрасывается вместе с разложениями при изменении матрицы, в том
+        числе через её представления.
+
+        Returns:
+            bytes: 16-байтовый дайджест BLAKE2b.
+        """
+        self._sync()
+        if self._hash is None:
+            import hashlib
+
+            values = self._buf
+            if isinstance(values, StridedBuffer):
+                values = values[:]
+            if isinstance(values, memoryview):
+                typecode = values.format
+                if not values.contiguous:
+                    values = array(typecode, values)
+            elif isinstance(values, array):
+                typecode = values.typecode
+            else:
+                # Целые хэшируются как int64, чтобы совпадать с двоичными
+                # файлами; длинные целые и Fraction - через repr.
+                try:
+                    values, typecode = array('q', values), 'q'
+                except (OverflowError, TypeError):
+                    values, typecode = repr(list(values)).encode(), 'r'
+            digest = hashlib.blake2b(f"{self.rows}x{self.cols}{typecode}".encode(), digest_size=16)
+            digest.update(values)
+            self._hash = digest.digest()
+        return self._hash
+
+    @staticmethod
+    def set_backend(name):
+        """Выбирает вычислительный бэкенд для всех матриц.
+
+        Args:
+            name (str): "python", "numpy" или "auto". Начальное значение
+                берётся из переменной окружения MATRIX_BACKEND.
+
+        Returns:
+            str: Имя выбранного бэкенда.
+
+        Raises:
+            ValueError: Если бэкенд неизвестен или недоступен.
+        """
+        return backend.set_backend(name)
+
+    @staticmethod
+    def get_backend():
+        """Возвращает имя активного вычислительного бэкенда."""
+        return backend.get_backend().name
+
+    @property
+    def data(self):
+        """list[list[float]]: Представление матрицы в виде списка строк.
+
+        Изменения возвращённых списков не отражаются на самой матрице.
+        """
+        self._sync()
+        if self._data is None:
+            buf, c = self._buf, self.cols
+            self._data = [list(buf[i * c:(i + 1) * c]) for i in range(self.rows)]
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        Matrix.__init__(self, value)
+
+    def _store(self, result):
+        """Записывает результат операции в собственный буфер матрицы.
+
+        Если тип буфера позволяет, элементы копируются в существующий
+        буфер, иначе он заменяется. Буфер, над которым есть представления,
+        и отображённый в память файл никогда не заменяются, а
+        представление записывает элементы прямо в буфер исходной матрицы.
+        Кэшированные представления и разложения сбрасываются, в том числе
+        у исходной матрицы и (при следующем обращении) у других её
+        представлений.
+        """
+        buf = self._buf
+        base = self._base
+        if base is not None:
+            buf.assign(result)
+            base._reset()
+            base._version += 1
+            self._reset()
+            self._version = base._version
+            return
+        if result is not buf:
+            result = _pack(result)
+            if type(result) is type(buf) and len(result) == len(buf):
+                buf[:] = result
+            elif self._shared or isinstance(buf, memoryview):
+                buf[:] = typed_like(result, buf)
+            else:
+                self._buf = result
+        self._reset()
+        self._version += 1
+
+    def _check_out(self, out, rows, cols):
+        if not isinstance(out, Matrix) or out.rows != rows or out.cols != cols:
+            raise ValueError(f"Матрица out должна иметь размер {rows}x{cols}")
+
+    def _row(self, i):
+        """Возвращает i-ю строку как срез плоского буфера."""
+        c = self.cols
+        return self._buf[i * c:(i + 1) * c]
+
     def __add__(self, other):
         """Сложение двух матриц.
-        
+
         Args:
             other (Matrix): Матрица для сложения.
-        
+
         Returns:
             Matrix: Новая матрица - результат сложения.
-        
+
         Raises:
             ValueError: Если размеры матриц не совпадают.
-        
+
         """
+        if not isinstance(other, Matrix):
+            return NotImplemented
         if self.rows != other.rows or self.cols != other.cols:
             raise ValueError("Сложение определено только для матриц одинаковых размеров")
-        result = []
-        for i in range(self.rows):          
-            row = []
-            for j in range(self.cols):      
-                element = self.data[i][j] + other.data[i][j]
-                row.append(element)
-            result.append(row) 
-        return Matrix(result)
-    
+        result = backend.get_backend().add(self._buf, other._buf)
+        return Matrix._from_flat(self.rows, self.cols, result)
+
     def __sub__(self, other):
         """Вычитание двух матриц.
-        
+
         Args:
             other (Matrix): Матрица для вычитания.
-        
+
         Returns:
             Matrix: Новая матрица - результат вычитания.
-        
+
         Raises:
             ValueError: Если размеры матриц не совпадают.
         """
+        if not isinstance(other, Matrix):
+            return NotImplemented
         if self.rows != other.rows or self.cols != other.cols:
             raise ValueError("Вычитание определено только для матриц одинаковых размеров")
-        result = []
-        for i in range(self.rows):
-            row = []
-            for j in range(self.cols):
-                element = self.data[i][j] - other.data[i][j]
-                row.append(element)
-            result.append(row)
-        return Matrix(result)
-    
+        result = backend.get_backend().sub(self._buf, other._buf)
+        return Matrix._from_flat(self.rows, self.cols, result)
+
+    def __iadd__(self, other):
+        """Прибавляет матрицу на месте (A += B).
+
+        Args:
+            other (Matrix): Матрица того же размера.
+
+        Returns:
+            Matrix: Эта же матрица.
+
+        Raises:
+            ValueError: Если размеры матриц не совпадают.
+        """
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Сложение определено только для матриц одинаковых размеров")
+        self._store(backend.get_backend().add(self._buf, other._buf, out=self._buf))
+        return self
+
+    def __isub__(self, other):
+        """Вычитает матрицу на месте (A -= B).
+
+        Args:
+            other (Matrix): Матрица того же размера.
+
+        Returns:
+            Matrix: Эта же матрица.
+
+        Raises:
+            ValueError: Если размеры матриц не совпадают.
+        """
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Вычитание определено только для матриц одинаковых размеров")
+        self._store(backend.get_backend().sub(self._buf, other._buf, out=self._buf))
+        return self
+
+    def __imul__(self, other):
+        """Умножает матрицу на число на месте (A *= k).
+
+        Умножение на матрицу (A *= B) меняет размеры и выполняется
+        обычным __mul__ с созданием новой матрицы.
+
+        Args:
+            other (int или float): Множитель.
+
+        Returns:
+            Matrix: Эта же матрица.
+        """
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        self._store(backend.get_backend().scale(self._buf, other, out=self._buf))
+        return self
+
     def __mul__(self, other):
         """Умножение матрицы на число или другую матрицу.
-        
+
         Args:
             other (int, float или Matrix): Множитель.
-        
+
         Returns:
             Matrix: Новая матрица - результат умножения.
-        
+
         Raises:
             ValueError: Если при умножении матриц количество столбцов первой
                 не равно количеству строк второй.
-        
+
         Example:
             >>> m = Matrix([[1, 2], [3, 4]])
             >>> (m * 2).data
@@ -98,55 +473,124 @@ class Matrix:
             [[19, 22], [43, 50]]
         """
         if isinstance(other, (int, float)):
-            result = []
-            for i in range(self.rows):
-                row = []
-                for j in range(self.cols):
-                    row.append(self.data[i][j] * other)
-                result.append(row)
-            return Matrix(result)
+            result = backend.get_backend().scale(self._buf, other)
+            return Matrix._from_flat(self.rows, self.cols, result)
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.matmul(other)
+
+    def lazy(self):
+        """Начинает ленивое выражение с этой матрицей.
+
+        Операторы над результатом строят дерево выражения, которое
+        вычисляется вызовом evaluate() с оптимальным порядком умножений
+        (см. модуль ``expr``).
+
+        Returns:
+            Expr: Лист выражения.
+
+        Example:
+            >>> (A.lazy() * B * C).evaluate()
+        """
+        from expr import Leaf
+        return Leaf(self)
+
+    def matmul(self, other, algorithm="auto", workers=None, block_rows=None, out=None):
+        """Умножение на другую матрицу с выбором алгоритма.
+
+        Args:
+            other (Matrix): Правый множитель.
+            algorithm (str, optional): "standard" - блочное O(n^3) ядро
+                бэкенда, "strassen" - рекурсия Штрассена-Винограда,
+                "auto" - Штрассен, если наименьший из размеров не меньше
+                порога бэкенда ``strassen_threshold``, "parallel" - блоки
+                строк результата считаются в пуле процессов над общей
+                памятью. По умолчанию "auto".
+            workers (int, optional): Количество процессов для "parallel".
+                По умолчанию os.cpu_count().
+            block_rows (int, optional): Строк результата в одной задаче
+                для "parallel".
+            out (Matrix, optional): Матрица n x p для результата. Её буфер
+                переиспользуется, поэтому в цикле умножение не выделяет
+                новых матриц (на бэкенде NumPy - и памяти вообще).
+
+        Returns:
+            Matrix: Новая матрица - результат умножения, или out.
+
+        Raises:
+            ValueError: Если количество столбцов первой матрицы не равно
+                количеству строк второй, алгоритм неизвестен или размер
+                out не соответствует результату.
+        """
+        if self.cols != other.rows:
+            raise ValueError(f"Нельзя умножить матрицы таких размеров: {self.cols} столбцов != {other.rows} строк")
+        n, m, p = self.rows, self.cols, other.cols
+        target = None
+        if out is not None:
+            self._check_out(out, n, p)
+            # Запись прямо в буфер операнда испортила бы вычисление.
+            storage = out._layout()[0]
+            if storage is not self._layout()[0] and storage is not other._layout()[0]:
+                target = out._buf
+        kernels = backend.get_backend()
+        if algorithm == "auto":
+            threshold = kernels.strassen_threshold
+            use_strassen = threshold is not None and min(n, m, p) >= threshold
+        elif algorithm in ("standard", "strassen", "parallel"):
+            use_strassen = algorithm == "strassen"
         else:
-            if self.cols != other.rows:
-                raise ValueError(f"Нельзя умножить матрицы таких размеров: {self.cols} столбцов != {other.rows} строк")
-            result = []
-            for i in range(self.rows):
-                row = []
-                for j in range(other.cols):
-                    summa = 0
-                    for k in range(self.cols):
-                        summa += self.data[i][k] * other.data[k][j]
-                    row.append(summa)
-                result.append(row)
-            return Matrix(result)
+            raise ValueError(f"Неизвестный алгоритм умножения '{algorithm}'")
+        if algorithm == "parallel":
+            result = parallel_matmul(self._buf, other._buf, n, m, p, workers, block_rows)
+        elif use_strassen:
+            result = strassen_matmul(kernels, self._buf, other._buf, n, m, p,
+                                     kernels.strassen_crossover)
+        else:
+            result = kernels.matmul(self._buf, other._buf, n, m, p, out=target)
+        if out is None:
+            return Matrix._from_flat(n, p, result)
+        out._store(result)
+        return out
+
     def is_square(self):
         """Проверяет, является ли матрица квадратной.
-        
+
         Returns:
             bool: True если матрица квадратная (rows == cols), иначе False.
-        
+
         """
-        return self.rows == self.cols    
-    def transpose(self):
+        return self.rows == self.cols
+
+    def transpose(self, out=None):
         """Транспонирует матрицу.
-        
+
+        В отличие от свойства T, всегда копирует элементы.
+
+        Args:
+            out (Matrix, optional): Матрица cols x rows для результата,
+                её буфер переиспользуется.
+
         Returns:
-            Matrix: Новая матрица - транспонированная версия текущей.
-        
-        """
-        result = []
-        for j in range(self.cols):
-            row = []
-            for i in range(self.rows):
-                row.append(self.data[i][j])
-            result.append(row)    
-        return Matrix(result)
-    
+            Matrix: Новая матрица - транспонированная версия текущей, или out.
+
+        Raises:
+            ValueError: Если размер out не соответствует результату.
+        """
+        kernels = backend.get_backend()
+        if out is None:
+            result = kernels.transpose(self._buf, self.rows, self.cols)
+            return Matrix._from_flat(self.cols, self.rows, result)
+        self._check_out(out, self.cols, self.rows)
+        target = None if out._layout()[0] is self._layout()[0] else out._buf
+        out._store(kernels.transpose(self._buf, self.rows, self.cols, out=target))
+        return out
+
     def gaussian_elimination(self, normalize=False, eps=1e-12):
         """Выполняет метод Гаусса для приведения матрицы к ступенчатому виду.
-    
+
         Реализует алгоритм гауссова исключения (прямой ход) для приведения матрицы
         к ступенчатому виду.
-        
+
         Args:
             normalize: Если True, выполняет нормализацию строк,
                 приводя ведущие элементы к 1.
@@ -155,98 +599,100 @@ class Matrix:
             eps: Пороговое значение для сравнения чисел с нулём.
                 Элементы с абсолютным значением меньше eps считаются нулевыми.
                 По умолчанию 1e-12.
-        
+
         Returns:
             Кортеж (Matrix, int), где:
                 - Matrix: Матрица в ступенчатом виде
                 - int: Количество выполненных перестановок строк
         """
-        matrix = [row[:] for row in self.data]
-        swaps = 0
-        row = col = 0
-        
-        while row < self.rows and col < self.cols:
-            pivot_row = None
-            for k in range(row, self.rows):
-                if abs(matrix[k][col]) > eps:
-                    pivot_row = k
-                    break
-            
-            if pivot_row is None:
-                col += 1
-                continue
-            
-            if pivot_row != row:
-                matrix[row], matrix[pivot_row] = matrix[pivot_row], matrix[row]
-                swaps += 1
-            
-            if normalize:
-                pivot = matrix[row][col]
-                if abs(pivot) > eps:
-                    matrix[row] = [x / pivot for x in matrix[row]]
-                else:
-                    col += 1
-                    continue
-            
-            for k in range(row + 1, self.rows):
-                if abs(matrix[k][col]) <= eps:
-                    continue
-                
-                if normalize:
-                    factor = matrix[k][col]
-                else:
-                    factor = matrix[k][col] / matrix[row][col]
-                
-                for j in range(col, self.cols):
-                    matrix[k][j] -= factor * matrix[row][j]
-            
-            row += 1
-            col += 1
-        
-        return Matrix(matrix), swaps
+        matrix, swaps = backend.get_backend().eliminate(
+            self._buf, self.rows, self.cols, normalize, eps)
+        return Matrix._from_flat(self.rows, self.cols, matrix), swaps
 
     def determinant(self):
         """Вычисляет определитель матрицы.
-        
+
+        Для матриц из int и Fraction определитель вычисляется точно:
+        исключением Барейса или, для больших матриц на бэкенде NumPy,
+        многомодульным методом (см. ``modular``).
+
         Returns:
-            float: Значение определителя.
-        
+            float: Значение определителя (int или Fraction для точных
+                матриц).
+
         Raises:
             ValueError: Если матрица не квадратная.
-        
+
         Example:
             >>> m = Matrix([[1, 2], [3, 4]])
             >>> m.determinant()
-            -2.0
+            -2
         """
         if not self.is_square():
             raise ValueError("Определитель существует только у квадратных матриц")
-        n = self.rows
-        for i in range(n):
-            if all(abs(self.data[i][j]) < 1e-12 for j in range(n)):
-                return 0.0
-        for j in range(n):
-            if all(abs(self.data[i][j]) < 1e-12 for i in range(n)):
-                return 0.0
-        echelon, swaps = self.gaussian_elimination(normalize=False)
-        det = 1.0
-        for i in range(self.rows):
-            det *= echelon.data[i][i]
-        if swaps % 2 == 1:
-            det = -det
-        return det
-    
+        if self._use_modular(self.rows):
+            return modular.determinant(self)
+        exact = self._bareiss()
+        if exact is not None:
+            return exact.determinant()
+        band = self._band_lu()
+        if band is not None:
+            return band.determinant()
+        chol = self._cholesky()
+        if chol is not None:
+            return chol.determinant()
+        return self.lu().determinant()
+
+    def log_determinant(self):
+        """Вычисляет знак и логарифм модуля определителя.
+
+        Не переполняется для больших матриц, где сам определитель выходит
+        за пределы float. Для симметричных положительно определённых
+        матриц использует разложение Холецкого.
+
+        Returns:
+            tuple[float, float]: (знак, ln|det|); для вырожденной матрицы
+                (0.0, -inf).
+
+        Raises:
+            ValueError: Если матрица не квадратная.
+        """
+        if not self.is_square():
+            raise ValueError("Определитель существует только у квадратных матриц")
+        exact = self._bareiss()
+        if exact is not None:
+            det = Fraction(exact.determinant())
+            if not det:
+                return 0.0, -math.inf
+            return (1.0 if det > 0 else -1.0,
+                    math.log(abs(det.numerator)) - math.log(det.denominator))
+        chol = self._cholesky()
+        if chol is not None:
+            return 1.0, chol.log_determinant()
+        lu = self.lu()
+        if lu.rank < self.rows:
+            return 0.0, -math.inf
+        sign = -1.0 if lu.swaps % 2 == 1 else 1.0
+        log_abs = 0.0
+        for x in lu.lu[::self.rows + 1]:
+            if x < 0:
+                sign = -sign
+            log_abs += math.log(abs(x))
+        return sign, log_abs
+
     def inverse(self):
         """Находит обратную матрицу.
-        
+
+        Обратная матрица из int и Fraction вычисляется точно.
+
         Returns:
             Matrix: Обратная матрица.
-        
+
         Raises:
             ValueError: Если матрица не квадратная или вырожденная (null determinant).
-        
+
         Example:
-            >>> m = Matrix([[4, 7], [2, 6]])
+            >>> m = Matrix([[4.0, 7.0], [2.0, 6.0]])
             >>> inv = m.inverse()
             >>> inv.data
             [[0.6, -0.7], [-0.2, 0.4]]
@@ -254,61 +700,204 @@ class Matrix:
         if not self.is_square():
             raise ValueError("Обратная матрица не определена для неквадратных")
         n = self.rows
-        det = self.determinant()
-        if abs(det) < 1e-10:
+        exact = self._bareiss()
+        if exact is not None:
+            if exact.rank < n:
+                raise ValueError("Матрица вырожденная, обратной не существует")
+            identity = [0] * (n * n)
+            identity[::n + 1] = [1] * n
+            return Matrix._from_flat(n, n, exact.solve(identity, n))
+        identity = [0.0] * (n * n)
+        identity[::n + 1] = [1.0] * n
+        chol = self._cholesky()
+        if chol is not None:
+            return Matrix._from_flat(n, n, chol.solve(identity, n))
+        lu = self.lu()
+        if abs(lu.determinant()) < 1e-10:
             raise ValueError("Матрица вырожденная, обратной не существует")
-        augmented_data = []
+        return Matrix._from_flat(n, n, lu.solve(identity, n))
+
+    def lu(self):
+        """Возвращает LU-разложение матрицы.
+
+        Разложение вычисляется при первом вызове и кэшируется на объекте,
+        поэтому determinant, inverse, rank и solve_system для одной матрицы
+        выполняют исключение только один раз.
+
+        Returns:
+            LU: Разложение PA = LU с частичным выбором ведущего элемента.
+        """
+        self._sync()
+        if self._lu is None:
+            self._lu = LU(self)
+        return self._lu
+
+    def _is_exact(self):
+        """Проверяет, что все элементы матрицы - int или Fraction."""
+        storage = self._layout()[0]
+        if isinstance(storage, array) or isinstance(storage, memoryview) and storage.format == 'd':
+            return False
+        return is_exact(self._buf)
+
+    def _bareiss(self):
+        """Кэшированное точное разложение Барейса для матриц из int и
+        Fraction, иначе None.
+        """
+        self._sync()
+        if self._exact is None:
+            self._exact = self._is_exact() and Bareiss(self)
+        return self._exact or None
+
+    def _use_modular(self, size):
+        """Нужно ли считать определитель или ранг многомодульным методом:
+        матрица точная, ещё не разложена Барейсом и не меньше порога
+        бэкенда ``modular_threshold``.
+        """
+        self._sync()
+        threshold = backend.get_backend().modular_threshold
+        return (threshold is not None and size >= threshold
+                and self._exact is None and self._is_exact())
+
+    def is_symmetric(self, tol=1e-12):
+        """Проверяет симметричность матрицы.
+
+        Args:
+            tol (float, optional): Допустимое отличие a[i][j] от a[j][i].
+                По умолчанию 1e-12.
+
+        Returns:
+            bool: True, если матрица квадратная и симметричная.
+        """
+        if not self.is_square():
+            return False
+        n, buf = self.rows, self._buf
         for i in range(n):
-            left_part = self.data[i]
-            right_part = [1.0 if j == i else 0.0 for j in range(n)]
-            augmented_data.append(left_part + right_part)
-        augmented = Matrix(augmented_data)
-        echelon, _ = augmented.gaussian_elimination(normalize=True)
-        matrix = [row[:] for row in echelon.data]
-        for i in range(n-1, -1, -1):
-            for k in range(i-1, -1, -1):
-                factor = matrix[k][i]
-                for j in range(2*n):
-                    matrix[k][j] -= factor * matrix[i][j]
-        inverse_data = [matrix[i][n:] for i in range(n)]
-        return Matrix(inverse_data)
-    
+            for x, y in zip(buf[i * n:i * n + i], buf[i::n]):
+                if abs(x - y) > tol:
+                    return False
+        return True
+
+    def cholesky(self):
+        """Находит разложение Холецкого A = L L^T.
+
+        Разложение берётся из кэша, которым пользуются determinant, inverse
+        и solve_system, только для матриц не меньше CHOLESKY_MIN_SIZE;
+        разложение меньшей матрицы не кэшируется и не меняет выбор метода
+        в этих операциях.
+
+        Returns:
+            Matrix: Нижнетреугольная матрица L.
+
+        Raises:
+            ValueError: Если матрица не симметричная или не положительно
+                определённая.
+        """
+        if not self.is_symmetric():
+            raise ValueError("Разложение Холецкого определено только для симметричных матриц")
+        self._sync()
+        factor = self._cholesky() if self.rows >= CHOLESKY_MIN_SIZE else None
+        if factor is None:
+            factor = Cholesky(self)
+        return Matrix._from_flat(self.rows, self.rows, factor.lower())
+
+    def _cholesky(self):
+        """Кэшированное разложение Холецкого, если матрица симметричная
+        положительно определённая и не меньше CHOLESKY_MIN_SIZE, иначе None.
+        """
+        self._sync()
+        if self._chol is None:
+            self._chol = False
+            n = self.rows
+            if (n >= CHOLESKY_MIN_SIZE and self.is_symmetric()
+                    and all(x > 0 for x in self._buf[::n + 1])):
+                try:
+                    self._chol = Cholesky(self)
+                except ValueError:
+                    pass
+        return self._chol or None
+
+    def bandwidth(self):
+        """Вычисляет ширину ленты матрицы.
+
+        Returns:
+            tuple[int, int]: Количество ненулевых поддиагоналей (kl) и
+                наддиагоналей (ku).
+        """
+        lower = upper = 0
+        for i in range(self.rows):
+            row = self._row(i)
+            first = next((j for j, x in enumerate(row) if x), None)
+            if first is None:
+                continue
+            last = next(j for j in range(self.cols - 1, -1, -1) if row[j])
+            lower = max(lower, i - first)
+            upper = max(upper, last - i)
+        return lower, upper
+
+    def _band_lu(self):
+        """Ленточное разложение для узкой ленты, иначе None.
+
+        Ширина ленты определяется один раз, результат кэшируется.
+        """
+        self._sync()
+        if self._band is None:
+            self._band = False
+            if self.is_square() and self.rows >= BAND_MIN_SIZE:
+                kl, ku = self.bandwidth()
+                if 4 * (kl + ku) < self.rows:
+                    from banded import BandMatrix
+                    self._band = BandMatrix.from_dense(self, kl, ku).factor()
+        return self._band or None
+
     def trace(self):
         """Вычисляет след матрицы.
-        
+
         Returns:
             float: След матрицы.
-        
+
         Raises:
             ValueError: Если матрица не квадратная.
-        """ 
+        """
         if not self.is_square():
             raise ValueError("След не существует у неквадратных матриц")
-        trace_sum = 0
-        for i in range(self.rows):
-            trace_sum += self.data[i][i]
-        return trace_sum
+        return sum(self._buf[::self.cols + 1])
+
     def rank(self):
         """Вычисляет ранг матрицы.
-        
+
         Returns:
             int: Ранг матрицы.
         """
-        echelon, _ = self.gaussian_elimination(normalize=False)
+        if self._use_modular(min(self.rows, self.cols)):
+            return modular.rank(self)
+        exact = self._bareiss()
+        if exact is not None:
+            return exact.rank
+        lu = self.lu()
         rank = 0
-        for i in range(min(self.rows, self.cols)):
-            if any(abs(echelon.data[i][j]) > 1e-10 for j in range(self.cols)):
+        for i in range(lu.rank):
+            if any(abs(x) > 1e-10 for x in lu.u_row(i)):
                 rank += 1
         return rank
 
     def solve_system(self, b, return_fsr=False):
         """Решает систему линейных уравнений Ax = b.
-        
+
+        Системы из int и Fraction (и матрица, и правая часть) решаются
+        точно, решение состоит из int и Fraction. Для квадратных матриц
+        с узкой лентой (см. bandwidth) используется
+        ленточный решатель за O(n * kl * (kl + ku)), для симметричных
+        положительно определённых - разложение Холецкого.
+
+        Если b - матрица, решается сразу несколько систем AX = B (по одной
+        на каждый столбец B) за один проход по общему LU-разложению A.
+
         Args:
-            b (list[float]): Вектор свободных членов.
+            b (list[float] или Matrix): Вектор свободных членов или матрица
+                правых частей размера rows x k.
             return_fsr (bool, optional): Если True, возвращает также фундаментальную
                 систему решений для однородной системы. По умолчанию False.
-        
+
         Returns:
             Если return_fsr=False:
                 list[float]: Вектор решения системы.
@@ -317,61 +906,45 @@ class Matrix:
                     - list[float]: Частное решение неоднородной системы
                     - list[list[float]]: Фундаментальная система решений
                     - list[int]: Индексы свободных переменных
-        
+            Если b - Matrix, вместо вектора решения возвращается матрица
+                решений X размера cols x k (столбец j - решение для
+                столбца j матрицы B); ФСР общая для всех правых частей.
+
         Raises:
             ValueError: Если размерность вектора b не соответствует матрице,
                 или система несовместна.
-        
+
         Example:
             >>> m = Matrix([[2, 1, -1], [-3, -1, 2], [-2, 1, 2]])
             >>> b = [8, -11, -3]
             >>> m.solve_system(b)
-            [2.0, 3.0, -1.0]
+            [2, 3, -1]
         """
-        if self.rows != len(b):
-            raise ValueError("Размерность вектора b не соответствует матрице A")
-        n = self.rows
-        m = self.cols
-        augmented_data = [self.data[i] + [float(b[i])] for i in range(n)]
-        augmented = Matrix(augmented_data)
-        echelon, _ = augmented.gaussian_elimination(normalize=True)
-        matrix = echelon.data
-        for i in range(n):
-            if all(abs(matrix[i][j]) < 1e-12 for j in range(m)) and abs(matrix[i][m]) > 1e-12:
-                raise ValueError("Система несовместна")
-        basis_vars = []    
-        free_vars = []
-        row = 0
-        for col in range(m):
-            if row < n and abs(matrix[row][col]) > 1e-12:
-                basis_vars.append(col)
-                row += 1
+        if isinstance(b, Matrix):
+            if self.rows != b.rows:
+                raise ValueError("Количество строк матрицы B не соответствует матрице A")
+            lu = self._bareiss()
+            if lu is None or not is_exact(b._buf):
+                chol = self._cholesky()
+                if chol is not None:
+                    return Matrix._from_flat(self.cols, b.cols, chol.solve(b._buf, b.cols))
+                lu = self.lu()
+            x_part = Matrix._from_flat(self.cols, b.cols, lu.solve(b._buf, b.cols))
+        else:
+            if self.rows != len(b):
+                raise ValueError("Размерность вектора b не соответствует матрице A")
+            lu = self._bareiss()
+            if lu is not None and is_exact(b):
+                x_part = lu.solve(b)
             else:
-                free_vars.append(col)
-        rank = len(basis_vars)
-        x_part = [0.0] * m
-        for idx in range(rank - 1, -1, -1):
-            i = idx
-            j = basis_vars[idx]
-            x_part[j] = matrix[i][m]
-            
-            for k in range(j + 1, m):
-                x_part[j] -= matrix[i][k] * x_part[k]
-        
-        if not free_vars or not return_fsr:
+                band = self._band_lu()
+                if band is not None and not band.singular:
+                    return band.solve(b)
+                chol = self._cholesky()
+                if chol is not None:
+                    return [float(x) for x in chol.solve(b)]
+                lu = self.lu()
+                x_part = [float(x) for x in lu.solve(b)]
+        if not lu.free_vars or not return_fsr:
             return x_part
-        
-        fsr = []
-        for free_var in free_vars:
-            x = [0.0] * m
-            x[free_var] = 1.0
-            for i in range(rank - 1, -1, -1):
-                basis_var = basis_vars[i]
-                
-                x[basis_var] = 0.0
-                for k in range(basis_var + 1, m):
-                    x[basis_var] -= matrix[i][k] * x[k]
-                x[basis_var] /= matrix[i][basis_var]
-            fsr.append(x)
-        
-        return x_part, fsr, free_vars
+        return x_part, lu.null_space(), list(lu.free_vars)
@@ -0,0 +1,189 @@
+"""Многомодульный точный определитель и ранг целых матриц.
+
+Вместо исключения над длинными целыми матрица приводится по модулю
+нескольких простых чисел меньше 2^23, в каждом поле вычетов выполняется
+быстрое исключение на машинных целых (ядро бэкенда ``eliminate_mod``),
+а точный результат восстанавливается по китайской теореме об остатках.
+Количество модулей выбирается по оценке Адамара, поэтому результат
+точен, а не вероятностен. Вычеты для разных модулей независимы и
+считаются в пуле процессов.
+"""
+import math
+import os
+from array import array
+from fractions import Fraction
+
+import backend
+from bareiss import exact_value, integer_rows
+from parallel import get_pool
+
+# Модули выбираются среди простых чисел меньше этого значения по убыванию.
+PRIME_LIMIT = 1 << 23
+
+_primes = []
+
+
+def _is_prime(n):
+    """Детерминированный тест Миллера-Рабина для n < 2^32."""
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7):
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 7, 61):
+        if a % n == 0:
+            continue
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes_for_bits(bits):
+    """Возвращает наименьший набор модулей с произведением больше 2^bits.
+
+    Простые числа находятся один раз и кэшируются в модуле.
+
+    Args:
+        bits (float): Требуемая разрядность произведения модулей.
+
+    Returns:
+        list[int]: Простые числа меньше PRIME_LIMIT по убыванию.
+    """
+    total = 0.0
+    count = 0
+    while total <= bits:
+        if count == len(_primes):
+            candidate = (_primes[-1] if _primes else PRIME_LIMIT + 1) - 2
+            while not _is_prime(candidate):
+                candidate -= 2
+            _primes.append(candidate)
+        total += math.log2(_primes[count])
+        count += 1
+    return _primes[:count]
+
+
+def hadamard_bits(rows):
+    """Двоичный логарифм оценки Адамара: произведения евклидовых норм
+    ненулевых строк. Ограничивает модуль любого минора матрицы.
+
+    Args:
+        rows (list[list[int]]): Строки целой матрицы.
+
+    Returns:
+        float: log2 оценки (0.0 для нулевой матрицы).
+    """
+    bits = 0.0
+    for row in rows:
+        norm2 = sum(x * x for x in row)
+        if norm2:
+            bits += math.log2(norm2) / 2
+    return bits
+
+
+def crt(residues, moduli):
+    """Восстанавливает число по остаткам (китайская теорема об остатках).
+
+    Args:
+        residues (list[int]): Остатки.
+        moduli (list[int]): Попарно взаимно простые модули.
+
+    Returns:
+        tuple[int, int]: Число x в [0, M) и произведение модулей M.
+    """
+    x, m = 0, 1
+    for r, p in zip(residues, moduli):
+        t = (r - x) * pow(m, -1, p) % p
+        x += m * t
+        m *= p
+    return x, m
+
+
+def _flatten(rows):
+    """Плоский буфер целой матрицы: array('q'), если элементы помещаются
+    в 64 бита (компактно передаётся в процессы и в NumPy), иначе list."""
+    values = [x for row in rows for x in row]
+    try:
+        return array('q', values)
+    except OverflowError:
+        return values
+
+
+def _residues(buf, rows, cols, moduli):
+    kernels = backend.get_backend()
+    return [kernels.eliminate_mod(buf, rows, cols, p) for p in moduli]
+
+
+def _map_residues(buf, rows, cols, moduli, workers):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(moduli) < 2:
+        return _residues(buf, rows, cols, moduli)
+    chunk = -(-len(moduli) // workers)
+    pool = get_pool(workers)
+    futures = [pool.submit(_residues, buf, rows, cols, moduli[i:i + chunk])
+               for i in range(0, len(moduli), chunk)]
+    return [result for future in futures for result in future.result()]
+
+
+def determinant(matrix, workers=None):
+    """Точный определитель квадратной матрицы из int и Fraction.
+
+    Модулей берётся столько, чтобы их произведение превышало удвоенную
+    оценку Адамара; тогда симметричный остаток по китайской теореме
+    совпадает с определителем.
+
+    Args:
+        matrix (Matrix): Квадратная матрица.
+        workers (int, optional): Количество процессов. По умолчанию
+            os.cpu_count().
+
+    Returns:
+        int или Fraction: Значение определителя.
+    """
+    n = matrix.rows
+    rows, scale = integer_rows(matrix._buf, n, n)
+    if any(not any(row) for row in rows):
+        return 0
+    moduli = primes_for_bits(hadamard_bits(rows) + 1)
+    buf = _flatten(rows)
+    residues = [det for _, det in _map_residues(buf, n, n, moduli, workers)]
+    det, m = crt(residues, moduli)
+    if det > m // 2:
+        det -= m
+    return det if scale == 1 else exact_value(Fraction(det, scale))
+
+
+def rank(matrix, workers=None):
+    """Точный ранг матрицы из int и Fraction.
+
+    Ранг по модулю p не больше ранга над рациональными числами и меньше
+    его, только если p делит все миноры максимального порядка. Поэтому
+    достаточно модулей с произведением больше оценки Адамара, а полный
+    ранг по первому же модулю сразу окончателен.
+
+    Args:
+        matrix (Matrix): Матрица.
+        workers (int, optional): Количество процессов. По умолчанию
+            os.cpu_count().
+
+    Returns:
+        int: Ранг матрицы.
+    """
+    r, c = matrix.rows, matrix.cols
+    rows, _ = integer_rows(matrix._buf, r, c)
+    buf = _flatten(rows)
+    moduli = primes_for_bits(hadamard_bits(rows))
+    best = _residues(buf, r, c, moduli[:1])[0][0]
+    if best == min(r, c) or len(moduli) == 1:
+        return best
+    return max(best, max(rk for rk, _ in _map_residues(buf, r, c, moduli[1:], workers)))
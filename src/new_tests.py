@@ -1,4 +1,5 @@
 import unittest
+import importlib.util
 from matrix import Matrix
 class TestMatrix(unittest.TestCase):
     
@@ -339,5 +340,1048 @@ class TestMatrix(unittest.TestCase):
             A.solve_system(b)
         self.assertIn("несовмест", str(context.exception).lower())
 
+    def test_float_matrix_uses_compact_storage(self):
+        from array import array
+        m = Matrix([[1.5, 2.0], [3.0, 4.25]])
+        self.assertIsInstance(m._buf, array)
+        self.assertEqual(m.data, [[1.5, 2.0], [3.0, 4.25]])
+        self.assertIsInstance((self.A * 0.5)._buf, array)
+
+    def test_data_assignment_rebuilds_storage(self):
+        m = Matrix([[1, 2], [3, 4]])
+        m.data = [[1, 2, 3]]
+        self.assertEqual((m.rows, m.cols), (1, 3))
+        self.assertEqual(m.transpose().data, [[1], [2], [3]])
+        with self.assertRaises(AttributeError):
+            m.extra = 1
+
+    def test_blocked_matmul_matches_naive(self):
+        import random
+        from backend import PythonBackend
+        rng = random.Random(3)
+        kernels = PythonBackend()
+        kernels.tile_size = 4
+        a = [rng.uniform(-5, 5) for _ in range(13 * 10)]
+        b = [rng.randint(-5, 5) for _ in range(10 * 11)]
+        blocked = kernels.matmul(a, b, 13, 10, 11)
+        naive = kernels._matmul_naive(a, b, 13, 10, 11)
+        for x, y in zip(blocked, naive):
+            self.assertAlmostEqual(x, y, places=9)
+
+    def test_strassen_matches_standard(self):
+        import random
+        from backend import get_backend
+        kernels = get_backend()
+        saved = kernels.strassen_crossover
+        kernels.strassen_crossover = 2
+        rng = random.Random(3)
+        try:
+            A = Matrix([[rng.randint(-9, 9) for _ in range(7)] for _ in range(9)])
+            B = Matrix([[rng.uniform(-9, 9) for _ in range(5)] for _ in range(7)])
+            fast = A.matmul(B, algorithm="strassen")
+            slow = A.matmul(B, algorithm="standard")
+        finally:
+            kernels.strassen_crossover = saved
+        self.assertEqual((fast.rows, fast.cols), (9, 5))
+        for x, y in zip(fast._buf, slow._buf):
+            self.assertAlmostEqual(x, y, places=9)
+
+    def test_parallel_matmul_matches_standard(self):
+        import random
+        rng = random.Random(3)
+        A = Matrix([[rng.uniform(-9, 9) for _ in range(6)] for _ in range(11)])
+        B = Matrix([[rng.uniform(-9, 9) for _ in range(4)] for _ in range(6)])
+        fast = A.matmul(B, algorithm="parallel", workers=2, block_rows=3)
+        slow = A.matmul(B, algorithm="standard")
+        self.assertEqual((fast.rows, fast.cols), (11, 4))
+        for x, y in zip(fast._buf, slow._buf):
+            self.assertAlmostEqual(x, y, places=9)
+
+    def test_parallel_matmul_releases_segments_on_error(self):
+        from multiprocessing import shared_memory
+        from unittest import mock
+        import parallel
+        created = []
+        to_shared = parallel._to_shared
+
+        def fail_second(buf):
+            if created:
+                raise MemoryError
+            created.append(to_shared(buf))
+            return created[-1]
+
+        a = [1.5] * 6
+        with mock.patch.object(parallel, '_to_shared', side_effect=fail_second):
+            with self.assertRaises(MemoryError):
+                parallel.parallel_matmul(a, a, 2, 3, 2, workers=2)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0].name)
+
+    def test_parallel_matmul_keeps_integers_exact(self):
+        big = 2 ** 53 + 1
+        A = Matrix([[big, 1], [2, big]])
+        B = Matrix([[1, 0], [big, 3]])
+        for workers in (1, 2):
+            result = A.matmul(B, algorithm="parallel", workers=workers)
+            self.assertEqual(result.data, (A * B).data)
+            self.assertEqual(result.data[0][0], 2 * big)
+
+    def test_matmul_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            self.A.matmul(self.B, algorithm="fft")
+
+    def test_lu_is_cached_and_reused(self):
+        m = Matrix([[2, 1, 1], [4, -6, 0], [-2, 7, 2]])
+        lu = m.lu()
+        self.assertIs(m.lu(), lu)
+        self.assertAlmostEqual(m.determinant(), -16.0)
+        self.assertEqual(m.rank(), 3)
+        product = m * m.inverse()
+        for i in range(3):
+            for j in range(3):
+                self.assertAlmostEqual(product.data[i][j], 1.0 if i == j else 0.0)
+        self.assertIs(m.lu(), lu)
+
+    def test_lu_pivots_rectangular(self):
+        lu = Matrix([[0, 0, 1], [0, 0, 2], [1, 1, 0]]).lu()
+        self.assertEqual(lu.pivots, [0, 2])
+        self.assertEqual(lu.free_vars, [1])
+
+    def test_solve_system_many_rhs(self):
+        A = Matrix([[2, 1], [1, -1]])
+        B = Matrix([[5, 3, 0], [1, 0, 0]])
+        X = A.solve_system(B)
+        self.assertEqual((X.rows, X.cols), (2, 3))
+        for j in range(3):
+            x = A.solve_system([B.data[0][j], B.data[1][j]])
+            self.assertAlmostEqual(X.data[0][j], x[0], places=10)
+            self.assertAlmostEqual(X.data[1][j], x[1], places=10)
+
+    def test_solve_system_many_rhs_with_fsr(self):
+        A = Matrix([[1, 1], [2, 2]])
+        X, fsr, free_vars = A.solve_system(Matrix([[3, 1], [6, 2]]), return_fsr=True)
+        self.assertEqual(free_vars, [1])
+        self.assertAlmostEqual(X.data[0][0] + X.data[1][0], 3.0, places=10)
+        self.assertAlmostEqual(X.data[0][1] + X.data[1][1], 1.0, places=10)
+        with self.assertRaises(ValueError):
+            A.solve_system(Matrix([[3, 1], [6, 3]]))
+
+    def test_cholesky_decomposition(self):
+        m = Matrix([[4, 2], [2, 3]])
+        L = m.cholesky()
+        self.assertEqual(L.data[0][1], 0.0)
+        product = L * L.transpose()
+        for i in range(2):
+            for j in range(2):
+                self.assertAlmostEqual(product.data[i][j], m.data[i][j])
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2], [2, 1]]).cholesky()
+        with self.assertRaises(ValueError):
+            self.A.cholesky()
+
+    def test_explicit_cholesky_keeps_small_matrix_dispatch(self):
+        m = Matrix([[4, 2], [2, 3]])
+        m.cholesky()
+        self.assertIsNone(m._cholesky())
+        self.assertAlmostEqual(m.determinant(), 8.0)
+        n = 10
+        big = Matrix([[n + 1.0 if i == j else 1.0 for j in range(n)] for i in range(n)])
+        big.cholesky()
+        factor = big._cholesky()
+        self.assertIsNotNone(factor)
+        big.cholesky()
+        self.assertIs(big._cholesky(), factor)
+
+    def test_spd_system_uses_cholesky(self):
+        import math
+        n = 10
+        m = Matrix([[n + 1.0 if i == j else 1.0 / (1 + i + j) for j in range(n)]
+                     for i in range(n)])
+        self.assertIsNotNone(m._cholesky())
+        self.assertAlmostEqual(m.determinant() / m.lu().determinant(), 1.0, places=10)
+        sign, log_det = m.log_determinant()
+        self.assertEqual(sign, 1.0)
+        self.assertAlmostEqual(log_det, math.log(m.determinant()), places=10)
+        x = m.solve_system([1.0] * n)
+        for i in range(n):
+            self.assertAlmostEqual(sum(m.data[i][j] * x[j] for j in range(n)), 1.0, places=10)
+        product = m * m.inverse()
+        for i in range(n):
+            for j in range(n):
+                self.assertAlmostEqual(product.data[i][j], 1.0 if i == j else 0.0, places=10)
+
+    def test_log_determinant_general(self):
+        import math
+        sign, log_det = self.A.log_determinant()
+        self.assertEqual(sign, -1.0)
+        self.assertAlmostEqual(log_det, math.log(2.0))
+        self.assertEqual(Matrix([[1, 2], [2, 4]]).log_determinant(), (0.0, -math.inf))
+
+    def test_exact_determinant_big_integers(self):
+        m = Matrix([[10 ** 20 + 1, 10 ** 20], [10 ** 20, 10 ** 20 - 1]])
+        self.assertEqual(m.determinant(), -1)
+        n = 12
+        vandermonde = Matrix([[i ** j for j in range(n)] for i in range(1, n + 1)])
+        expected = 1
+        for i in range(1, n + 1):
+            for j in range(i + 1, n + 1):
+                expected *= j - i
+        self.assertEqual(vandermonde.determinant(), expected)
+
+    def test_exact_rational_matrix(self):
+        from fractions import Fraction
+        n = 6
+        hilbert = Matrix([[Fraction(1, i + j + 1) for j in range(n)] for i in range(n)])
+        self.assertEqual(hilbert.determinant(), Fraction(1, 186313420339200000))
+        self.assertEqual(hilbert.rank(), n)
+        inv = hilbert.inverse()
+        self.assertTrue(all(type(x) is int for row in inv.data for x in row))
+        self.assertEqual((hilbert * inv).data, [[int(i == j) for j in range(n)] for i in range(n)])
+
+    def test_exact_rank_and_solve(self):
+        from fractions import Fraction
+        m = Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(m.rank(), 2)
+        x, fsr, free_vars = m.solve_system([1, 2, 3], return_fsr=True)
+        self.assertEqual(x, [Fraction(-1, 3), Fraction(2, 3), 0])
+        self.assertEqual(fsr, [[1, -2, 1]])
+        self.assertEqual(free_vars, [2])
+        with self.assertRaises(ValueError):
+            m.solve_system([1, 2, 4])
+        X = m.solve_system(Matrix([[1, 0], [2, 3], [3, 6]]))
+        self.assertEqual(X.data, [[Fraction(-1, 3), 2], [Fraction(2, 3), -1], [0, 0]])
+        self.assertEqual(Matrix([[3]]).solve_system([1]), [Fraction(1, 3)])
+
+    def test_exact_solve_reuses_elimination(self):
+        from fractions import Fraction
+        from unittest import mock
+        import bareiss
+        m = Matrix([[Fraction(1, 2), 1, 0], [0, Fraction(2, 3), 1], [1, 0, 3]])
+        m.solve_system([1, 2, 3])
+        with mock.patch.object(bareiss, '_eliminate', side_effect=AssertionError):
+            x = m.solve_system([Fraction(1, 3), 2, Fraction(-5, 4)])
+        self.assertEqual((m * Matrix([[v] for v in x])).data,
+                         [[Fraction(1, 3)], [2], [Fraction(-5, 4)]])
+
+    def test_modular_determinant_and_rank(self):
+        import random
+        from fractions import Fraction
+        import modular
+        from bareiss import Bareiss
+        rng = random.Random(5)
+        n = 45
+        m = Matrix([[rng.randint(-50, 50) for _ in range(n)] for _ in range(n)])
+        self.assertEqual(modular.determinant(m, workers=1), Bareiss(m).determinant())
+        self.assertEqual(m.determinant(), Bareiss(m).determinant())
+        big = Matrix([[rng.randint(-2 ** 70, 2 ** 70) for _ in range(6)] for _ in range(6)])
+        self.assertEqual(modular.determinant(big, workers=1), Bareiss(big).determinant())
+        q = Matrix([[Fraction(rng.randint(-9, 9), rng.randint(1, 9)) for _ in range(5)] for _ in range(5)])
+        self.assertEqual(modular.determinant(q, workers=1), Bareiss(q).determinant())
+        thin = Matrix([[rng.randint(-3, 3) for _ in range(50)] for _ in range(4)])
+        low_rank = thin.transpose() * thin
+        self.assertEqual(modular.rank(low_rank, workers=1), 4)
+        self.assertEqual(low_rank.rank(), 4)
+        self.assertEqual(modular.determinant(low_rank, workers=1), 0)
+
+    def test_inplace_operators(self):
+        acc = Matrix([[0.0, 0.0], [0.0, 0.0]])
+        buf = acc._buf
+        original = acc
+        X = Matrix([[1.5, 2.0], [3.0, 4.0]])
+        self.assertEqual(acc.data, [[0.0, 0.0], [0.0, 0.0]])
+        for _ in range(3):
+            acc += X
+        acc -= X
+        acc *= 0.5
+        self.assertIs(acc, original)
+        self.assertIs(acc._buf, buf)
+        self.assertEqual(acc.data, [[1.5, 2.0], [3.0, 4.0]])
+        exact = Matrix([[1, 2], [3, 4]])
+        self.assertEqual(exact.determinant(), -2)
+        exact *= 2
+        self.assertEqual(exact.determinant(), -8)
+        exact += Matrix([[0.5, 0], [0, 0]])
+        self.assertEqual(exact.data, [[2.5, 4], [6, 8]])
+        with self.assertRaises(ValueError):
+            acc += Matrix([[1, 2, 3]])
+        product = acc
+        product *= X
+        self.assertIsNot(product, acc)
+
+    def test_out_parameters(self):
+        A = Matrix([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        B = Matrix([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+        C = Matrix([[0.0, 0.0], [0.0, 0.0]])
+        buf = C._buf
+        self.assertIs(A.matmul(B, out=C), C)
+        self.assertIs(C._buf, buf)
+        self.assertEqual(C.data, (A * B).data)
+        T = Matrix([[0.0, 0.0], [0.0, 0.0], [0.0, 0.0]])
+        self.assertIs(A.transpose(out=T), T)
+        self.assertEqual(T.data, A.transpose().data)
+        view = Matrix([[0.0, 0.0], [0.0, 0.0], [0.0, 0.0]])[:2, :]
+        self.assertIs(A.matmul(B, out=view), view)
+        self.assertEqual(view._base.data, (A * B).data + [[0.0, 0.0]])
+        S = Matrix([[1, 2], [3, 4]])
+        S.matmul(S, out=S)
+        self.assertEqual(S.data, [[7, 10], [15, 22]])
+        S.transpose(out=S)
+        self.assertEqual(S.data, [[7, 15], [10, 22]])
+        S.matmul(S, out=S.T)
+        self.assertEqual(S.data, [[199, 290], [435, 634]])
+        with self.assertRaises(ValueError):
+            A.matmul(B, out=T)
+        with self.assertRaises(ValueError):
+            A.transpose(out=C)
+
+    def test_views_share_storage(self):
+        M = Matrix([[float(4 * i + j) for j in range(4)] for i in range(3)])
+        T = M.T
+        self.assertIs(T._layout()[0], M._buf)
+        self.assertEqual(T.data, M.transpose().data)
+        block = M[1:, 1:3]
+        self.assertEqual(block.data, [[5.0, 6.0], [9.0, 10.0]])
+        self.assertEqual(M[::2, ::3].data, [[0.0, 3.0], [8.0, 11.0]])
+        self.assertEqual(M[1, :].data, [[4.0, 5.0, 6.0, 7.0]])
+        self.assertEqual(M.T[1:3, 0].data, [[1.0], [2.0]])
+        self.assertEqual(M[2, 3], 11.0)
+        self.assertEqual(M[-1, -2], 10.0)
+        self.assertEqual(block.T[1, 0], 6.0)
+        block += Matrix([[1.0, 1.0], [1.0, 1.0]])
+        self.assertEqual(M.data[1], [4.0, 6.0, 7.0, 7.0])
+        self.assertEqual(T.data[1], [1.0, 6.0, 10.0])
+        M *= 2
+        self.assertEqual(block.data, [[12.0, 14.0], [20.0, 22.0]])
+        own = block.copy()
+        own *= 0
+        self.assertEqual(block.data, [[12.0, 14.0], [20.0, 22.0]])
+        with self.assertRaises(IndexError):
+            M[3, 0]
+        with self.assertRaises(ValueError):
+            M[2:2, :]
+        with self.assertRaises(ValueError):
+            M[::-1, :]
+        with self.assertRaises(TypeError):
+            M[0]
+
+    def test_view_kernels(self):
+        rng = __import__("random").Random(7)
+        M = Matrix([[rng.uniform(-1, 1) for _ in range(20)] for _ in range(12)])
+        A = M.T
+        dense = A.copy()
+        gram = A * M
+        self.assertEqual(len(gram.data), 20)
+        for x, y in zip(gram._buf, (dense * M)._buf):
+            self.assertAlmostEqual(x, y, places=12)
+        for x, y in zip(A.matmul(M, algorithm="strassen")._buf, gram._buf):
+            self.assertAlmostEqual(x, y, places=10)
+        square = M[2:10, 4:12]
+        self.assertAlmostEqual(square.determinant(), square.copy().determinant(), places=12)
+        self.assertEqual(A.rank(), 12)
+        self.assertEqual(A.gaussian_elimination()[0].data, dense.gaussian_elimination()[0].data)
+        for x, y in zip(square.T.solve_system([1.0] * 8), square.copy().T.solve_system([1.0] * 8)):
+            self.assertAlmostEqual(x, y, places=9)
+        spd = gram[:8, :8] + Matrix([[8.0 * (i == j) for j in range(8)] for i in range(8)])
+        self.assertAlmostEqual(spd.T.log_determinant()[1], spd.log_determinant()[1], places=10)
+        self.assertEqual(M[::3, ::5].trace(), M.data[0][0] + M.data[3][5] + M.data[6][10] + M.data[9][15])
+        exact = Matrix([[2, 1, 0], [1, 3, 1], [0, 1, 4]])
+        self.assertEqual(exact[:2, :2].determinant(), 5)
+        self.assertEqual(exact.T.inverse().data, exact.inverse().data)
+
+    def test_view_caches_follow_base(self):
+        M = Matrix([[2.0, 0.0], [0.0, 3.0]])
+        T = M.T
+        self.assertEqual(T.determinant(), 6.0)
+        M += Matrix([[1.0, 0.0], [0.0, 1.0]])
+        self.assertEqual(T.determinant(), 12.0)
+        self.assertEqual(M.determinant(), 12.0)
+        T *= 2
+        self.assertEqual(M.determinant(), 48.0)
+        self.assertEqual(M.data, [[6.0, 0.0], [0.0, 8.0]])
+        ints = Matrix([[1, 2], [3, 4]])
+        row = ints[0, :]
+        ints *= 0.5
+        self.assertEqual(row.data, [[0.5, 1.0]])
+
+    def test_set_backend_unknown(self):
+        with self.assertRaises(ValueError):
+            Matrix.set_backend("fortran")
+
+
+class TestMatrixPythonBackend(TestMatrix):
+    """Те же тесты на ядрах чистого Python."""
+    backend = "python"
+
+    def setUp(self):
+        self._previous = Matrix.get_backend()
+        Matrix.set_backend(self.backend)
+        super().setUp()
+
+    def tearDown(self):
+        Matrix.set_backend(self._previous)
+
+
+class TestSparseMatrix(unittest.TestCase):
+
+    def setUp(self):
+        from sparse import SparseMatrix
+        self.dense = Matrix([[4, 0, 0, 1], [0, 0, 3, 0], [2, 0, 5, 0], [0, 6, 0, 0]])
+        self.S = SparseMatrix.from_dense(self.dense)
+
+    def test_roundtrip(self):
+        self.assertEqual(self.S.nnz, 6)
+        self.assertEqual(self.S.to_dense().data, self.dense.data)
+        self.assertEqual(self.S.transpose().to_dense().data, self.dense.transpose().data)
+
+    def test_arithmetic(self):
+        self.assertEqual((self.S + self.S).to_dense().data, (self.dense * 2).data)
+        self.assertEqual((self.S - self.S).nnz, 0)
+        self.assertEqual((self.S * self.S).to_dense().data, (self.dense * self.dense).data)
+        self.assertEqual((self.S * self.dense).data, (self.dense * self.dense).data)
+        self.assertEqual((self.dense * self.S).data, (self.dense * self.dense).data)
+
+    def test_dense_and_sparse_in_both_orders(self):
+        other = Matrix([[1, 2, 3, 4]] * 4)
+        self.assertEqual((self.S + other).data, (self.dense + other).data)
+        self.assertEqual((other + self.S).data, (other + self.dense).data)
+        self.assertEqual((self.S - other).data, (self.dense - other).data)
+        self.assertEqual((other - self.S).data, (other - self.dense).data)
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2]]) + self.S
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2]]) - self.S
+
+    def test_determinant_rank_solve(self):
+        self.assertAlmostEqual(self.S.determinant(), self.dense.determinant())
+        self.assertEqual(self.S.rank(), 4)
+        x = self.S.solve_system([5, 3, 7, 6])
+        for got, expected in zip(x, self.dense.solve_system([5, 3, 7, 6])):
+            self.assertAlmostEqual(got, expected, places=10)
+
+    def test_large_tridiagonal_solve(self):
+        from sparse import SparseMatrix
+        n = 2000
+        entries = [(i, i, 2.0) for i in range(n)]
+        entries += [(i, i + 1, -1.0) for i in range(n - 1)]
+        entries += [(i + 1, i, -1.0) for i in range(n - 1)]
+        S = SparseMatrix.from_coo(n, n, entries)
+        b = [1.0] + [0.0] * (n - 2) + [1.0]
+        x = S.solve_system(b)
+        for v in x:
+            self.assertAlmostEqual(v, 1.0, places=8)
+
+    def test_inconsistent_system(self):
+        from sparse import SparseMatrix
+        S = SparseMatrix.from_dense([[1, 1], [2, 2]])
+        self.assertEqual(S.rank(), 1)
+        self.assertEqual(S.determinant(), 0.0)
+        with self.assertRaises(ValueError):
+            S.solve_system([3, 7])
+
+
+class TestBandMatrix(unittest.TestCase):
+
+    def test_bandwidth(self):
+        m = Matrix([[1, 2, 0, 0], [3, 4, 5, 0], [0, 6, 7, 8], [0, 0, 9, 1]])
+        self.assertEqual(m.bandwidth(), (1, 1))
+        self.assertEqual(Matrix([[1, 0, 5], [0, 1, 0], [2, 0, 1]]).bandwidth(), (2, 2))
+
+    def test_tridiagonal_thomas(self):
+        from banded import BandMatrix
+        n = 1000
+        T = BandMatrix.tridiagonal([-1.0] * (n - 1), [2.0] * n, [-1.0] * (n - 1))
+        self.assertEqual(T.factor().method, "thomas")
+        self.assertAlmostEqual(T.determinant(), n + 1, places=6)
+        x = T.solve_system([1.0] + [0.0] * (n - 2) + [1.0])
+        for v in x:
+            self.assertAlmostEqual(v, 1.0, places=8)
+
+    def test_band_lu_with_pivoting(self):
+        from banded import BandMatrix
+        m = Matrix([[0, 2, 1, 0, 0], [1, 1, 0, 3, 0], [0, 4, 1, 1, 2],
+                    [0, 0, 5, 0, 1], [0, 0, 0, 6, 1]])
+        B = BandMatrix.from_dense(m)
+        self.assertEqual((B.kl, B.ku), (1, 2))
+        self.assertEqual(B.to_dense().data, m.data)
+        self.assertAlmostEqual(B.determinant(), m.lu().determinant())
+        b = [1, 2, 3, 4, 5]
+        for got, expected in zip(B.solve_system(b), m.lu().solve(b)):
+            self.assertAlmostEqual(got, expected, places=10)
+
+    def test_matrix_dispatches_to_band_solver(self):
+        n = 40
+        m = Matrix([[4.0 if i == j else 1.0 if abs(i - j) == 1 else 0.0
+                     for j in range(n)] for i in range(n)])
+        self.assertIsNotNone(m._band_lu())
+        self.assertAlmostEqual(m.determinant(), m.lu().determinant(), delta=1e-6 * abs(m.lu().determinant()))
+        x = m.solve_system([1.0] * n)
+        for i in range(n):
+            row = sum(m.data[i][j] * x[j] for j in range(n))
+            self.assertAlmostEqual(row, 1.0, places=10)
+
+
+class TestLazyExpr(unittest.TestCase):
+
+    def setUp(self):
+        import random
+        rng = random.Random(3)
+        self.shapes = [(40, 3), (3, 40), (40, 3), (3, 2)]
+        self.mats = [Matrix([[rng.randint(-5, 5) for _ in range(c)] for _ in range(r)])
+                     for r, c in self.shapes]
+
+    def test_chain_order(self):
+        from expr import chain_order
+        cost, split = chain_order([10, 30, 5, 60])
+        self.assertEqual(cost, 4500)
+        self.assertEqual(split[0][2], 1)
+
+    def test_chain_matches_eager_and_is_cheaper(self):
+        A, B, C, D = self.mats
+        expr = A.lazy() * B * C * D
+        self.assertEqual(expr.evaluate().data, (A * B * C * D).data)
+        left_to_right = 40 * 3 * 40 + 40 * 40 * 3 + 40 * 3 * 2
+        self.assertLess(expr.cost(), left_to_right)
+        self.assertEqual(expr.cost(), 3 * 40 * 3 + 3 * 3 * 2 + 40 * 3 * 2)
+
+    def test_scalar_applied_to_smallest_matrix(self):
+        A, B, C, D = self.mats
+        expr = 2 * (A.lazy() * B) * (C * D) * 3
+        self.assertEqual(expr.scalar, 6)
+        self.assertEqual(expr.evaluate().data, ((A * B * C * D) * 6).data)
+        self.assertEqual(expr.cost(), 3 * 40 * 2 + 40 * 3 * 2 + 3 * 2)
+
+    def test_transpose_elimination(self):
+        from expr import Leaf
+        A, B, C, D = self.mats
+        leaf = A.lazy().T.T
+        self.assertIsInstance(leaf, Leaf)
+        self.assertFalse(leaf.transposed)
+        expr = (A.lazy() * B).T
+        self.assertEqual([f.matrix for f in expr.factors], [B, A])
+        self.assertTrue(all(f.transposed for f in expr.factors))
+        self.assertEqual(expr.evaluate().data, (A * B).transpose().data)
+        self.assertEqual((A.lazy().T * A).evaluate().data, (A.transpose() * A).data)
+
+    def test_sums_and_mixed_operands(self):
+        A, B, C, D = self.mats
+        expr = A * B.lazy() - (A * B) + C * (B.lazy() * 0) - A.lazy() * B
+        self.assertEqual(expr.evaluate().data, ((A * B) * -1).data)
+        self.assertEqual((-(A.lazy() * B)).evaluate().data, ((A * B) * -1).data)
+        with self.assertRaises(ValueError):
+            A.lazy() * C
+        with self.assertRaises(ValueError):
+            A.lazy() + B
+
+    def test_fused_elementwise(self):
+        from expr import _linear_terms
+        A, B, C = (Matrix([[i + j * k for j in range(4)] for i in range(3)]) for k in (1, 2, 3))
+        expr = A.lazy() + B - C * 2 - (A.lazy() - B) * 3
+        terms = {}
+        _linear_terms(expr, 1, terms)
+        self.assertEqual(sorted(c for c, _ in terms.values()), [-2, -1, 4])
+        expected = A + B - C * 2 - (A - B) * 3
+        self.assertEqual(expr.evaluate().data, expected.data)
+        self.assertEqual((-A.lazy()).evaluate().data, (A * -1).data)
+        self.assertEqual((A.lazy() - A).evaluate().data, (A * 0).data)
+        self.assertIsNot(A.lazy().evaluate(), A)
+        self.assertIsNot((A.lazy() * 1).evaluate(), A)
+        F = Matrix([[0.5, 1.5], [2.5, 3.5]])
+        self.assertEqual((F.lazy() * 2 - F + F * 0.5).evaluate().data, [[0.75, 2.25], [3.75, 5.25]])
+
+    def test_combine_kernel(self):
+        import backend
+        kernels = backend.get_backend()
+        self.assertEqual(list(kernels.combine([[1, 2], [3, 4], [5, 6]], [1, -1, 2])), [8, 10])
+        self.assertEqual(list(kernels.combine([[1, 2]], [-1])), [-1, -2])
+
+    def test_shared_subexpression_evaluated_once(self):
+        from unittest import mock
+        from expr import Product
+        A, B, C = (Matrix([[i + j * k for j in range(3)] for i in range(3)]) for k in (1, 2, 3))
+        X = A.lazy() * B
+        expr = (X + C) * (X - C)
+        with mock.patch.object(Product, '_eval', autospec=True,
+                               side_effect=Product._eval) as evaluated:
+            result = expr.evaluate()
+        self.assertEqual(result.data, ((A * B + C) * (A * B - C)).data)
+        self.assertEqual([call.args[0] for call in evaluated.call_args_list].count(X), 1)
+
+
+class TestIterative(unittest.TestCase):
+
+    def setUp(self):
+        from sparse import SparseMatrix
+        n = 60
+        entries = []
+        for i in range(n):
+            entries.append((i, i, 4.0))
+            if i > 0:
+                entries.append((i, i - 1, -1.0))
+            if i < n - 1:
+                entries.append((i, i + 1, -1.5))
+        self.A = SparseMatrix.from_coo(n, n, entries)
+        self.x_true = [float(i % 7) for i in range(n)]
+        self.b = self.A.matvec(self.x_true)
+
+    def assertSolution(self, x, info):
+        self.assertEqual(info, 0)
+        for got, expected in zip(x, self.x_true):
+            self.assertAlmostEqual(got, expected, places=6)
+
+    def test_cg_on_dense_spd(self):
+        from iterative import cg
+        m = Matrix([[4, 1, 0], [1, 3, 1], [0, 1, 2]])
+        residuals = []
+        x, info = cg(m, [1, 2, 3], tol=1e-12, callback=lambda it, r: residuals.append(r))
+        self.assertEqual(info, 0)
+        self.assertLessEqual(len(residuals), 3)
+        for got, expected in zip(x, m.solve_system([1, 2, 3])):
+            self.assertAlmostEqual(got, expected, places=10)
+
+    def test_gmres_and_bicgstab_nonsymmetric(self):
+        from iterative import bicgstab, gmres
+        for solver in (gmres, bicgstab):
+            for M in (None, "jacobi", "ilu0"):
+                self.assertSolution(*solver(self.A, self.b, tol=1e-10, M=M))
+
+    def test_gmres_restart(self):
+        from iterative import gmres
+        self.assertSolution(*gmres(self.A, self.b, tol=1e-10, restart=5))
+
+    def test_ilu0_exact_for_tridiagonal(self):
+        from iterative import bicgstab
+        iterations = []
+        x, info = bicgstab(self.A, self.b, tol=1e-10, M="ilu0",
+                           callback=lambda it, r: iterations.append(it))
+        self.assertSolution(x, info)
+        self.assertEqual(len(iterations), 1)
+
+    def test_matrix_free_operator(self):
+        from iterative import LinearOperator, cg
+        n = 500
+
+        def laplacian(x):
+            return [2 * x[i] - (x[i - 1] if i else 0) - (x[i + 1] if i < n - 1 else 0)
+                    for i in range(n)]
+
+        op = LinearOperator(n, n, laplacian, diagonal=[2.0] * n)
+        b = [1.0] * n
+        x, info = cg(op, b, tol=1e-10, M="jacobi")
+        self.assertEqual(info, 0)
+        self.assertLess(max(abs(u - v) for u, v in zip(laplacian(x), b)), 1e-7)
+
+    def test_not_converged_and_errors(self):
+        from iterative import LinearOperator, cg, ilu0
+        x, info = cg(self.A.to_dense().transpose() * self.A.to_dense(), self.b, maxiter=2)
+        self.assertEqual(info, 2)
+        with self.assertRaises(ValueError):
+            cg(self.A, [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            cg(self.A, self.b, M="unknown")
+        with self.assertRaises(ValueError):
+            ilu0(LinearOperator(2, 2, list))
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = self._dir.name + "/m.npy"
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_roundtrip_mapped(self):
+        import io_handler
+        M = Matrix([[1.5, -2.0, 3.25], [4.0, 0.5, 6.0]])
+        io_handler.save_binary(M, self.path)
+        self.assertTrue(io_handler.is_binary_file(self.path))
+        with open(self.path, 'rb') as file:
+            self.assertEqual(len(file.read()), 128 + 6 * 8)
+        loaded = io_handler.load_binary(self.path)
+        self.assertIsInstance(loaded._buf, memoryview)
+        self.assertEqual(loaded.data, M.data)
+        self.assertEqual((loaded.T * loaded).data, (M.transpose() * M).data)
+        loaded *= 2
+        self.assertEqual(io_handler.load_binary(self.path, mapped=False).data, M.data)
+        ints = Matrix([[2, 1], [1, 3]])
+        io_handler.save_binary(ints, self.path)
+        loaded = io_handler.load_binary(self.path)
+        self.assertEqual(loaded.data, [[2, 1], [1, 3]])
+        self.assertEqual(loaded.determinant(), 5)
+
+    def test_numpy_compatible(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy не установлен")
+        import io_handler
+        io_handler.save_binary(Matrix([[1.0, 2.0], [3.0, 4.0]]), self.path)
+        self.assertEqual(np.load(self.path).tolist(), [[1.0, 2.0], [3.0, 4.0]])
+        np.save(self.path, np.asfortranarray(np.arange(6.0).reshape(2, 3)))
+        self.assertEqual(io_handler.load_binary(self.path).data, [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]])
+        np.save(self.path, np.arange(4.0).reshape(2, 2).astype('>f8'))
+        self.assertEqual(io_handler.load_binary(self.path).data, [[0.0, 1.0], [2.0, 3.0]])
+
+    def test_text_conversion_and_errors(self):
+        from fractions import Fraction
+        import io_handler
+        text = self._dir.name + "/m.txt"
+        with open(text, 'w') as file:
+            file.write("1 2.5\n\n3 4\n")
+        io_handler.text_to_binary(text, self.path)
+        self.assertEqual(io_handler.load_binary(self.path).data, [[1.0, 2.5], [3.0, 4.0]])
+        io_handler.binary_to_text(self.path, text)
+        self.assertEqual(io_handler.load_text(text), [[1.0, 2.5], [3.0, 4.0]])
+        with self.assertRaises(ValueError):
+            io_handler.save_binary(Matrix([[Fraction(1, 3)]]), self.path)
+        with self.assertRaises(ValueError):
+            io_handler.load_binary(text)
+        io_handler.save_binary(Matrix([[1.0, 2.0]]), self.path)
+        with open(self.path, 'r+b') as file:
+            file.truncate(70)
+        with self.assertRaises(ValueError):
+            io_handler.load_binary(self.path)
+
+
+class TestOutOfCore(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self._dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_tiled_matmul(self):
+        import random
+        import io_handler
+        import outofcore
+        rng = random.Random(3)
+        A = Matrix([[rng.uniform(-1, 1) for _ in range(13)] for _ in range(9)])
+        B = Matrix([[rng.uniform(-1, 1) for _ in range(7)] for _ in range(13)])
+        a, b, c = (self._dir.name + f"/{name}.npy" for name in "abc")
+        io_handler.save_binary(A, a)
+        io_handler.save_binary(B, b)
+        calls = []
+        C = outofcore.tiled_matmul(a, b, c, tile=4, progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls[-1], (6, 6))
+        for x, y in zip(io_handler.load_binary(c)._buf, (A * B)._buf):
+            self.assertAlmostEqual(x, y, places=12)
+        self.assertEqual(C.rows, 9)
+        I = Matrix([[rng.randint(-9, 9) for _ in range(6)] for _ in range(5)])
+        C = outofcore.tiled_matmul(I, I.T, c, tile=2)
+        self.assertEqual(io_handler.load_binary(c).data, (I * I.T).data)
+        self.assertEqual(C._buf.format, 'q')
+
+    def test_memory_budget_and_errors(self):
+        import outofcore
+        self.assertEqual(outofcore.tile_size(32 * 100 * 100), 100)
+        self.assertEqual(outofcore.tile_size(1), 1)
+        with self.assertRaises(ValueError):
+            outofcore.tile_size(0)
+        text = self._dir.name + "/a.txt"
+        with open(text, "w") as file:
+            file.write("1 2\n3 4\n")
+        with self.assertRaises(ValueError):
+            outofcore.tiled_matmul(text, text, self._dir.name + "/c.npy")
+        with self.assertRaises(ValueError):
+            outofcore.tiled_matmul(Matrix([[1, 2]]), Matrix([[1, 2]]), self._dir.name + "/c.npy")
+        with self.assertRaisesRegex(ValueError, "int64"):
+            outofcore.tiled_matmul(Matrix([[2 ** 62]]), Matrix([[4]]), self._dir.name + "/c.npy")
+
+
+class TestTextParser(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = self._dir.name + "/m.txt"
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def write(self, lines, newline="\n"):
+        with open(self.path, 'w', newline="") as file:
+            file.write(newline.join(lines) + newline)
+
+    def test_types_and_chunks(self):
+        import io_handler
+        self.write(["1 2 3", "", "4 5 6"])
+        m = io_handler.load_text_matrix(self.path)
+        self.assertEqual(m.data, [[1, 2, 3], [4, 5, 6]])
+        self.assertTrue(all(type(x) is int for x in m._buf))
+        lines = ["1 2 3"] * 40 + ["", "4 5.5 -6e-1"] * 30
+        self.write(lines, "\r\n")
+        expected = io_handler.load_text_matrix(self.path, workers=1).data
+        self.assertEqual(expected[40], [4.0, 5.5, -0.6])
+        self.assertEqual(len(expected), 70)
+        self.assertEqual(io_handler.load_text_matrix(self.path, workers=3).data, expected)
+        self.assertEqual(io_handler.load_text(self.path), expected)
+
+    def test_chunks_with_fractions_stay_exact(self):
+        from array import array
+        from fractions import Fraction
+        import io_handler
+        parts = [([Fraction(1, 3), 2], [2], 2, None), (array('d', [1.5, 2.5]), [2], 1, None)]
+        m = io_handler._text_matrix(parts)
+        self.assertEqual(m.data, [[Fraction(1, 3), 2], [1.5, 2.5]])
+        self.assertIs(type(m._buf[0]), Fraction)
+        parts = [([1, 2], [2], 2, None), (array('d', [1.5, 2.5]), [2], 1, None)]
+        m = io_handler._text_matrix(parts)
+        self.assertIsInstance(m._buf, array)
+        self.assertEqual(m.data, [[1.0, 2.0], [1.5, 2.5]])
+
+    def test_error_reporting(self):
+        import io_handler
+        lines = ["1 2 3"] * 40 + ["", "4 5.5 6"] * 30
+        lines[91] = "4 x 6"
+        self.write(lines)
+        for workers in (1, 3):
+            with self.assertRaisesRegex(ValueError, "Ошибка в строке 92: '4 x 6'"):
+                io_handler.load_text_matrix(self.path, workers=workers)
+        lines[91] = "4 5"
+        self.write(lines)
+        for workers in (1, 3):
+            with self.assertRaisesRegex(ValueError, "Строка 66 имеет 2 элементов, а должно быть 3"):
+                io_handler.load_text_matrix(self.path, workers=workers)
+        self.write(["", "  "])
+        with self.assertRaisesRegex(ValueError, "Файл пуст"):
+            io_handler.load_text_matrix(self.path)
+
+
+class TestWriter(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self._dir = tempfile.TemporaryDirectory()
+        self.dir = self._dir.name
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_round_trip_formats(self):
+        import io_handler
+        m = Matrix([[0.1, 1 / 3, -2.5e-300], [1e16, 7.0, 0.0]])
+        for name in ("m.txt", "m.txt.gz", "m.txt.xz", "m.npy"):
+            path = self.dir + "/" + name
+            io_handler.write_matrix(m, path)
+            load = io_handler.load_binary if io_handler.is_binary_file(path) else io_handler.load_text_matrix
+            self.assertEqual(load(path).data, m.data)
+        rows = ([i, i * i] for i in range(600))
+        io_handler.write_matrix(rows, self.dir + "/g.txt.gz")
+        loaded = io_handler.load_text_matrix(self.dir + "/g.txt.gz")
+        self.assertEqual(loaded.data, [[i, i * i] for i in range(600)])
+
+    def test_header_and_footer(self):
+        import io_handler
+        path = self.dir + "/r.txt"
+        io_handler.write_matrix(Matrix([[1, 2], [3, 4]]).T, path, "След матрицы:", "\nСлед (trace): 5")
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), "След матрицы:\n1 3\n2 4\n\nСлед (trace): 5\n")
+        with self.assertRaisesRegex(ValueError, "только в текстовом"):
+            io_handler.write_matrix(Matrix([[1]]), self.dir + "/r.npy", header="x")
+
+    def test_failed_binary_save_keeps_file(self):
+        import os
+        import io_handler
+        from fractions import Fraction
+        path = self.dir + "/s.npy"
+        io_handler.save_binary(Matrix([[1, 2]]), path)
+        with self.assertRaisesRegex(ValueError, "Fraction"):
+            io_handler.write_matrix(Matrix([[Fraction(1, 3)]]), path)
+        self.assertEqual(io_handler.load_binary(path).data, [[1, 2]])
+        with self.assertRaises(ValueError):
+            io_handler.save_binary(Matrix([[Fraction(1, 2)]]), self.dir + "/new.npy")
+        self.assertFalse(os.path.exists(self.dir + "/new.npy"))
+
+    def test_long_integers_go_to_text(self):
+        import io
+        import io_handler
+        import server
+        from client import encode_matrix
+        m = Matrix([[2 ** 70 + 1, 1], [1, 1]])
+        with self.assertRaisesRegex(ValueError, "длинных целых"):
+            io_handler.save_binary(m, self.dir + "/big.npy")
+        entry = server._save(m, self.dir + "/big")
+        self.assertTrue(entry['path'].endswith('.txt'))
+        self.assertEqual(io_handler.load_matrix(entry['path']).data, m.data)
+        data = encode_matrix(m)
+        self.assertFalse(data.startswith(io_handler.NPY_MAGIC))
+        self.assertEqual(io_handler.read_matrix(io.BytesIO(data)).data, m.data)
+        mixed = io_handler._binary_buffer(Matrix([[2 ** 70, 0.5]]))
+        self.assertEqual(mixed.typecode, 'd')
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_jobs_and_log(self):
+        import json
+        import tempfile
+        import batch
+        import io_handler
+        with tempfile.TemporaryDirectory() as tmp:
+            a, b = tmp + "/A.txt", tmp + "/B.npy"
+            io_handler.write_matrix(Matrix([[1, 2], [3, 4]]), a)
+            io_handler.write_matrix(Matrix([[0.5, 1.0], [2.0, 3.0]]), b)
+            jobs = [{"id": "c", "op": "multiply", "inputs": [a, b], "output": tmp + "/C.npy"},
+                    {"op": "determinant", "inputs": [a]},
+                    {"op": "scalar_multiply", "inputs": [a], "scalar": 2, "output": tmp + "/S.txt"},
+                    {"op": "rank", "inputs": [a, b]}]
+            with open(tmp + "/jobs.jsonl", "w") as file:
+                file.write("\n".join(map(json.dumps, jobs)) + "\n\n{oops\n")
+            for workers in (1, 2):
+                summary = batch.run_batch(tmp + "/jobs.jsonl", tmp + "/log.jsonl", workers, chunk_size=2)
+                self.assertEqual((summary['jobs'], summary['failed']), (5, 2))
+                with open(tmp + "/log.jsonl", encoding="utf-8") as file:
+                    log = [json.loads(line) for line in file]
+                self.assertEqual([r['id'] for r in log], ["c", 2, 3, 4, 6])
+                self.assertEqual([r['status'] for r in log], ["ok", "ok", "ok", "error", "error"])
+                self.assertEqual(log[1]['result'], -2)
+                self.assertIn("нужно файлов операндов: 1", log[3]['error'])
+                self.assertIn("Ошибка в строке 6", log[4]['error'])
+                self.assertEqual(io_handler.load_matrix(tmp + "/C.npy").data, [[4.5, 7.0], [9.5, 15.0]])
+                self.assertEqual(io_handler.load_matrix(tmp + "/S.txt").data, [[2, 4], [6, 8]])
+
+
+class TestCli(unittest.TestCase):
+
+    def test_streams_and_exact_text(self):
+        import io
+        from fractions import Fraction
+        import io_handler
+        m = io_handler.read_matrix(io.BytesIO(b"1 0.5\n-3/2 4\n"))
+        self.assertEqual(m.data, [[1, Fraction(1, 2)], [Fraction(-3, 2), 4]])
+        with self.assertRaisesRegex(ValueError, "Ошибка в строке 2: '3/x 4'"):
+            io_handler.read_matrix(io.BytesIO(b"1 2\n3/x 4\n"))
+        out = io.StringIO()
+        io_handler.write_matrix(m.inverse(), out)
+        self.assertEqual(io_handler.read_matrix(io.BytesIO(out.getvalue().encode())).data, m.inverse().data)
+        raw = io.BytesIO()
+        io_handler.write_matrix(Matrix([[1.5, 2.0]]), raw, binary=True)
+        raw.seek(0)
+        self.assertEqual(io_handler.read_matrix(raw).data, [[1.5, 2.0]])
+
+    def test_pipeline(self):
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+        with tempfile.TemporaryDirectory() as tmp:
+            a = tmp + "/A.txt"
+            with open(a, "w") as file:
+                file.write("2 1\n1 1\n")
+            inverse = subprocess.run([sys.executable, main, "inverse", a, "--binary"],
+                                     capture_output=True, check=True).stdout
+            product = subprocess.run([sys.executable, main, "mul", "-", a], input=inverse,
+                                     capture_output=True, check=True).stdout
+            self.assertEqual(product, b"1 0\n0 1\n")
+            det = subprocess.run([sys.executable, main, "det"], input=b"2 1\n1 1\n", capture_output=True)
+            self.assertEqual(det.stdout, b"1\n")
+            bad = subprocess.run([sys.executable, main, "add", "-", "-"], input=b"1\n", capture_output=True)
+            self.assertEqual(bad.returncode, 1)
+            self.assertIn("Стандартный ввод", bad.stderr.decode())
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_content_hash(self):
+        import io_handler
+        import tempfile
+        a = Matrix([[1, 2], [3, 4]])
+        self.assertEqual(a.content_hash(), Matrix([[1, 2, 5], [3, 4, 6]])[:, :2].content_hash())
+        self.assertEqual(a.T.content_hash(), Matrix([[1, 3], [2, 4]]).content_hash())
+        self.assertNotEqual(a.content_hash(), Matrix([[1.0, 2.0], [3.0, 4.0]]).content_hash())
+        self.assertNotEqual(a.content_hash(), Matrix([[1, 2, 3, 4]]).content_hash())
+        with tempfile.TemporaryDirectory() as tmp:
+            io_handler.save_binary(a, tmp + "/a.npy")
+            self.assertEqual(io_handler.load_binary(tmp + "/a.npy").content_hash(), a.content_hash())
+        view = a[:, 1:]
+        before = view.content_hash()
+        a += a
+        self.assertNotEqual(view.content_hash(), before)
+
+    def test_hits_limits_and_opt_out(self):
+        from cache import ResultCache
+        cache = ResultCache(max_entries=2)
+        self.assertEqual(cache.determinant(Matrix([[1, 2], [3, 4]])), -2)
+        self.assertEqual(cache.determinant(Matrix([[1, 2], [3, 4]])), -2)
+        inv = cache.inverse(Matrix([[2.0, 0.0], [0.0, 4.0]]))
+        inv *= 0
+        self.assertEqual(cache.inverse(Matrix([[2.0, 0.0], [0.0, 4.0]])).data, [[0.5, 0.0], [0.0, 0.25]])
+        self.assertEqual(cache.stats()['hits'], 2)
+        m = Matrix([[1, 1], [1, 1.0 + 1e-11]])
+        cache.call('gaussian_elimination', m, eps=1e-12)
+        cache.call('gaussian_elimination', m, eps=1e-9)
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['entries'], stats['evictions']), (4, 2, 2))
+        cache.configure(enabled=False)
+        self.assertEqual(cache.rank(Matrix([[1, 2], [3, 4]])), 2)
+        self.assertEqual(cache.stats()['entries'], 0)
+        small = ResultCache(max_bytes=100)
+        small.inverse(Matrix([[float(i == j) for j in range(10)] for i in range(10)]))
+        self.assertEqual(small.stats()['entries'], 0)
+
+
+class TestServer(unittest.TestCase):
+
+    def test_resident_matrices_and_pipelining(self):
+        import asyncio
+        import os
+        import threading
+        from fractions import Fraction
+        from client import Client
+        from server import MatrixServer
+
+        server = MatrixServer(workers=1)
+        started = threading.Event()
+        state = {}
+
+        async def serve():
+            listener = await server.serve(port=0)
+            state['port'] = listener.sockets[0].getsockname()[1]
+            state['stop'] = asyncio.Event()
+            state['loop'] = asyncio.get_running_loop()
+            started.set()
+            async with listener:
+                await state['stop'].wait()
+
+        thread = threading.Thread(target=asyncio.run, args=(serve(),))
+        thread.start()
+        started.wait()
+        try:
+            with Client(port=state['port']) as client:
+                client.put("A", Matrix([[2, 1], [1, 3]]))
+                client.put("B", [[0.5, 1.0], [2.0, 3.0]])
+                self.assertEqual(client.call("multiply", "A", "B").data, [[3.0, 5.0], [6.5, 10.0]])
+                self.assertEqual(client.call("determinant", "A"), 5)
+                self.assertIsNone(client.call("inverse", "A", store="Ai"))
+                self.assertEqual(client.get("Ai").data[0], [Fraction(3, 5), Fraction(-1, 5)])
+                self.assertEqual(client.call("scalar_multiply", "A", scalar=2).data, [[4, 2], [2, 6]])
+                # Запросы без ожидания ответов выполняются по порядку для имени.
+                ids = [client.send("multiply", inputs=["A", "A"], store="A") for _ in range(3)]
+                ids.append(client.send("trace", inputs=["A"]))
+                results = [client.receive(i)[0] for i in ids]
+                self.assertEqual(results[-1]['result'], 29375)
+                with self.assertRaisesRegex(ValueError, "Матрица 'C' не найдена"):
+                    client.call("rank", "C")
+                with self.assertRaisesRegex(ValueError, "Неизвестная операция"):
+                    client.request("power", inputs=["A"])
+                client.delete("B")
+                self.assertEqual(client.names(), ["A", "Ai"])
+            self.assertEqual(len(os.listdir(server._dir.name)), 2)
+        finally:
+            state['loop'].call_soon_threadsafe(state['stop'].set)
+            thread.join()
+            server.close()
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy не установлен")
+class TestMatrixNumpyBackend(TestMatrixPythonBackend):
+    """Те же тесты на векторизованных ядрах NumPy."""
+    backend = "numpy"
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
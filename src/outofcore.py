@@ -0,0 +1,111 @@
+"""Умножение матриц, не помещающихся в память, по блокам.
+
+Операнды - двоичные файлы (см. ``io_handler.save_binary``), отображённые в
+память; результат записывается в такой же файл, созданный
+``io_handler.create_binary``. Произведение считается блоками t x t:
+для каждого блока результата C[I, J] накапливается сумма A[I, K] * B[K, J]
+по блокам K, где блоки операндов - представления над отображёнными
+файлами (ядра бэкенда читают их без копирования), и готовый блок сразу
+записывается в файл результата. Одновременно в памяти находятся только
+несколько блоков, поэтому их размер выбирается по заданному бюджету памяти.
+"""
+import math
+
+import io_handler
+from matrix import Matrix
+
+# Бюджет памяти по умолчанию, байт.
+MEMORY_LIMIT = 256 << 20
+# Одновременно в памяти: блоки A и B, их произведение и накопитель блока C.
+_TILES_IN_MEMORY = 4
+
+
+def tile_size(memory_limit=MEMORY_LIMIT):
+    """Размер блока t, при котором _TILES_IN_MEMORY блоков t x t из float64
+    помещаются в бюджет.
+
+    Args:
+        memory_limit (int, optional): Бюджет памяти в байтах.
+
+    Returns:
+        int: Размер блока (не меньше 1).
+
+    Raises:
+        ValueError: Если бюджет не положительный.
+    """
+    if memory_limit <= 0:
+        raise ValueError("Бюджет памяти должен быть положительным")
+    return max(1, math.isqrt(memory_limit // (8 * _TILES_IN_MEMORY)))
+
+
+def _operand(value):
+    if isinstance(value, Matrix):
+        return value
+    if not io_handler.is_binary_file(value):
+        raise ValueError(f"Файл '{value}' не в двоичном формате, "
+                         f"преобразуйте его io_handler.text_to_binary")
+    return io_handler.load_binary(value)
+
+
+def _is_integer(matrix):
+    buf = matrix._layout()[0]
+    if isinstance(buf, memoryview):
+        return buf.format == 'q'
+    return isinstance(buf, list) and all(type(x) is int for x in matrix._buf)
+
+
+def tiled_matmul(a, b, out_path, memory_limit=MEMORY_LIMIT, tile=None, progress=None):
+    """Вычисляет A * B блоками и записывает результат в двоичный файл.
+
+    Если обе матрицы целые, результат хранится в int64 и считается точно,
+    иначе - во float64. Бюджет считается для float64 (8 байт на элемент);
+    на бэкенде чистого Python блоки занимают в памяти в несколько раз
+    больше, поэтому бюджет стоит уменьшить.
+
+    Args:
+        a (str или Matrix): Левый множитель: имя двоичного файла или матрица.
+        b (str или Matrix): Правый множитель.
+        out_path (str): Файл результата (перезаписывается).
+        memory_limit (int, optional): Бюджет памяти в байтах, определяет
+            размер блока. По умолчанию MEMORY_LIMIT.
+        tile (int, optional): Размер блока; если задан, бюджет не
+            используется.
+        progress (callable, optional): Вызывается как progress(done, total)
+            после каждого готового блока результата.
+
+    Returns:
+        Matrix: Результат над отображённым файлом out_path.
+
+    Raises:
+        ValueError: Если файл операнда не двоичный, размеры не согласованы
+            или целый результат не помещается в int64.
+    """
+    A, B = _operand(a), _operand(b)
+    if A.cols != B.rows:
+        raise ValueError(f"Нельзя умножить матрицы таких размеров: {A.cols} столбцов != {B.rows} строк")
+    n, m, p = A.rows, A.cols, B.cols
+    t = tile or tile_size(memory_limit)
+    integer = _is_integer(A) and _is_integer(B)
+    C = io_handler.create_binary(out_path, n, p, integer=integer)
+    total = -(-n // t) * -(-p // t)
+    done = 0
+    for i0 in range(0, n, t):
+        i1 = min(i0 + t, n)
+        for j0 in range(0, p, t):
+            j1 = min(j0 + t, p)
+            acc = None
+            for k0 in range(0, m, t):
+                k1 = min(k0 + t, m)
+                product = A[i0:i1, k0:k1].matmul(B[k0:k1, j0:j1], algorithm="standard")
+                if acc is None:
+                    acc = product
+                else:
+                    acc += product
+            try:
+                C[i0:i1, j0:j1]._store(acc._buf)
+            except OverflowError:
+                raise ValueError("Целый результат не помещается в int64")
+            done += 1
+            if progress is not None:
+                progress(done, total)
+    return C
@@ -0,0 +1,150 @@
+"""Параллельное умножение матриц в нескольких процессах.
+
+Операнды один раз копируются в ``multiprocessing.shared_memory``, задачи
+получают только имена сегментов и диапазон строк результата, а каждый
+процесс пишет свой блок строк прямо в общий буфер результата.
+"""
+import atexit
+import os
+from array import array
+
+import backend
+from strided import StridedBuffer
+
+# concurrent.futures и multiprocessing импортируются при первом
+# использовании пула: их загрузка заметно удлиняет запуск программы, а
+# большинству вызовов (например, одной операции из командной строки)
+# пул не нужен.
+
+_executor = None
+_executor_workers = 0
+
+
+def get_pool(workers=None):
+    """Возвращает постоянный пул процессов.
+
+    Пул создаётся при первом вызове и пересоздаётся только при изменении
+    количества процессов.
+
+    Args:
+        workers (int, optional): Количество процессов. По умолчанию
+            os.cpu_count().
+
+    Returns:
+        ProcessPoolExecutor: Пул процессов.
+    """
+    global _executor, _executor_workers
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    if _executor is None or _executor_workers != workers:
+        shutdown_pool()
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown_pool():
+    """Останавливает пул процессов, если он был создан."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+        _executor_workers = 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _is_float(buf):
+    """Проверяет, что элементы буфера - float и переносятся в общую
+    память float64 без потери точности (целые туда не попадают)."""
+    if isinstance(buf, StridedBuffer):
+        buf = buf.base
+    if isinstance(buf, memoryview):
+        return buf.format == 'd'
+    if isinstance(buf, array):
+        return buf.typecode == 'd'
+    return all(type(x) is float for x in buf)
+
+
+def _to_shared(buf):
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(len(buf), 1) * 8)
+    try:
+        with shm.buf.cast('d') as view:
+            view[:len(buf)] = buf
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm
+
+
+def _matmul_block(names, m, p, r0, r1):
+    """Считает строки r0..r1 результата в процессе пула."""
+    from multiprocessing import shared_memory
+
+    segments = [shared_memory.SharedMemory(name=name) for name in names]
+    views = [shm.buf.cast('d') for shm in segments]
+    try:
+        a, b, c = views
+        block = backend.get_backend().matmul(a[r0 * m:r1 * m], b[:m * p], r1 - r0, m, p)
+        c[r0 * p:r1 * p] = block if isinstance(block, array) else array('d', block)
+    finally:
+        for view in views:
+            view.release()
+        for shm in segments:
+            shm.close()
+
+
+def parallel_matmul(a, b, n, m, p, workers=None, block_rows=None):
+    """Умножение матриц n x m и m x p в пуле процессов.
+
+    Args:
+        a, b: Плоские буферы операндов.
+        n, m, p (int): Размеры операндов.
+        workers (int, optional): Количество процессов. По умолчанию
+            os.cpu_count().
+        block_rows (int, optional): Количество строк результата в одной
+            задаче. По умолчанию строки делятся примерно на 4 задачи
+            на процесс.
+
+    Returns:
+        Плоский буфер произведения n x p. Если не все элементы - float
+        (целые, Fraction), умножение выполняется в текущем процессе, чтобы
+        результат остался точным.
+    """
+    workers = workers or os.cpu_count() or 1
+    if not (_is_float(a) and _is_float(b)):
+        return backend.get_backend().matmul(a, b, n, m, p)
+    a = a if isinstance(a, array) else array('d', a)
+    b = b if isinstance(b, array) else array('d', b)
+    if workers == 1 or n == 1:
+        return backend.get_backend().matmul(a, b, n, m, p)
+    if block_rows is None:
+        block_rows = max(1, -(-n // (workers * 4)))
+    from multiprocessing import shared_memory
+
+    # Сегменты добавляются по одному, чтобы при ошибке создания следующего
+    # уже созданные были освобождены.
+    segments = []
+    try:
+        segments.append(_to_shared(a))
+        segments.append(_to_shared(b))
+        segments.append(shared_memory.SharedMemory(create=True, size=max(n * p, 1) * 8))
+        names = [shm.name for shm in segments]
+        pool = get_pool(workers)
+        futures = [pool.submit(_matmul_block, names, m, p, r0, min(r0 + block_rows, n))
+                   for r0 in range(0, n, block_rows)]
+        for future in futures:
+            future.result()
+        result = array('d')
+        with segments[2].buf[:n * p * 8] as raw:
+            result.frombytes(raw)
+        return result
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,357 @@
+"""Сервер вычислений над матрицами: asyncio и пул процессов.
+
+Сервер слушает TCP-порт на localhost и принимает кадры
+``HEADER`` (длина JSON, длина данных) + JSON запроса + данные. Запрос::
+
+    {"id": 1, "op": "put", "name": "A"}                  + матрица (.npy или текст)
+    {"id": 2, "op": "multiply", "inputs": ["A", "B"], "store": "C"}
+    {"id": 3, "op": "determinant", "inputs": ["C"]}
+    {"id": 4, "op": "get", "name": "C"}
+
+Операции - как в меню калькулятора (``batch.OPERATIONS``: add, subtract,
+multiply, scalar_multiply с полем scalar, transpose, determinant, inverse,
+trace, rank, solve), а также put, get, delete, list и ping. Ответ - кадр
+с JSON ``{"id", "status": "ok" | "error", ...}``: числовой результат в
+поле result, размер матрицы в rows и cols, а сама матрица - в данных
+кадра (для put и операций с store данные не возвращаются).
+
+Именованные матрицы хранятся на сервере в двоичных файлах (матрицы из
+Fraction - в текстовых) во временном каталоге. Каждая версия матрицы -
+новый неизменяемый файл, поэтому процессы пула отображают его в память и
+кэшируют загруженные матрицы (вместе с их разложениями), а повторная
+операция над тем же операндом обходится без передачи и разбора данных.
+
+Соединение остаётся открытым для последовательности запросов, запросы
+можно отправлять не дожидаясь ответов: каждый выполняется отдельной
+задачей, ответы приходят по мере готовности, их сопоставляют по id.
+Порядок запросов сохраняется для имён: операция над A видит результат
+всех put и store в A, отправленных раньше неё по любому соединению.
+
+Запуск:
+    python src/server.py --port 8765 --workers 8
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import struct
+import tempfile
+import time
+from collections import Counter
+
+import io_handler
+from batch import OPERATIONS, _json_value
+from matrix import Matrix
+from parallel import get_pool
+
+# Заголовок кадра: длина JSON и длина данных, беззнаковые 32 бита.
+HEADER = struct.Struct('>II')
+MAX_FRAME = 1 << 31
+PORT = 8765
+
+# Загруженные матрицы в процессе пула: путь -> Matrix. Файлы неизменяемы,
+# поэтому запись кэша не устаревает; вытесняются самые старые.
+_matrices = {}
+_CACHED_FILES = 64
+
+
+def encode_frame(message, payload=b""):
+    """Кадр протокола из JSON-сообщения и двоичных данных."""
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    return HEADER.pack(len(body), len(payload)) + body + payload
+
+
+def _load(path):
+    matrix = _matrices.get(path)
+    if matrix is None:
+        matrix = io_handler.load_matrix(path, workers=1)
+        if len(_matrices) >= _CACHED_FILES:
+            del _matrices[next(iter(_matrices))]
+        _matrices[path] = matrix
+    return matrix
+
+
+def _save(matrix, base):
+    """Сохраняет матрицу в base.npy, а если она не помещается в двоичный
+    формат (Fraction, длинные целые) - в base.txt."""
+    path = base + '.npy'
+    try:
+        io_handler.save_binary(matrix, path)
+    except ValueError:
+        path = base + '.txt'
+        io_handler.write_matrix(matrix, path)
+    return {'path': path, 'rows': matrix.rows, 'cols': matrix.cols}
+
+
+def _put(data, base):
+    """Разбирает присланную матрицу и сохраняет её (в процессе пула)."""
+    import io
+
+    return _save(io_handler.read_matrix(io.BytesIO(data)), base)
+
+
+def _compute(op, paths, scalar, base):
+    """Выполняет операцию над сохранёнными матрицами (в процессе пула)."""
+    start = time.perf_counter()
+    result = OPERATIONS[op][1](*[_load(path) for path in paths], {'scalar': scalar})
+    seconds = time.perf_counter() - start
+    if isinstance(result, Matrix):
+        entry = _save(result, base)
+    else:
+        entry = _save(Matrix([[result]]), base)
+        entry['result'] = _json_value(result)
+    entry['seconds'] = round(seconds, 6)
+    return entry
+
+
+def _read_file(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+async def _value(value):
+    return value
+
+
+async def _failed(error):
+    raise error
+
+
+def _name(value):
+    if not isinstance(value, str):
+        raise ValueError("Имя матрицы должно быть строкой")
+    return value
+
+
+class MatrixServer:
+    """Сервер с именованными матрицами и пулом процессов для вычислений.
+
+    Attributes:
+        names (dict): Имя -> задача, результат которой - описание файла
+            матрицы (path, rows, cols).
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int, optional): Количество процессов пула. По умолчанию
+                os.cpu_count().
+        """
+        self.names = {}
+        self._pool = get_pool(workers)
+        self._dir = tempfile.TemporaryDirectory(prefix="matrix-server-")
+        self._counter = itertools.count()
+        # Сколько выполняющихся запросов читают файл задачи; файлы
+        # заменённых и удалённых матриц удаляются, когда их никто не читает.
+        self._readers = Counter()
+        self._retired = set()
+
+    def _base(self):
+        return os.path.join(self._dir.name, str(next(self._counter)))
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def _read(self, path):
+        return await asyncio.get_running_loop().run_in_executor(None, _read_file, path)
+
+    def _bind(self, name, coro):
+        """Связывает имя с задачей, которая вычисляет новую версию матрицы."""
+        task = asyncio.ensure_future(coro)
+        old = self.names.get(name)
+        self.names[name] = task
+        if old is not None:
+            self._retire(old)
+
+        def forget(task):
+            # Неудачная версия не остаётся под именем: следующие запросы
+            # получат ошибку «не найдена».
+            if not task.cancelled() and task.exception() is not None and self.names.get(name) is task:
+                del self.names[name]
+
+        task.add_done_callback(forget)
+        return task
+
+    def _acquire(self, names):
+        tasks = []
+        for name in names:
+            if name not in self.names:
+                raise ValueError(f"Матрица '{name}' не найдена")
+            tasks.append(self.names[name])
+        self._readers.update(tasks)
+        return tasks
+
+    def _release(self, tasks):
+        self._readers.subtract(tasks)
+        for task in set(tasks):
+            if self._readers[task] <= 0:
+                del self._readers[task]
+                if task in self._retired:
+                    self._retired.discard(task)
+                    self._remove(task)
+
+    def _retire(self, task):
+        if self._readers[task]:
+            self._retired.add(task)
+        else:
+            self._remove(task)
+
+    @staticmethod
+    def _remove(task):
+        def remove(task):
+            if not task.cancelled() and task.exception() is None:
+                os.remove(task.result()['path'])
+        if task.done():
+            remove(task)
+        else:
+            task.add_done_callback(remove)
+
+    async def _operation(self, op, tasks, scalar, base, send):
+        try:
+            paths = [(await task)['path'] for task in tasks]
+            entry = await self._run(_compute, op, paths, scalar, base)
+        finally:
+            self._release(tasks)
+        if send:
+            # Результат без имени возвращается в ответе и на сервере не хранится.
+            if 'result' not in entry:
+                entry['payload'] = await self._read(entry['path'])
+            os.remove(entry['path'])
+        return entry
+
+    async def _get(self, tasks):
+        try:
+            entry = await tasks[0]
+            return {'rows': entry['rows'], 'cols': entry['cols'],
+                    'payload': await self._read(entry['path'])}
+        finally:
+            self._release(tasks)
+
+    def start(self, request, payload):
+        """Начинает выполнение запроса.
+
+        Вызывается синхронно в порядке поступления запросов, поэтому связи
+        имён меняются в том же порядке; само вычисление идёт в задаче.
+
+        Returns:
+            awaitable: Описание результата (rows, cols, result, seconds)
+                и, если матрицу нужно вернуть, её данные в payload.
+
+        Raises:
+            ValueError: Если запрос некорректен или матрица не найдена.
+        """
+        op = request.get('op')
+        if op == 'ping':
+            return _value({})
+        if op == 'list':
+            return _value({'names': sorted(self.names)})
+        if op == 'put':
+            name = _name(request.get('name'))
+            return self._bind(name, self._run(_put, payload, self._base()))
+        if op == 'get':
+            return self._get(self._acquire([request.get('name')]))
+        if op == 'delete':
+            name = request.get('name')
+            if name not in self.names:
+                raise ValueError(f"Матрица '{name}' не найдена")
+            self._retire(self.names.pop(name))
+            return _value({})
+        if op not in OPERATIONS:
+            raise ValueError(f"Неизвестная операция '{op}'")
+        inputs = request.get('inputs')
+        if not isinstance(inputs, list) or len(inputs) != OPERATIONS[op][0]:
+            raise ValueError(f"Операции '{op}' нужно матриц: {OPERATIONS[op][0]}")
+        store = request.get('store')
+        if store is not None:
+            _name(store)
+        coro = self._operation(op, self._acquire(inputs), request.get('scalar'),
+                               self._base(), store is None)
+        return coro if store is None else self._bind(store, coro)
+
+    async def _respond(self, writer, request_id, work):
+        message = {'id': request_id}
+        payload = b""
+        try:
+            entry = await work
+            message['status'] = 'ok'
+            message.update((k, v) for k, v in entry.items() if k not in ('path', 'payload'))
+            payload = entry.get('payload', b"")
+        except Exception as e:
+            message.update(status='error', error=str(e) or type(e).__name__)
+        writer.write(encode_frame(message, payload))
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        """Обслуживает одно соединение: читает запросы, пока клиент его
+        не закроет."""
+        pending = set()
+        try:
+            while True:
+                try:
+                    head = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                size, data_size = HEADER.unpack(head)
+                if size + data_size > MAX_FRAME:
+                    break
+                body = await reader.readexactly(size)
+                payload = await reader.readexactly(data_size)
+                request = {}
+                try:
+                    request = json.loads(body)
+                    if not isinstance(request, dict):
+                        raise ValueError("Запрос должен быть объектом JSON")
+                    work = self.start(request, payload)
+                except Exception as e:
+                    request = request if isinstance(request, dict) else {}
+                    work = _failed(e)
+                task = asyncio.ensure_future(self._respond(writer, request.get('id'), work))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=PORT):
+        """Запускает приём соединений.
+
+        Returns:
+            asyncio.Server: Сервер (порт 0 - любой свободный, см.
+                server.sockets[0].getsockname()).
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        """Удаляет файлы именованных матриц."""
+        self._dir.cleanup()
+
+
+async def _main(args):
+    server = MatrixServer(args.workers)
+    try:
+        listener = await server.serve(args.host, args.port)
+        print(f"Сервер матриц слушает {args.host}:{listener.sockets[0].getsockname()[1]}")
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер вычислений над матрицами")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="количество процессов (по умолчанию - число ядер)")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+import heapq
+from array import array
+from operator import mul
+
+from matrix import Matrix, _pack
+
+
+class SparseMatrix:
+    """Разреженная матрица в формате CSR (сжатые строки).
+
+    Хранит только ненулевые элементы, поэтому память и время операций
+    растут с количеством ненулевых элементов, а не с rows * cols.
+
+    Attributes:
+        rows (int): Количество строк.
+        cols (int): Количество столбцов.
+        indptr (array): Начало каждой строки в indices/values (rows + 1).
+        indices (array): Номера столбцов ненулевых элементов по строкам.
+        values: Значения ненулевых элементов (array('d') или list).
+    """
+    __slots__ = ('rows', 'cols', 'indptr', 'indices', 'values', '_factor')
+
+    def __init__(self, rows, cols, indptr, indices, values):
+        """Создаёт матрицу из готовых массивов CSR.
+
+        Args:
+            rows (int): Количество строк.
+            cols (int): Количество столбцов.
+            indptr (iterable[int]): rows + 1 смещений начала строк.
+            indices (iterable[int]): Номера столбцов, по возрастанию
+                внутри каждой строки.
+            values (iterable): Значения элементов.
+
+        Raises:
+            ValueError: Если размеры не положительны или массивы
+                не согласованы.
+        """
+        if rows <= 0 or cols <= 0:
+            raise ValueError("Размеры матрицы должны быть положительными")
+        self.rows = rows
+        self.cols = cols
+        self.indptr = array('q', indptr)
+        self.indices = array('q', indices)
+        self.values = _pack(list(values))
+        if len(self.indptr) != rows + 1 or self.indptr[-1] != len(self.indices) \
+                or len(self.indices) != len(self.values):
+            raise ValueError("Несогласованные массивы CSR")
+        self._factor = None
+
+    @classmethod
+    def _from_rows(cls, rows, cols, row_dicts):
+        """Собирает CSR из списка словарей {столбец: значение} по строкам."""
+        indptr = [0]
+        indices = []
+        values = []
+        for row in row_dicts:
+            for j in sorted(row):
+                v = row[j]
+                if v:
+                    indices.append(j)
+                    values.append(v)
+            indptr.append(len(indices))
+        return cls(rows, cols, indptr, indices, values)
+
+    @classmethod
+    def from_coo(cls, rows, cols, entries):
+        """Создаёт матрицу из троек (строка, столбец, значение).
+
+        Повторяющиеся позиции суммируются.
+
+        Args:
+            rows (int): Количество строк.
+            cols (int): Количество столбцов.
+            entries (iterable[tuple[int, int, float]]): Ненулевые элементы.
+
+        Returns:
+            SparseMatrix: Новая матрица.
+
+        Raises:
+            ValueError: Если индекс выходит за пределы матрицы.
+        """
+        row_dicts = [{} for _ in range(rows)]
+        for i, j, v in entries:
+            if not (0 <= i < rows and 0 <= j < cols):
+                raise ValueError(f"Элемент ({i}, {j}) вне матрицы {rows}x{cols}")
+            row = row_dicts[i]
+            row[j] = row.get(j, 0) + v
+        return cls._from_rows(rows, cols, row_dicts)
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """Создаёт разреженную матрицу из Matrix или списка списков.
+
+        Args:
+            matrix (Matrix или list[list[float]]): Плотная матрица.
+
+        Returns:
+            SparseMatrix: Матрица из ненулевых элементов исходной.
+        """
+        if not isinstance(matrix, Matrix):
+            matrix = Matrix(matrix)
+        buf, c = matrix._buf, matrix.cols
+        indptr = [0]
+        indices = []
+        values = []
+        for i in range(matrix.rows):
+            for j, v in enumerate(buf[i * c:(i + 1) * c]):
+                if v:
+                    indices.append(j)
+                    values.append(v)
+            indptr.append(len(indices))
+        return cls(matrix.rows, c, indptr, indices, values)
+
+    def to_dense(self):
+        """Преобразует в плотную матрицу.
+
+        Returns:
+            Matrix: Плотная матрица с теми же элементами.
+        """
+        result = [0] * (self.rows * self.cols)
+        for i in range(self.rows):
+            base = i * self.cols
+            for j, v in self._row_items(i):
+                result[base + j] = v
+        return Matrix._from_flat(self.rows, self.cols, result)
+
+    @property
+    def nnz(self):
+        """int: Количество хранимых ненулевых элементов."""
+        return len(self.values)
+
+    def _row_items(self, i):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[start:end], self.values[start:end])
+
+    def _row_dict(self, i):
+        return dict(self._row_items(i))
+
+    def _combine(self, other, sign):
+        row_dicts = []
+        for i in range(self.rows):
+            acc = self._row_dict(i)
+            for j, v in other._row_items(i):
+                acc[j] = acc.get(j, 0) + sign * v
+            row_dicts.append(acc)
+        return SparseMatrix._from_rows(self.rows, self.cols, row_dicts)
+
+    def __add__(self, other):
+        """Сложение с разреженной или плотной матрицей.
+
+        Args:
+            other (SparseMatrix или Matrix): Слагаемое.
+
+        Returns:
+            SparseMatrix для разреженного слагаемого, Matrix для плотного.
+
+        Raises:
+            ValueError: Если размеры матриц не совпадают.
+        """
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Сложение определено только для матриц одинаковых размеров")
+        if isinstance(other, Matrix):
+            return self.to_dense() + other
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        """Вычитание разреженной или плотной матрицы.
+
+        Args:
+            other (SparseMatrix или Matrix): Вычитаемое.
+
+        Returns:
+            SparseMatrix для разреженного вычитаемого, Matrix для плотного.
+
+        Raises:
+            ValueError: Если размеры матриц не совпадают.
+        """
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Вычитание определено только для матриц одинаковых размеров")
+        if isinstance(other, Matrix):
+            return self.to_dense() - other
+        return self._combine(other, -1)
+
+    def __radd__(self, other):
+        """Сложение плотной матрицы с разреженной (Matrix + SparseMatrix)."""
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self + other
+
+    def __rsub__(self, other):
+        """Вычитание разреженной матрицы из плотной (Matrix - SparseMatrix)."""
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Вычитание определено только для матриц одинаковых размеров")
+        return other - self.to_dense()
+
+    def __mul__(self, other):
+        """Умножение на число, разреженную или плотную матрицу.
+
+        Args:
+            other (int, float, SparseMatrix или Matrix): Множитель.
+
+        Returns:
+            SparseMatrix при умножении на число или разреженную матрицу,
+            Matrix при умножении на плотную.
+
+        Raises:
+            ValueError: Если количество столбцов первой матрицы не равно
+                количеству строк второй.
+        """
+        if isinstance(other, (int, float)):
+            if not other:
+                return SparseMatrix(self.rows, self.cols, [0] * (self.rows + 1), [], [])
+            return SparseMatrix(self.rows, self.cols, self.indptr, self.indices,
+                                [v * other for v in self.values])
+        if self.cols != other.rows:
+            raise ValueError(f"Нельзя умножить матрицы таких размеров: {self.cols} столбцов != {other.rows} строк")
+        if isinstance(other, Matrix):
+            p = other.cols
+            b = other._buf
+            result = []
+            for i in range(self.rows):
+                acc = [0] * p
+                for k, v in self._row_items(i):
+                    acc = [x + v * y for x, y in zip(acc, b[k * p:(k + 1) * p])]
+                result.extend(acc)
+            return Matrix._from_flat(self.rows, p, result)
+        row_dicts = []
+        for i in range(self.rows):
+            acc = {}
+            for k, v in self._row_items(i):
+                for j, w in other._row_items(k):
+                    acc[j] = acc.get(j, 0) + v * w
+            row_dicts.append(acc)
+        return SparseMatrix._from_rows(self.rows, other.cols, row_dicts)
+
+    def __rmul__(self, other):
+        """Умножение числа или плотной матрицы слева на разреженную."""
+        if isinstance(other, (int, float)):
+            return self * other
+        if isinstance(other, Matrix):
+            if other.cols != self.rows:
+                raise ValueError(f"Нельзя умножить матрицы таких размеров: {other.cols} столбцов != {self.rows} строк")
+            p = self.cols
+            a = other._buf
+            result = []
+            for i in range(other.rows):
+                acc = [0] * p
+                for k, x in enumerate(a[i * other.cols:(i + 1) * other.cols]):
+                    if x:
+                        for j, v in self._row_items(k):
+                            acc[j] += x * v
+                result.extend(acc)
+            return Matrix._from_flat(other.rows, p, result)
+        return NotImplemented
+
+    def matvec(self, x):
+        """Умножает матрицу на вектор за O(nnz).
+
+        Args:
+            x (list[float]): Вектор длины cols.
+
+        Returns:
+            list[float]: Вектор длины rows.
+        """
+        indptr, indices, values = self.indptr, self.indices, self.values
+        products = list(map(mul, values, map(x.__getitem__, indices)))
+        return [sum(products[indptr[i]:indptr[i + 1]]) for i in range(self.rows)]
+
+    def transpose(self):
+        """Транспонирует матрицу за O(nnz).
+
+        Returns:
+            SparseMatrix: Транспонированная матрица.
+        """
+        counts = [0] * (self.cols + 1)
+        for j in self.indices:
+            counts[j + 1] += 1
+        for j in range(self.cols):
+            counts[j + 1] += counts[j]
+        indptr = counts[:]
+        indices = [0] * self.nnz
+        values = [0] * self.nnz
+        for i in range(self.rows):
+            for j, v in self._row_items(i):
+                pos = counts[j]
+                indices[pos] = i
+                values[pos] = v
+                counts[j] += 1
+        return SparseMatrix(self.cols, self.rows, indptr, indices, values)
+
+    def factor(self):
+        """Возвращает кэшированное разреженное разложение матрицы.
+
+        Returns:
+            SparseLU: Разложение с упорядочиванием Марковица.
+        """
+        if self._factor is None:
+            self._factor = SparseLU(self)
+        return self._factor
+
+    def determinant(self):
+        """Вычисляет определитель разреженным исключением.
+
+        Returns:
+            float: Значение определителя.
+
+        Raises:
+            ValueError: Если матрица не квадратная.
+        """
+        if self.rows != self.cols:
+            raise ValueError("Определитель существует только у квадратных матриц")
+        return self.factor().determinant()
+
+    def rank(self):
+        """Вычисляет ранг матрицы разреженным исключением.
+
+        Returns:
+            int: Ранг матрицы.
+        """
+        return self.factor().rank
+
+    def solve_system(self, b):
+        """Решает систему Ax = b разреженным исключением.
+
+        Свободные переменные (если они есть) полагаются равными нулю.
+
+        Args:
+            b (list[float]): Вектор свободных членов.
+
+        Returns:
+            list[float]: Вектор решения системы.
+
+        Raises:
+            ValueError: Если размерность вектора b не соответствует матрице,
+                или система несовместна.
+        """
+        if self.rows != len(b):
+            raise ValueError("Размерность вектора b не соответствует матрице A")
+        return self.factor().solve(b)
+
+
+def _parity(order):
+    """Чётность перестановки (0 или 1), заданной списком позиций."""
+    seen = [False] * len(order)
+    parity = 0
+    for start in range(len(order)):
+        length = 0
+        k = start
+        while not seen[k]:
+            seen[k] = True
+            k = order[k]
+            length += 1
+        if length:
+            parity ^= (length - 1) & 1
+    return parity
+
+
+class SparseLU:
+    """Разреженное исключение Гаусса с упорядочиванием Марковица.
+
+    На каждом шаге ведущим выбирается столбец с наименьшим числом
+    ненулевых элементов, а в нём - самая короткая строка среди элементов,
+    не меньших threshold от максимального по модулю. Это уменьшает
+    заполнение (fill-in) и сохраняет устойчивость.
+
+    Attributes:
+        rank (int): Количество ведущих элементов.
+        steps (list[tuple]): Шаги исключения (строка, столбец, ведущий
+            элемент, строка U, множители).
+    """
+    def __init__(self, matrix, eps=1e-12, threshold=0.1):
+        """Выполняет разложение.
+
+        Args:
+            matrix (SparseMatrix): Раскладываемая матрица.
+            eps (float, optional): Элементы с модулем не больше eps
+                считаются нулевыми. По умолчанию 1e-12.
+            threshold (float, optional): Порог относительной величины
+                ведущего элемента. По умолчанию 0.1.
+        """
+        self.rows = matrix.rows
+        self.cols = matrix.cols
+        self.eps = eps
+        rows = [matrix._row_dict(i) for i in range(self.rows)]
+        col_rows = [set() for _ in range(self.cols)]
+        for i, row in enumerate(rows):
+            for j in row:
+                col_rows[j].add(i)
+        heap = [(len(r), j) for j, r in enumerate(col_rows)]
+        heapq.heapify(heap)
+        done = [False] * self.cols
+        steps = []
+
+        while heap:
+            count, c = heapq.heappop(heap)
+            if done[c] or count != len(col_rows[c]):
+                continue
+            done[c] = True
+            candidates = col_rows[c]
+            largest = max((abs(rows[k][c]) for k in candidates), default=0)
+            if largest <= eps:
+                continue
+            r = min((k for k in candidates if abs(rows[k][c]) >= threshold * largest),
+                    key=lambda k: len(rows[k]))
+
+            prow = rows[r]
+            pivot = prow[c]
+            for j in prow:
+                col_rows[j].discard(r)
+            multipliers = []
+            for k in list(candidates):
+                krow = rows[k]
+                factor = krow.pop(c) / pivot
+                candidates.discard(k)
+                for j, v in prow.items():
+                    if j == c or done[j]:
+                        continue
+                    new = krow.get(j, 0) - factor * v
+                    if abs(new) <= eps:
+                        if j in krow:
+                            del krow[j]
+                            col_rows[j].discard(k)
+                    else:
+                        if j not in krow:
+                            col_rows[j].add(k)
+                        krow[j] = new
+                multipliers.append((k, factor))
+            for j in prow:
+                if not done[j]:
+                    heapq.heappush(heap, (len(col_rows[j]), j))
+            steps.append((r, c, pivot, prow, multipliers))
+
+        self.steps = steps
+        self.rank = len(steps)
+
+    def determinant(self):
+        """Определитель квадратной матрицы.
+
+        Returns:
+            float: Произведение ведущих элементов со знаком перестановок;
+                0.0, если ранг меньше размера.
+        """
+        n = self.rows
+        if self.rank < n:
+            return 0.0
+        det = 1.0
+        for _, _, pivot, _, _ in self.steps:
+            det *= pivot
+        row_order = [r for r, _, _, _, _ in self.steps]
+        col_order = [c for _, c, _, _, _ in self.steps]
+        if _parity(row_order) ^ _parity(col_order):
+            det = -det
+        return det
+
+    def solve(self, b):
+        """Находит частное решение Ax = b (свободные переменные равны 0).
+
+        Args:
+            b (list[float]): Вектор свободных членов длины rows.
+
+        Returns:
+            list[float]: Вектор решения длины cols.
+
+        Raises:
+            ValueError: Если система несовместна.
+        """
+        y = [float(v) for v in b]
+        for r, _, _, _, multipliers in self.steps:
+            yr = y[r]
+            if yr:
+                for k, factor in multipliers:
+                    y[k] -= factor * yr
+        pivot_rows = {r for r, _, _, _, _ in self.steps}
+        tol = self.eps * max(1.0, max(abs(v) for v in b))
+        for i in range(self.rows):
+            if i not in pivot_rows and abs(y[i]) > tol:
+                raise ValueError("Система несовместна")
+        x = [0.0] * self.cols
+        for r, c, pivot, prow, _ in reversed(self.steps):
+            s = y[r]
+            for j, v in prow.items():
+                if j != c:
+                    s -= v * x[j]
+            x[c] = s / pivot
+        return x
@@ -0,0 +1,121 @@
+"""Умножение матриц по схеме Штрассена-Винограда над плоскими буферами.
+
+Все вспомогательные функции сохраняют тип буфера (list или array('d')),
+чтобы векторизованные ядра бэкенда продолжали работать без копирований.
+"""
+from strided import empty_like
+
+
+def _split(buf, rows, cols):
+    """Делит плоский буфер rows x cols (оба чётные) на четыре блока."""
+    h, w = rows // 2, cols // 2
+    q11, q12, q21, q22 = (empty_like(buf) for _ in range(4))
+    for r in range(h):
+        base = r * cols
+        q11.extend(buf[base:base + w])
+        q12.extend(buf[base + w:base + cols])
+    for r in range(h, rows):
+        base = r * cols
+        q21.extend(buf[base:base + w])
+        q22.extend(buf[base + w:base + cols])
+    return q11, q12, q21, q22
+
+
+def _join(c11, c12, c21, c22, h, w):
+    """Собирает буфер 2h x 2w из четырёх блоков h x w."""
+    result = c11[:0]
+    for r in range(h):
+        result.extend(c11[r * w:(r + 1) * w])
+        result.extend(c12[r * w:(r + 1) * w])
+    for r in range(h):
+        result.extend(c21[r * w:(r + 1) * w])
+        result.extend(c22[r * w:(r + 1) * w])
+    return result
+
+
+def _pad(buf, rows, cols, new_rows, new_cols):
+    """Дополняет буфер нулями справа и снизу до new_rows x new_cols."""
+    if rows == new_rows and cols == new_cols:
+        return buf
+    result = empty_like(buf)
+    tail = [0] * (new_cols - cols)
+    for r in range(rows):
+        result.extend(buf[r * cols:(r + 1) * cols])
+        result.extend(tail)
+    result.extend([0] * ((new_rows - rows) * new_cols))
+    return result
+
+
+def _crop(buf, cols, new_rows, new_cols):
+    """Вырезает левый верхний блок new_rows x new_cols."""
+    if cols == new_cols:
+        return buf[:new_rows * new_cols]
+    result = empty_like(buf)
+    for r in range(new_rows):
+        result.extend(buf[r * cols:r * cols + new_cols])
+    return result
+
+
+def _winograd(kernels, a, b, n, m, p, depth):
+    if depth == 0:
+        return kernels.matmul(a, b, n, m, p)
+    add, sub = kernels.add, kernels.sub
+    h, k, w = n // 2, m // 2, p // 2
+    a11, a12, a21, a22 = _split(a, n, m)
+    b11, b12, b21, b22 = _split(b, m, p)
+
+    s1 = add(a21, a22)
+    s2 = sub(s1, a11)
+    s3 = sub(a11, a21)
+    s4 = sub(a12, s2)
+    t1 = sub(b12, b11)
+    t2 = sub(b22, t1)
+    t3 = sub(b22, b12)
+    t4 = sub(t2, b21)
+
+    depth -= 1
+    m1 = _winograd(kernels, a11, b11, h, k, w, depth)
+    m2 = _winograd(kernels, a12, b21, h, k, w, depth)
+    m3 = _winograd(kernels, s4, b22, h, k, w, depth)
+    m4 = _winograd(kernels, a22, t4, h, k, w, depth)
+    m5 = _winograd(kernels, s1, t1, h, k, w, depth)
+    m6 = _winograd(kernels, s2, t2, h, k, w, depth)
+    m7 = _winograd(kernels, s3, t3, h, k, w, depth)
+
+    u2 = add(m1, m6)
+    u3 = add(u2, m7)
+    u4 = add(u2, m5)
+    c11 = add(m1, m2)
+    c12 = add(u4, m3)
+    c21 = sub(u3, m4)
+    c22 = add(u3, m5)
+    return _join(c11, c12, c21, c22, h, w)
+
+
+def strassen_matmul(kernels, a, b, n, m, p, crossover):
+    """Умножение матриц по схеме Штрассена-Винограда.
+
+    Блоки делятся пополам, пока наименьший из размеров больше crossover,
+    после чего используется стандартное ядро бэкенда. Размеры, не делящиеся
+    на нужную степень двойки, и прямоугольные матрицы дополняются нулями.
+
+    Args:
+        kernels: Вычислительный бэкенд (add, sub, matmul).
+        a, b: Плоские буферы матриц n x m и m x p.
+        n, m, p (int): Размеры операндов.
+        crossover (int): Размер блока, ниже которого рекурсия прекращается.
+
+    Returns:
+        Плоский буфер произведения n x p.
+    """
+    depth = 0
+    while min(n, m, p) >> depth > crossover:
+        depth += 1
+    if depth == 0:
+        return kernels.matmul(a, b, n, m, p)
+    step = 1 << depth
+    n2, m2, p2 = (-(-x // step) * step for x in (n, m, p))
+    a = _pad(a, n, m, n2, m2)
+    b = _pad(b, m, p, m2, p2)
+    result = _winograd(kernels, a, b, n2, m2, p2, depth)
+    return _crop(result, p2, n, p)
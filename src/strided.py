@@ -0,0 +1,133 @@
+"""Страйдовые представления плоского буфера.
+
+``StridedBuffer`` описывает матрицу rows x cols, элементы которой лежат в
+чужом плоском буфере: элемент (i, j) находится по индексу
+``offset + i * row_stride + j * col_stride``. Так без копирования задаются
+транспонирование (шаги меняются местами) и подматрицы (сдвигается начало,
+шаги умножаются на шаг среза).
+
+Объект ведёт себя как плоский построчный буфер rows x cols: поддерживает
+len, итерацию, индексацию и срезы, поэтому его принимают все ядра
+бэкендов. Срез, элементы которого образуют арифметическую прогрессию в
+исходном буфере (часть строки, столбец, диагональ), - это один срез
+исходного буфера; остальные собираются по строкам. Ядра NumPy получают
+страйдовый ndarray поверх исходного буфера без копирования.
+"""
+from array import array
+
+
+def empty_like(buf):
+    """Пустой буфер для сборки элементов buf: array того же типа для
+    array и memoryview (в том числе над отображённым в память файлом),
+    иначе list."""
+    if isinstance(buf, StridedBuffer):
+        buf = buf.base
+    if isinstance(buf, memoryview):
+        return array(buf.format)
+    return buf[:0]
+
+
+def typed_like(values, base):
+    """Приводит элементы к типу буфера base для записи срезом: для array
+    и memoryview - array того же типа, для list - как есть.
+
+    Raises:
+        ValueError: Если вещественные элементы записываются в целочисленный
+            буфер.
+    """
+    if isinstance(base, list) or isinstance(values, array):
+        return values
+    typecode = base.typecode if isinstance(base, array) else base.format
+    try:
+        return array(typecode, values)
+    except TypeError:
+        raise ValueError("Нельзя записать вещественные элементы в целочисленный буфер")
+
+
+class StridedBuffer:
+    """Плоское построчное представление матрицы поверх чужого буфера.
+
+    Attributes:
+        base (array, memoryview или list): Исходный буфер.
+        offset (int): Индекс элемента (0, 0) в base.
+        rows (int): Количество строк.
+        cols (int): Количество столбцов.
+        row_stride (int): Шаг между соседними строками в base (> 0).
+        col_stride (int): Шаг между соседними столбцами в base (> 0).
+    """
+    __slots__ = ('base', 'offset', 'rows', 'cols', 'row_stride', 'col_stride')
+
+    def __init__(self, base, offset, rows, cols, row_stride, col_stride):
+        self.base = base
+        self.offset = offset
+        self.rows = rows
+        self.cols = cols
+        self.row_stride = row_stride
+        self.col_stride = col_stride
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __iter__(self):
+        for i in range(self.rows):
+            yield from self.row(i)
+
+    def _index(self, k):
+        i, j = divmod(k, self.cols)
+        return self.offset + i * self.row_stride + j * self.col_stride
+
+    def row(self, i, start=0, stop=None):
+        """Элементы [start, stop) строки i одним срезом исходного буфера."""
+        stop = self.cols if stop is None else stop
+        if stop <= start:
+            return empty_like(self.base)
+        step = self.col_stride
+        first = self.offset + i * self.row_stride + start * step
+        return self.base[first:first + (stop - start - 1) * step + 1:step]
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            size = len(self)
+            if key < 0:
+                key += size
+            if not 0 <= key < size:
+                raise IndexError("Индекс вне буфера")
+            return self.base[self._index(key)]
+        start, stop, step = key.indices(len(self))
+        count = len(range(start, stop, step))
+        if count == 0:
+            return empty_like(self.base)
+        if step > 0:
+            q, r = divmod(step, self.cols)
+            j0 = start % self.cols
+            if j0 + (count - 1) * r < self.cols:
+                # Выбранные элементы не переходят через край строки, значит
+                # в исходном буфере они идут с постоянным шагом.
+                stride = q * self.row_stride + r * self.col_stride
+                first = self._index(start)
+                return self.base[first:first + (count - 1) * stride + 1:stride]
+            if step == 1:
+                i0, j0 = divmod(start, self.cols)
+                i1, j1 = divmod(stop - 1, self.cols)
+                result = empty_like(self.base)
+                result.extend(self.row(i0, j0))
+                for i in range(i0 + 1, i1):
+                    result.extend(self.row(i))
+                result.extend(self.row(i1, 0, j1 + 1))
+                return result
+        result = empty_like(self.base)
+        result.extend(self.base[self._index(k)] for k in range(start, stop, step))
+        return result
+
+    def assign(self, values):
+        """Записывает rows x cols элементов в построчном порядке в исходный
+        буфер на места представления.
+
+        Args:
+            values: Плоский буфер элементов.
+        """
+        base, c, step = self.base, self.cols, self.col_stride
+        for i in range(self.rows):
+            row = typed_like(values[i * c:(i + 1) * c], base)
+            first = self.offset + i * self.row_stride
+            base[first:first + (c - 1) * step + 1:step] = row